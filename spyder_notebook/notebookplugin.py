@@ -6,14 +6,15 @@
 """Notebook plugin."""
 
 # Stdlib imports
-import os
 import os.path as osp
 
 # Qt imports
 from qtpy import PYQT4, PYSIDE
 from qtpy.QtCore import Qt, Signal
 from qtpy.QtGui import QIcon
-from qtpy.QtWidgets import QMessageBox, QVBoxLayout, QMenu
+from qtpy.compat import getopenfilenames
+from qtpy.QtWidgets import (QInputDialog, QMessageBox, QProgressDialog,
+                            QVBoxLayout, QMenu)
 
 # Spyder imports
 from spyder.api.plugins import SpyderPluginWidget
@@ -22,11 +23,11 @@ from spyder.utils import icon_manager as ima
 from spyder.utils.programs import get_temp_dir
 from spyder.utils.qthelpers import (create_action, create_toolbutton,
                                     add_actions, MENU_SEPARATOR)
-from spyder.utils.switcher import shorten_paths
-
 
 # Local imports
-from spyder_notebook.widgets.notebooktabwidget import NotebookTabWidget
+from spyder_notebook.utils.nbindex import NotebookIndex
+from spyder_notebook.utils.parking import KernelParking
+from spyder_notebook.utils.switcherentries import SwitcherEntries
 
 
 NOTEBOOK_TMPDIR = osp.join(get_temp_dir(), 'notebooks')
@@ -35,12 +36,39 @@ FILES_FILTER = "{} (*.ipynb)".format(FILTER_TITLE)
 PACKAGE_PATH = osp.dirname(__file__)
 WELCOME = osp.join(PACKAGE_PATH, 'utils', 'templates', 'welcome.html')
 
+# Switcher mode listing definitions, headings and text in notebooks
+INDEX_MODE = '#'
+
+# Icons of index entries in the switcher, by kind of entry
+INDEX_ICONS = {'function': 'function', 'class': 'class', 'heading': 'cell',
+               'text': 'text'}
+
 
 class NotebookPlugin(SpyderPluginWidget):
     """IPython Notebook plugin."""
 
     CONF_SECTION = 'notebook'
-    CONF_DEFAULTS = [(CONF_SECTION, {'recent_notebooks': []})]
+    CONF_DEFAULTS = [(CONF_SECTION, {'recent_notebooks': [],
+                                     'prewarmed_pages': 1,
+                                     'kernel_pool_size': 1,
+                                     'park_kernels': False,
+                                     'parked_kernel_ttl': 3600,
+                                     'parked_kernel_memory': 2048,
+                                     'background_workers': 0,
+                                     'profile_cells': False,
+                                     'lazy_rendering': True,
+                                     'kernel_memory_limit': 0,
+                                     'cell_cache_size': 0,
+                                     'cell_cache_namespaces': False,
+                                     'cpu_placement': False,
+                                     'max_executing_kernels': 0,
+                                     'journal_interval': 2,
+                                     'untitled_in_memory': True,
+                                     'server_metrics': True,
+                                     'restore_session': True,
+                                     'restore_in_background': False,
+                                     'session_notebooks': [],
+                                     'session_current': 0})]
     focus_changed = Signal()
 
     def __init__(self, parent, testing=False):
@@ -53,6 +81,15 @@ class NotebookPlugin(SpyderPluginWidget):
 
         self.fileswitcher_dlg = None
         self.main = parent
+        self.jobs = None
+        self.progress_dialog = None
+        self.background_outputs = []
+        self.export_jobs = None
+        self.export_dialog = None
+        self.index = NotebookIndex(self)
+        self.switcher_entries = SwitcherEntries()
+        self.switcher_icon = QIcon(osp.join(PACKAGE_PATH, 'images',
+                                            'icon.svg'))
 
         self.recent_notebooks = self.get_option('recent_notebooks', default=[])
         self.recent_notebook_menu = QMenu(_("Open recent"), self)
@@ -70,11 +107,31 @@ class NotebookPlugin(SpyderPluginWidget):
         menu_btn.setMenu(self._options_menu)
         menu_btn.setPopupMode(menu_btn.InstantPopup)
         corner_widgets = {Qt.TopRightCorner: [new_notebook_btn, menu_btn]}
+
+        # Imported here so that importing the plugin does not load
+        # QtWebEngine and the notebook server machinery
+        from spyder_notebook.widgets.notebooktabwidget import (
+            NotebookTabWidget)
         self.tabwidget = NotebookTabWidget(
             self, menu=self._options_menu, actions=self.menu_actions,
             corner_widgets=corner_widgets)
+        self.tabwidget.prewarm_count = self.get_option(
+            'prewarmed_pages', default=1)
+        self.tabwidget.server_options = self.get_server_options()
+        self.tabwidget.restore_in_background = self.get_option(
+            'restore_in_background', default=False)
+        if self.get_option('park_kernels', default=False):
+            self.tabwidget.parking = KernelParking(
+                ttl=self.get_option('parked_kernel_ttl', default=3600),
+                memory_budget=self.get_option(
+                    'parked_kernel_memory', default=2048) * 1024 ** 2)
 
         self.tabwidget.currentChanged.connect(self.refresh_plugin)
+        self.tabwidget.sig_client_added.connect(
+            lambda client: self.switcher_entries.add(
+                client, client.get_filename()))
+        self.tabwidget.sig_client_removed.connect(
+            self.switcher_entries.remove)
 
         layout.addWidget(self.tabwidget)
         self.setLayout(layout)
@@ -108,8 +165,18 @@ class NotebookPlugin(SpyderPluginWidget):
 
     def closing_plugin(self, cancelable=False):
         """Perform actions before parent main window is closed."""
+        self.save_session()
+        self.tabwidget.shutdown()
         for client_index in range(self.tabwidget.count()):
             self.tabwidget.widget(client_index).close()
+        if self.tabwidget.parking is not None:
+            self.tabwidget.parking.clear()
+        # Exports share the worker processes of the background jobs
+        if self.export_jobs is not None:
+            self.export_jobs.shutdown()
+        if self.jobs is not None:
+            self.jobs.shutdown()
+        self.index.shutdown()
         self.set_option('recent_notebooks', self.recent_notebooks)
         return True
 
@@ -138,18 +205,33 @@ class NotebookPlugin(SpyderPluginWidget):
                                     _("Open..."),
                                     icon=ima.icon('fileopen'),
                                     triggered=self.open_notebook)
+        self.open_with_kernel_action = create_action(
+            self, _("Open with existing kernel..."), icon=ima.icon('fileopen'),
+            triggered=lambda: self.open_notebook_with_kernel())
         self.open_console_action = create_action(self,
                                                  _("Open console"),
                                                  icon=ima.icon(
                                                          'ipython_console'),
                                                  triggered=self.open_console)
+        hot_cells_action = create_action(
+            self, _("Hot cells..."), icon=ima.icon('profiler'),
+            triggered=self.show_hot_cells)
+        run_background_action = create_action(
+            self, _("Run in background..."), icon=ima.icon('run'),
+            triggered=lambda: self.run_in_background())
+        export_action = create_action(
+            self, _("Export..."), icon=ima.icon('filesaveas'),
+            triggered=lambda: self.export_notebooks())
         self.clear_recent_notebooks_action =\
             create_action(self, _("Clear this list"),
                           triggered=self.clear_recent_notebooks)
         # Plugin actions
         self.menu_actions = [create_nb_action, open_action,
+                             self.open_with_kernel_action,
                              self.recent_notebook_menu, MENU_SEPARATOR,
-                             self.save_as_action, MENU_SEPARATOR,
+                             self.save_as_action, export_action,
+                             MENU_SEPARATOR,
+                             run_background_action, hot_cells_action,
                              self.open_console_action]
         self.setup_menu_actions()
 
@@ -160,15 +242,19 @@ class NotebookPlugin(SpyderPluginWidget):
         super().register_plugin()
         self.focus_changed.connect(self.main.plugin_focus_changed)
         self.ipyconsole = self.main.ipyconsole
-        self.create_new_client()
+        if not self.restore_session():
+            self.create_new_client()
 
         # Connect to switcher
         self.switcher = self.main.switcher
+        self.switcher.add_mode(
+            INDEX_MODE, _('Go to definition, heading or text in notebooks'))
         self.switcher.sig_mode_selected.connect(self.handle_switcher_modes)
         self.switcher.sig_item_selected.connect(
             self.handle_switcher_selection)
 
         self.recent_notebook_menu.aboutToShow.connect(self.setup_menu_actions)
+        self.update_index()
 
     def check_compatibility(self):
         """Check compatibility for PyQt and sWebEngine."""
@@ -224,6 +310,33 @@ class NotebookPlugin(SpyderPluginWidget):
         self.save_as_action.setEnabled(False)
         self.open_console_action.setEnabled(False)
 
+    def get_server_options(self):
+        """Return configuration options for notebook servers we start."""
+        return {
+            'SpyderKernelManager.kernel_pool_size':
+                self.get_option('kernel_pool_size', default=1),
+            'SpyderNotebookServer.profile_cells':
+                self.get_option('profile_cells', default=False),
+            'SpyderNotebookServer.lazy_rendering':
+                self.get_option('lazy_rendering', default=True),
+            'MemoryWatchdog.memory_limit':
+                self.get_option('kernel_memory_limit', default=0),
+            'CellCache.max_size':
+                self.get_option('cell_cache_size', default=0),
+            'CellCache.store_namespaces':
+                self.get_option('cell_cache_namespaces', default=False),
+            'CpuScheduler.enabled':
+                self.get_option('cpu_placement', default=False),
+            'CpuScheduler.max_executing':
+                self.get_option('max_executing_kernels', default=0),
+            'NotebookJournal.interval':
+                self.get_option('journal_interval', default=2),
+            'ServerMetrics.enabled':
+                self.get_option('server_metrics', default=True),
+            'MemoryContentsManager.memory_dir':
+                NOTEBOOK_TMPDIR if self.get_option(
+                    'untitled_in_memory', default=True) else ''}
+
     def add_to_recent(self, notebook):
         """
         Add an entry to recent notebooks.
@@ -252,6 +365,48 @@ class NotebookPlugin(SpyderPluginWidget):
             self.add_to_recent(filename)
             self.setup_menu_actions()
 
+    def save_session(self):
+        """Remember the notebooks in the tabs, to restore them later."""
+        filenames = []
+        current = 0
+        for client_index in range(self.tabwidget.count()):
+            filename = self.tabwidget.widget(client_index).get_filename()
+            if filename == WELCOME or NOTEBOOK_TMPDIR in filename:
+                continue
+            if client_index == self.tabwidget.currentIndex():
+                current = len(filenames)
+            filenames.append(filename)
+        self.set_option('session_notebooks', filenames)
+        self.set_option('session_current', current)
+
+    def restore_session(self):
+        """
+        Reopen the notebooks that were open when Spyder was closed.
+
+        The notebooks are opened in placeholder tabs, which are only loaded
+        when they are selected or, if enabled, in the background, so that
+        startup does not take longer with more notebooks.
+
+        Returns
+        -------
+        bool
+            Whether any notebook was reopened.
+        """
+        if not self.get_option('restore_session', default=True):
+            return False
+        filenames = self.get_option('session_notebooks', default=[])
+        if not filenames:
+            return False
+
+        # Save spyder_pythonpath before loading any notebook
+        # because it's needed by our kernel spec.
+        if not self.testing:
+            self.set_option('main/spyder_pythonpath',
+                            self.main.get_spyder_pythonpath())
+
+        current = self.get_option('session_current', default=0)
+        return self.tabwidget.restore_session(filenames, current) > 0
+
     def open_notebook(self, filenames=None):
         """Open a notebook from file."""
         # Save spyder_pythonpath before creating a client
@@ -262,10 +417,275 @@ class NotebookPlugin(SpyderPluginWidget):
 
         self.tabwidget.open_notebook(filenames)
 
+    def open_notebook_with_kernel(self, filename=None, kernel_client=None):
+        """
+        Open a notebook using the kernel of a notebook in another tab.
+
+        Parameters
+        ----------
+        filename : str or None, optional
+            File name of the notebook to open. The default is None, meaning
+            that the user should be asked.
+        kernel_client : NotebookClient or None, optional
+            Client whose kernel is to be used. The default is None, meaning
+            that the user should be asked.
+        """
+        if kernel_client is None:
+            clients = [self.tabwidget.widget(index)
+                       for index in range(self.tabwidget.count())]
+            clients = [client for client in clients
+                       if client.get_filename() != WELCOME
+                       and not self.tabwidget.is_placeholder(client)]
+            if not clients:
+                QMessageBox.information(
+                    self, _('Open with existing kernel'),
+                    _('There are no open notebooks with a kernel to use.'))
+                return
+            # Notebooks with the same name in different directories are
+            # listed with their full path, so that every item is unique
+            short_names = [client.get_short_name() for client in clients]
+            names = [client.get_filename()
+                     if short_names.count(short_name) > 1 else short_name
+                     for client, short_name in zip(clients, short_names)]
+            name, ok = QInputDialog.getItem(
+                self, _('Open with existing kernel'),
+                _('Use the kernel of:'), names, 0, False)
+            if not ok:
+                return
+            kernel_client = clients[names.index(name)]
+
+        if not filename:
+            filenames, _selfilter = getopenfilenames(
+                self, _('Open notebook'), '', FILES_FILTER)
+            if not filenames:
+                return
+            filename = filenames[0]
+
+        if not self.testing:
+            self.set_option('main/spyder_pythonpath',
+                            self.main.get_spyder_pythonpath())
+        filename = self.tabwidget.create_new_client(
+            filename, kernel_client=kernel_client)
+        if filename:
+            self.add_to_recent(filename)
+            self.setup_menu_actions()
+
     def save_as(self):
         """Save current notebook to different file."""
         self.tabwidget.save_as()
 
+    def show_hot_cells(self):
+        """Show the cells of the open notebooks that took longest to run."""
+        from spyder_notebook.widgets.hotcells import HotCellsDialog
+
+        profiles = {}
+        for client_index in range(self.tabwidget.count()):
+            client = self.tabwidget.widget(client_index)
+            if (client.get_filename() == WELCOME
+                    or self.tabwidget.is_placeholder(client)):
+                continue
+            profiles[client.get_filename()] = (
+                client.get_cell_profiles() or [])
+        dialog = HotCellsDialog(self, profiles)
+        dialog.exec_()
+
+    def run_in_background(self, filenames=None, parameters=None):
+        """
+        Execute notebooks in the background and save them with their outputs.
+
+        The notebooks are executed in worker processes, several at a time,
+        without being displayed. Notebooks that are open are saved first,
+        and reloaded after all notebooks are executed.
+
+        Parameters
+        ----------
+        filenames : list of str or None, optional
+            File names of the notebooks to execute. The default is None,
+            meaning that the user should be asked.
+        parameters : dict or list of dict or None, optional
+            Parameters to inject in the notebooks before executing them. If
+            this is a list, then every notebook is executed once for every
+            dict in the list (a parameter sweep) and the outputs are written
+            to new files named by `get_sweep_path()`. The default is None,
+            meaning that no parameters are injected.
+        """
+        from spyder_notebook.utils.execute import (execute_notebook,
+                                                   get_sweep_path)
+
+        if not filenames:
+            filenames, _selfilter = getopenfilenames(
+                self, _('Run notebooks in background'), '', FILES_FILTER)
+        if not filenames:
+            return
+
+        for client_index in range(self.tabwidget.count()):
+            client = self.tabwidget.widget(client_index)
+            if (client.get_filename() in filenames
+                    and not self.tabwidget.is_placeholder(client)):
+                client.save(wait=True)
+
+        jobs = self.get_background_jobs()
+        for filename in filenames:
+            if isinstance(parameters, list):
+                for index, values in enumerate(parameters):
+                    output = get_sweep_path(filename, index)
+                    jobs.submit(output, execute_notebook, filename,
+                                output=output, parameters=values)
+            else:
+                jobs.submit(filename, execute_notebook, filename,
+                            parameters=parameters)
+
+    def get_background_jobs(self):
+        """
+        Return the jobs running notebooks in the background.
+
+        They are created when first needed. Their pool of worker processes,
+        with `background_workers` workers, is also used for exports.
+        """
+        from spyder_notebook.widgets.jobs import BackgroundJobs
+
+        if self.jobs is None:
+            self.jobs = BackgroundJobs(
+                self, max_workers=self.get_option('background_workers',
+                                                  default=0))
+            self.jobs.sig_job_finished.connect(self._on_background_job)
+            self.jobs.sig_progress.connect(self._on_background_progress)
+            self.jobs.sig_all_finished.connect(self._on_background_finished)
+        return self.jobs
+
+    def _on_background_job(self, name, output, error):
+        """Remember where a notebook executed in the background was saved."""
+        self.background_outputs.append(output or name)
+
+    def _on_background_progress(self, done, total):
+        """Show progress of notebooks executed in the background."""
+        if self.progress_dialog is None:
+            self.progress_dialog = QProgressDialog(
+                _('Running notebooks in background...'), _('Hide'), 0, total,
+                self)
+            self.progress_dialog.setWindowTitle(self.get_plugin_title())
+            self.progress_dialog.setWindowModality(Qt.NonModal)
+            self.progress_dialog.setMinimumDuration(0)
+        self.progress_dialog.setMaximum(total)
+        self.progress_dialog.setValue(done)
+
+    def _on_background_finished(self, errors):
+        """Reload executed notebooks and report failures."""
+        if self.progress_dialog is not None:
+            self.progress_dialog.close()
+            self.progress_dialog = None
+
+        outputs = set(self.background_outputs)
+        self.background_outputs = []
+        for client_index in range(self.tabwidget.count()):
+            client = self.tabwidget.widget(client_index)
+            if (client.get_filename() not in outputs
+                    or self.tabwidget.is_placeholder(client)):
+                continue
+            # Do not throw away changes made while the notebook was running
+            state = client.get_state()
+            if state is not None and state['dirty']:
+                continue
+            client.go_to(client.file_url)
+
+        if errors:
+            details = '<br>'.join('<b>{}</b>: {}'.format(name, error)
+                                  for name, error in sorted(errors.items()))
+            QMessageBox.warning(
+                self, _('Background execution'),
+                _('Some notebooks failed to run:<br><br>{}').format(details))
+
+    def export_notebooks(self, filenames=None, exporter_name=None):
+        """
+        Export notebooks to another format in the background.
+
+        The notebooks are converted with nbconvert in the worker processes
+        which also run notebooks in the background, several at a time, and
+        written next to the notebook with the extension of the format.
+        Notebooks that are open are saved first and read from the notebook
+        server, which also works for new notebooks which are not on disk.
+
+        Parameters
+        ----------
+        filenames : list of str or None, optional
+            File names of the notebooks to export. The default is None,
+            meaning that the user should be asked.
+        exporter_name : str or None, optional
+            Name of the nbconvert exporter to use, which is a key of
+            `EXPORT_FORMATS`. The default is None, meaning that the user
+            should be asked.
+        """
+        from notebook.utils import url_escape, url_path_join
+        from spyder_notebook.utils.export import (
+            EXPORT_FORMATS, export_notebook, get_export_path)
+        from spyder_notebook.widgets.client import REQUEST_TIMEOUT
+        from spyder_notebook.widgets.jobs import BackgroundJobs
+
+        if not filenames:
+            filenames, _selfilter = getopenfilenames(
+                self, _('Export notebooks'), '', FILES_FILTER)
+        if not filenames:
+            return
+
+        if exporter_name is None:
+            names = list(EXPORT_FORMATS)
+            descriptions = [EXPORT_FORMATS[name][0] for name in names]
+            description, ok = QInputDialog.getItem(
+                self, _('Export notebooks'), _('Export to:'), descriptions,
+                0, False)
+            if not ok:
+                return
+            exporter_name = names[descriptions.index(description)]
+
+        contents_urls = {}
+        for client_index in range(self.tabwidget.count()):
+            client = self.tabwidget.widget(client_index)
+            if (client.get_filename() in filenames
+                    and not self.tabwidget.is_placeholder(client)):
+                client.save(wait=True)
+                contents_urls[client.get_filename()] = client.add_token(
+                    url_path_join(client.server_url, 'api/contents',
+                                  url_escape(client.path)))
+
+        if self.export_jobs is None:
+            self.export_jobs = BackgroundJobs(
+                self, share_with=self.get_background_jobs())
+            self.export_jobs.sig_progress.connect(self._on_export_progress)
+            self.export_jobs.sig_all_finished.connect(
+                self._on_export_finished)
+
+        for filename in filenames:
+            output = get_export_path(filename, exporter_name)
+            self.export_jobs.submit(
+                filename, export_notebook, filename, output, exporter_name,
+                contents_url=contents_urls.get(filename),
+                timeout=REQUEST_TIMEOUT)
+
+    def _on_export_progress(self, done, total):
+        """Show progress of notebooks exported in the background."""
+        if self.export_dialog is None:
+            self.export_dialog = QProgressDialog(
+                _('Exporting notebooks...'), _('Hide'), 0, total, self)
+            self.export_dialog.setWindowTitle(self.get_plugin_title())
+            self.export_dialog.setWindowModality(Qt.NonModal)
+            self.export_dialog.setMinimumDuration(0)
+        self.export_dialog.setMaximum(total)
+        self.export_dialog.setValue(done)
+
+    def _on_export_finished(self, errors):
+        """Report notebooks that could not be exported."""
+        if self.export_dialog is not None:
+            self.export_dialog.close()
+            self.export_dialog = None
+
+        if errors:
+            details = '<br>'.join('<b>{}</b>: {}'.format(name, error)
+                                  for name, error in sorted(errors.items()))
+            QMessageBox.warning(
+                self, _('Export'),
+                _('Some notebooks could not be exported:<br><br>{}')
+                .format(details))
+
     def open_console(self, client=None):
         """Open an IPython console for the given client or the current one."""
         if not client:
@@ -285,45 +705,116 @@ class NotebookPlugin(SpyderPluginWidget):
                                               client.get_short_name())
 
     # ------ Public API (for FileSwitcher) ------------------------------------
+    def update_index(self):
+        """
+        Update the index of the open and recent notebooks.
+
+        Notebooks which changed since they were indexed are indexed again in
+        the background.
+        """
+        filenames = [self.tabwidget.widget(index).get_filename()
+                     for index in range(self.tabwidget.count())]
+        filenames = [filename for filename in filenames + self.recent_notebooks
+                     if filename != WELCOME]
+        self.index.update(filenames)
+
+    def go_to_cell(self, filename, cell, line=None):
+        """
+        Go to a cell in a notebook, opening the notebook if necessary.
+
+        Parameters
+        ----------
+        filename : str
+            File name of the notebook.
+        cell : int
+            Index of the cell, starting at 0.
+        line : int or None, optional
+            Line in the cell to put the cursor on, starting at 0. The
+            default is None, meaning that the cursor is not moved.
+        """
+        client = self.find_client(filename)
+        if client is None:
+            self.create_new_client(filename)
+            client = self.find_client(filename)
+            if client is None:
+                return
+        self.tabwidget.setCurrentIndex(self.tabwidget.indexOf(client))
+        self.switch_to_plugin()
+        client.go_to_cell(cell, line)
+
+    def find_client(self, filename):
+        """Return the client of the notebook with a file name, or None."""
+        for index in range(self.tabwidget.count()):
+            client = self.tabwidget.widget(index)
+            if client.get_filename() == filename:
+                return client
+        return None
+
     def handle_switcher_modes(self, mode):
         """
         Populate switcher with opened notebooks.
 
         List the file names of the opened notebooks with their directories in
-        the switcher. Only handle file mode, where `mode` is empty string.
+        the switcher in file mode, where `mode` is empty string. The entries
+        are kept up to date as tabs are added and closed, so that this is
+        fast with many tabs. In index mode, list the definitions, headings
+        and lines of text in the open and recent notebooks.
         """
+        if mode == INDEX_MODE:
+            self.create_index_switcher()
+            return
         if mode != '':
             return
 
         clients = [self.tabwidget.widget(i)
                    for i in range(self.tabwidget.count())]
-        paths = [client.get_filename() for client in clients]
-        is_unsaved = [False for client in clients]
-        short_paths = shorten_paths(paths, is_unsaved)
-        icon = QIcon(os.path.join(PACKAGE_PATH, 'images', 'icon.svg'))
+        entries = self.switcher_entries.get_entries(clients)
         section = self.get_plugin_title()
 
-        for path, short_path, client in zip(paths, short_paths, clients):
-            title = osp.basename(path)
-            description = osp.dirname(path)
-            if len(path) > 75:
-                description = short_path
-            is_last_item = (client == clients[-1])
+        for number, (client, title, description) in enumerate(entries):
             self.switcher.add_item(
-                title=title, description=description, icon=icon,
-                section=section, data=client, last_item=is_last_item)
+                title=title, description=description, icon=self.switcher_icon,
+                section=section, data=client,
+                last_item=(number == len(entries) - 1))
+
+    def create_index_switcher(self):
+        """Populate switcher with the entries in the notebook index."""
+        self.switcher.clear()
+        self.switcher.set_placeholder_text(
+            _('Start typing the name of a function, class or heading, '
+              'or text in a cell'))
+        entries = self.index.entries()
+        section = self.get_plugin_title()
+        icons = {kind: ima.icon(name) for kind, name in INDEX_ICONS.items()}
+        for number, (filename, entry) in enumerate(entries):
+            description = _('{}, cell {}').format(
+                osp.basename(filename), entry.cell + 1)
+            self.switcher.add_item(
+                title=entry.name, description=description,
+                icon=icons[entry.kind], section=section,
+                data=(filename, entry),
+                last_item=(number == len(entries) - 1))
+        # Index the notebooks which changed, for the next time
+        self.update_index()
 
     def handle_switcher_selection(self, item, mode, search_text):
         """
         Handle user selecting item in switcher.
 
         If the selected item is not in the section of the switcher that
-        corresponds to this plugin, then ignore it. Otherwise, switch to
-        selected item in notebook plugin and hide the switcher.
+        corresponds to this plugin, then ignore it. In index mode, go to the
+        cell of the selected entry. Otherwise, switch to selected item in
+        notebook plugin and hide the switcher.
         """
         if item.get_section() != self.get_plugin_title():
             return
 
+        if mode == INDEX_MODE:
+            filename, entry = item.get_data()
+            self.switcher.hide()
+            self.go_to_cell(filename, entry.cell, entry.line)
+            return
+
         client = item.get_data()
         index = self.tabwidget.indexOf(client)
         self.tabwidget.setCurrentIndex(index)
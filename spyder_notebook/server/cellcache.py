@@ -0,0 +1,192 @@
+"""
+On-disk cache of the outputs of notebook cells.
+
+Copyright (c) Spyder Project Contributors
+Distributed under the terms of the MIT License
+"""
+import hashlib
+import json
+import os
+import os.path as osp
+
+from jupyter_core.paths import jupyter_data_dir
+from notebook.base.handlers import APIHandler
+from tornado import web
+from traitlets import Bool, Integer, Unicode, default
+from traitlets.config import LoggingConfigurable
+
+# Regular expression matching cache keys in URLs
+KEY_REGEX = r'(?P<key>[0-9a-f]{64})'
+
+
+def compute_keys(sources):
+    """
+    Compute the cache keys of a sequence of code cells.
+
+    The key of a cell is a hash of its source and the key of the cell
+    before it, so it changes when the cell or any cell above it changes.
+
+    Parameters
+    ----------
+    sources : list of str
+        Sources of the code cells, from top to bottom.
+
+    Returns
+    -------
+    list of str
+        Key of every cell.
+    """
+    keys = []
+    previous = ''
+    for source in sources:
+        digest = hashlib.sha256()
+        digest.update(previous.encode('ascii'))
+        digest.update(source.encode('utf-8'))
+        previous = digest.hexdigest()
+        keys.append(previous)
+    return keys
+
+
+class CellCache(LoggingConfigurable):
+    """
+    Cache of cell outputs, keyed by the source of the cells.
+
+    Every entry consists of a JSON file with the outputs of a cell and,
+    optionally, a pickle with the variables that running the cell defined
+    or reassigned in the kernel. The pickle is written and read by the
+    kernel itself. When the files take more space than the maximum size,
+    the least recently used entries are removed.
+    """
+
+    max_size = Integer(
+        0, config=True,
+        help="Maximum size (in MiB) of the cell cache. Use 0 to disable the "
+             "cache.")
+
+    cache_dir = Unicode(
+        config=True,
+        help="Directory in which the cell cache is stored.")
+
+    store_namespaces = Bool(
+        False, config=True,
+        help="Whether to store the variables defined by every cell, so that "
+             "cells can be skipped when running all cells. Variables which "
+             "cannot be pickled are not stored; cells defining them are "
+             "always run.")
+
+    @default('cache_dir')
+    def _default_cache_dir(self):
+        return osp.join(jupyter_data_dir(), 'spyder_cell_cache')
+
+    @property
+    def enabled(self):
+        """Whether the cache is enabled."""
+        return self.max_size > 0
+
+    def get_output_path(self, key):
+        """Return path of the file with the outputs of an entry."""
+        return osp.join(self.cache_dir, key + '.json')
+
+    def get_namespace_path(self, key):
+        """Return path of the file with the variables of an entry."""
+        return osp.join(self.cache_dir, key + '.pkl')
+
+    def lookup(self, sources):
+        """
+        Look up a sequence of code cells in the cache.
+
+        Returns
+        -------
+        list of dict
+            For every cell, a dict with its `key`, whether it is a `hit`,
+            whether the variables it defines are stored (`namespace`) and
+            the `namespacePath` under which the kernel reads or writes them.
+        """
+        entries = []
+        for key in compute_keys(sources):
+            entries.append({
+                'key': key,
+                'hit': osp.exists(self.get_output_path(key)),
+                'namespace': osp.exists(self.get_namespace_path(key)),
+                'namespacePath': self.get_namespace_path(key)})
+        return entries
+
+    def get(self, key):
+        """Return the cached entry for a key, or None."""
+        try:
+            with open(self.get_output_path(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        for path in (self.get_output_path(key), self.get_namespace_path(key)):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return entry
+
+    def put(self, key, entry):
+        """Store an entry in the cache and evict entries over the size."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.get_output_path(key)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(entry, f)
+        os.replace(path + '.tmp', path)
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits."""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            path = osp.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _mtime, size, _path in files)
+        limit = self.max_size * 1024 ** 2
+        for _mtime, size, path in sorted(files):
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        # A pickle is useless without the outputs of its entry
+        for name in os.listdir(self.cache_dir):
+            root, ext = osp.splitext(name)
+            if (ext == '.pkl'
+                    and not osp.exists(self.get_output_path(root))):
+                try:
+                    os.remove(osp.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+
+class CellCacheLookupHandler(APIHandler):
+    """Compute the cache keys of cells and say which are cached."""
+
+    @web.authenticated
+    def post(self):
+        sources = self.get_json_body()['sources']
+        cache = self.settings['cell_cache']
+        self.finish(json.dumps(cache.lookup(sources)))
+
+
+class CellCacheEntryHandler(APIHandler):
+    """Get or store the cached outputs of a cell."""
+
+    @web.authenticated
+    def get(self, key):
+        entry = self.settings['cell_cache'].get(key)
+        if entry is None:
+            raise web.HTTPError(404)
+        self.finish(json.dumps(entry))
+
+    @web.authenticated
+    def put(self, key):
+        self.settings['cell_cache'].put(key, self.get_json_body())
+        self.set_status(204)
+        self.finish()
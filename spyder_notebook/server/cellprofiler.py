@@ -0,0 +1,120 @@
+"""
+Kernel side of the cell profiler.
+
+This file is not imported by the server. Its source is sent to the page,
+which runs it silently in every kernel it connects to. It registers hooks
+measuring the CPU time and memory used by every cell the user runs; the
+page asks for the measurements of a cell by its execution count.
+
+Copyright (c) Spyder Project Contributors
+Distributed under the terms of the MIT License
+"""
+
+
+def _setup_spyder_cell_profiler():
+    from collections import OrderedDict
+    import threading
+    import time
+
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    class CellProfile(dict):
+        """Measurements of one cell, displayed as JSON."""
+
+        def _repr_json_(self):
+            return dict(self)
+
+    class CellProfiler:
+        """Measure CPU time and peak memory of the cells run in the kernel."""
+
+        # Time (in seconds) between memory samples while a cell runs
+        sample_interval = 0.05
+
+        # Number of cells for which measurements are kept
+        max_profiles = 200
+
+        def __init__(self, shell):
+            self.shell = shell
+            self.process = psutil.Process() if psutil else None
+            self.profiles = OrderedDict()
+            self._start = None
+            self._stop_sampling = threading.Event()
+            self._sampler = None
+            self._peak = 0
+
+        def register(self):
+            self.shell.events.register('pre_run_cell', self.pre_run_cell)
+            self.shell.events.register('post_run_cell', self.post_run_cell)
+
+        def unregister(self):
+            for event, callback in [('pre_run_cell', self.pre_run_cell),
+                                    ('post_run_cell', self.post_run_cell)]:
+                try:
+                    self.shell.events.unregister(event, callback)
+                except ValueError:
+                    pass
+
+        def get_rss(self):
+            if self.process is None:
+                return None
+            try:
+                return self.process.memory_info().rss
+            except psutil.Error:
+                return None
+
+        def sample(self):
+            while not self._stop_sampling.wait(self.sample_interval):
+                self._peak = max(self._peak, self.get_rss() or 0)
+
+        def pre_run_cell(self, *args):
+            rss = self.get_rss()
+            self._start = (time.perf_counter(), time.process_time(), rss)
+            self._peak = rss or 0
+            if rss is not None:
+                self._stop_sampling.clear()
+                self._sampler = threading.Thread(target=self.sample,
+                                                 daemon=True)
+                self._sampler.start()
+
+        def post_run_cell(self, result=None):
+            if self._start is None:
+                return
+            wall, cpu, rss = self._start
+            self._start = None
+            if self._sampler is not None:
+                self._stop_sampling.set()
+                self._sampler.join()
+                self._sampler = None
+            profile = CellProfile(
+                wall=time.perf_counter() - wall,
+                cpu=time.process_time() - cpu,
+                memory=None)
+            if rss is not None:
+                peak = max(self._peak, self.get_rss() or 0)
+                profile['memory'] = peak - rss
+
+            count = getattr(result, 'execution_count', None)
+            if count is None:
+                count = self.shell.execution_count - 1
+            self.profiles[count] = profile
+            while len(self.profiles) > self.max_profiles:
+                self.profiles.popitem(last=False)
+
+        def get(self, count):
+            return self.profiles.get(count)
+
+    shell = get_ipython()  # noqa: F821
+    previous = shell.user_ns.get('__spyder_cell_profiler__')
+    if previous is not None:
+        previous.unregister()
+    profiler = CellProfiler(shell)
+    profiler.register()
+    shell.user_ns['__spyder_cell_profiler__'] = profiler
+    shell.user_ns_hidden['__spyder_cell_profiler__'] = profiler
+
+
+_setup_spyder_cell_profiler()
+del _setup_spyder_cell_profiler
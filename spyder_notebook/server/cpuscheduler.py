@@ -0,0 +1,341 @@
+"""
+Placement of kernels on CPUs and cap on the number of executing kernels.
+
+Copyright (c) Spyder Project Contributors
+Distributed under the terms of the MIT License
+"""
+from collections import OrderedDict
+import json
+import os
+
+import psutil
+from notebook.base.zmqhandlers import deserialize_binary_message
+from notebook.services.kernels.handlers import ZMQChannelsHandler
+from tornado.ioloop import PeriodicCallback
+from traitlets import Bool, Float, Instance, Integer, List
+from traitlets.config import LoggingConfigurable
+
+# Environment variables limiting the thread pools of numerical libraries
+THREAD_VARIABLES = ['OMP_NUM_THREADS', 'MKL_NUM_THREADS',
+                    'OPENBLAS_NUM_THREADS']
+
+
+def partition_cpus(cpus, count):
+    """
+    Split CPUs into nearly equal sets of adjacent CPUs.
+
+    Parameters
+    ----------
+    cpus : list of int
+        CPUs to split.
+    count : int
+        Number of sets.
+
+    Returns
+    -------
+    list of list of int
+        Sets of CPUs. If there are more sets than CPUs, every set has one
+        CPU and the CPUs are shared round-robin.
+    """
+    if not cpus:
+        return [[] for _i in range(count)]
+    if count > len(cpus):
+        return [[cpus[i % len(cpus)]] for i in range(count)]
+    size, extra = divmod(len(cpus), count)
+    sets = []
+    start = 0
+    for i in range(count):
+        end = start + size + (1 if i < extra else 0)
+        sets.append(cpus[start:end])
+        start = end
+    return sets
+
+
+def set_process_affinity(pid, cpus):
+    """
+    Restrict a process and its children to a set of CPUs.
+
+    On Linux, the affinity is set for every thread, because threads which
+    already run do not inherit the affinity of the process.
+
+    Returns
+    -------
+    bool
+        Whether the affinity could be set.
+    """
+    try:
+        process = psutil.Process(pid)
+        processes = [process] + process.children(recursive=True)
+    except psutil.Error:
+        return False
+    done = False
+    for proc in processes:
+        try:
+            if hasattr(os, 'sched_setaffinity'):
+                for thread in proc.threads():
+                    os.sched_setaffinity(thread.id, cpus)
+            else:
+                proc.cpu_affinity(cpus)
+            done = True
+        except (psutil.Error, OSError, AttributeError):
+            pass
+    return done
+
+
+class CpuScheduler(LoggingConfigurable):
+    """
+    Scheduler which shares the CPUs among kernels.
+
+    If enabled, every kernel is pinned to its own set of adjacent CPUs,
+    and the sets are recomputed as kernels start, stop and restart. A new
+    kernel also gets environment variables which size the thread pools of
+    OpenMP, MKL and OpenBLAS to its share of the CPUs at the time it
+    starts; these cannot be changed once the kernel runs.
+
+    Independently, `max_executing` limits how many kernels run code at the
+    same time. Execute requests for other kernels wait until a kernel has
+    replied to all of its requests.
+    """
+
+    enabled = Bool(
+        False, config=True,
+        help="Whether to give every kernel its own set of CPUs and limit its "
+             "thread pools to the size of that set.")
+
+    cpus = List(
+        Integer(), config=True,
+        help="CPUs to share among kernels. The default is all CPUs that the "
+             "server may use.")
+
+    max_executing = Integer(
+        0, config=True,
+        help="Maximum number of kernels which may run code at the same time. "
+             "Use 0 for no limit.")
+
+    interval = Float(
+        2, config=True,
+        help="Time (in seconds) between checks for kernels which stopped or "
+             "restarted.")
+
+    kernel_manager = Instance(
+        'notebook.services.kernels.kernelmanager.MappingKernelManager')
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._assigned = {}
+        self._pids = {}
+        self._executing = {}
+        self._waiting = OrderedDict()
+        self._callback = None
+
+    def available_cpus(self):
+        """Return sorted list of CPUs to share among kernels."""
+        if hasattr(os, 'sched_getaffinity'):
+            cpus = sorted(os.sched_getaffinity(0))
+        else:
+            cpus = list(range(os.cpu_count() or 1))
+        if self.cpus:
+            cpus = [cpu for cpu in cpus if cpu in self.cpus]
+        return cpus
+
+    def pooled_kernel_ids(self):
+        """Return ids of idle kernels in the pool of the kernel manager."""
+        pooled_kernel_ids = getattr(self.kernel_manager, 'pooled_kernel_ids',
+                                    None)
+        if pooled_kernel_ids is None:
+            return []
+        return list(pooled_kernel_ids())
+
+    def active_kernel_ids(self):
+        """Return ids of kernels used by sessions, so not in the pool."""
+        pooled = set(self.pooled_kernel_ids())
+        return [kernel_id
+                for kernel_id in self.kernel_manager.list_kernel_ids()
+                if kernel_id not in pooled]
+
+    def kernel_env(self):
+        """
+        Return environment variables for a kernel which is about to start.
+
+        Returns
+        -------
+        dict or None
+            Variables to add to the environment of the kernel, or None if
+            the scheduler is disabled.
+        """
+        if not self.enabled:
+            return None
+        count = len(self.active_kernel_ids()) + 1
+        threads = max(1, len(self.available_cpus()) // count)
+        return {name: str(threads) for name in THREAD_VARIABLES}
+
+    def start(self):
+        """Start checking kernels periodically, if anything is scheduled."""
+        if (self.enabled or self.max_executing) and self._callback is None:
+            self._callback = PeriodicCallback(self.check_kernels,
+                                              self.interval * 1000)
+            self._callback.start()
+
+    def stop(self):
+        """Stop checking kernels."""
+        if self._callback is not None:
+            self._callback.stop()
+            self._callback = None
+
+    def get_kernel_pid(self, kernel_id):
+        """Return process id of a kernel, or None if unknown."""
+        process = getattr(self.kernel_manager.get_kernel(kernel_id),
+                          'kernel', None)
+        return getattr(process, 'pid', None)
+
+    def check_kernels(self):
+        """Notice kernels which stopped or restarted and rebalance CPUs."""
+        kernel_ids = list(self.kernel_manager.list_kernel_ids())
+        pids = {kernel_id: self.get_kernel_pid(kernel_id)
+                for kernel_id in kernel_ids}
+        for kernel_id in list(self._pids):
+            if kernel_id not in pids:
+                self.forget(kernel_id)
+            elif pids[kernel_id] != self._pids[kernel_id]:
+                # Replies to requests sent to the old process never come
+                self.release(kernel_id)
+        self._pids = pids
+        if self.enabled:
+            self.rebalance()
+
+    def rebalance(self):
+        """
+        Pin every kernel to its share of the CPUs.
+
+        Idle kernels in the pool do not get a share; they are pinned to all
+        CPUs until a session takes them.
+        """
+        cpus = self.available_cpus()
+        kernel_ids = self.active_kernel_ids()
+        assignments = []
+        if kernel_ids:
+            assignments += zip(kernel_ids,
+                               partition_cpus(cpus, len(kernel_ids)))
+        assignments += [(kernel_id, cpus)
+                        for kernel_id in self.pooled_kernel_ids()]
+        for kernel_id, cpus in assignments:
+            pid = self.get_kernel_pid(kernel_id)
+            if pid is None or self._assigned.get(kernel_id) == (pid, cpus):
+                continue
+            if set_process_affinity(pid, cpus):
+                self.log.debug("Kernel %s pinned to CPUs %s", kernel_id, cpus)
+                self._assigned[kernel_id] = (pid, cpus)
+
+    def forget(self, kernel_id):
+        """Drop the state of a kernel that no longer exists."""
+        self._assigned.pop(kernel_id, None)
+        self._pids.pop(kernel_id, None)
+        self._waiting.pop(kernel_id, None)
+        self.release(kernel_id)
+
+    def request_execution(self, kernel_id, handler, send):
+        """
+        Send an execute request now, or once the kernel may execute.
+
+        Parameters
+        ----------
+        kernel_id : str
+            Kernel the request is for.
+        handler : object
+            Connection which sends the request and receives the reply.
+        send : callable
+            Function which sends the request to the kernel.
+        """
+        if (not self.max_executing or kernel_id in self._executing
+                or len(self._executing) < self.max_executing):
+            self._admit(kernel_id, handler, send)
+        else:
+            self._waiting.setdefault(kernel_id, []).append((handler, send))
+
+    def execution_finished(self, kernel_id, handler):
+        """Note that a kernel replied to an execute request."""
+        counts = self._executing.get(kernel_id, {})
+        if handler in counts:
+            counts[handler] -= 1
+            if not counts[handler]:
+                del counts[handler]
+            if not counts:
+                self.release(kernel_id)
+
+    def forget_handler(self, handler):
+        """Drop the requests of a connection which closed."""
+        for kernel_id in list(self._waiting):
+            requests = [request for request in self._waiting[kernel_id]
+                        if request[0] is not handler]
+            if requests:
+                self._waiting[kernel_id] = requests
+            else:
+                del self._waiting[kernel_id]
+        for kernel_id, counts in list(self._executing.items()):
+            counts.pop(handler, None)
+            if not counts:
+                self.release(kernel_id)
+
+    def release(self, kernel_id):
+        """Stop counting a kernel as executing and admit waiting kernels."""
+        self._executing.pop(kernel_id, None)
+        while self._waiting and len(self._executing) < self.max_executing:
+            waiting_id, requests = self._waiting.popitem(last=False)
+            for handler, send in requests:
+                self._admit(waiting_id, handler, send)
+
+    def _admit(self, kernel_id, handler, send):
+        counts = self._executing.setdefault(kernel_id, {})
+        counts[handler] = counts.get(handler, 0) + 1
+        send()
+
+    @property
+    def executing(self):
+        """Number of kernels which are executing."""
+        return len(self._executing)
+
+    @property
+    def waiting(self):
+        """Number of kernels waiting to execute."""
+        return len(self._waiting)
+
+
+class ThrottledChannelsHandler(ZMQChannelsHandler):
+    """
+    Websocket handler which lets the scheduler hold back execute requests.
+    """
+
+    @property
+    def scheduler(self):
+        return self.settings['cpu_scheduler']
+
+    def on_message(self, msg):
+        if isinstance(msg, bytes):
+            parsed = deserialize_binary_message(msg)
+        else:
+            parsed = json.loads(msg)
+        if (parsed.get('channel', 'shell') == 'shell'
+                and parsed['header']['msg_type'] == 'execute_request'):
+            self.scheduler.request_execution(
+                self.kernel_id, self,
+                lambda: super(ThrottledChannelsHandler, self).on_message(msg))
+        else:
+            super().on_message(msg)
+
+    def _on_zmq_reply(self, stream, msg_list):
+        if getattr(stream, 'channel', None) == 'shell':
+            _idents, fed_msg_list = self.session.feed_identities(msg_list)
+            # Only unpack the header: deserializing twice fails the
+            # signature check
+            header = self.session.unpack(fed_msg_list[1])
+            if header['msg_type'] == 'execute_reply':
+                self.scheduler.execution_finished(self.kernel_id, self)
+        super()._on_zmq_reply(stream, msg_list)
+
+    def on_close(self):
+        self.scheduler.forget_handler(self)
+        super().on_close()
+
+    def on_kernel_restarted(self):
+        self.scheduler.release(self.kernel_id)
+        super().on_kernel_restarted()
@@ -0,0 +1,191 @@
+"""
+Static analysis of the names that notebook cells define and use.
+
+Copyright (c) Spyder Project Contributors
+Distributed under the terms of the MIT License
+"""
+import ast
+import json
+
+from IPython.core.inputtransformer2 import TransformerManager
+from notebook.base.handlers import APIHandler
+from tornado import web
+
+
+class NameCollector(ast.NodeVisitor):
+    """
+    Collect the names that code assigns and reads, in order of execution.
+
+    A name is only counted as used if it is read before it is assigned in
+    the same scope. Functions, classes, lambdas and comprehensions have
+    their own scope: names assigned there are local, but names they read
+    may refer to variables of the notebook. Assigning to an attribute or
+    item of a variable modifies it, so counts as both a use and a
+    definition of that variable.
+    """
+
+    def __init__(self, local_names=()):
+        self.defines = set(local_names)
+        self.uses = set()
+        self.globals = set()
+
+    def use(self, name):
+        if name not in self.defines:
+            self.uses.add(name)
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            self.use(node.id)
+        else:
+            self.defines.add(node.id)
+
+    def visit_Attribute(self, node):
+        self._visit_target(node)
+
+    def visit_Subscript(self, node):
+        self._visit_target(node)
+
+    def _visit_target(self, node):
+        self.generic_visit(node)
+        if not isinstance(node.ctx, ast.Load):
+            base = node.value
+            while isinstance(base, (ast.Attribute, ast.Subscript)):
+                base = base.value
+            if isinstance(base, ast.Name):
+                self.defines.add(base.id)
+
+    def visit_Assign(self, node):
+        self.visit(node.value)
+        for target in node.targets:
+            self.visit(target)
+
+    def visit_AugAssign(self, node):
+        self.visit(node.value)
+        if isinstance(node.target, ast.Name):
+            self.use(node.target.id)
+        self.visit(node.target)
+
+    def visit_AnnAssign(self, node):
+        if node.value is not None:
+            self.visit(node.value)
+        self.visit(node.annotation)
+        self.visit(node.target)
+
+    def visit_NamedExpr(self, node):
+        self.visit(node.value)
+        self.visit(node.target)
+
+    def visit_For(self, node):
+        self.visit(node.iter)
+        self.visit(node.target)
+        for statement in node.body + node.orelse:
+            self.visit(statement)
+
+    visit_AsyncFor = visit_For
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.defines.add(alias.asname or alias.name.split('.')[0])
+
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            if alias.name != '*':
+                self.defines.add(alias.asname or alias.name)
+
+    def visit_Global(self, node):
+        self.globals.update(node.names)
+
+    def _visit_scope(self, scope, body):
+        """Visit nodes in a nested scope and collect its free names."""
+        for child in body:
+            scope.visit(child)
+        self.uses.update(name for name in scope.uses
+                         if name not in self.defines)
+        self.defines.update(scope.globals)
+
+    def visit_FunctionDef(self, node):
+        for expr in node.decorator_list + node.args.defaults:
+            self.visit(expr)
+        for expr in node.args.kw_defaults:
+            if expr is not None:
+                self.visit(expr)
+        args = node.args
+        params = [arg.arg for arg in args.args + args.kwonlyargs
+                  + getattr(args, 'posonlyargs', [])]
+        params += [arg.arg for arg in (args.vararg, args.kwarg) if arg]
+        self._visit_scope(NameCollector(params), node.body)
+        self.defines.add(node.name)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        for expr in node.decorator_list + node.bases:
+            self.visit(expr)
+        for keyword in node.keywords:
+            self.visit(keyword.value)
+        self._visit_scope(NameCollector(), node.body)
+        self.defines.add(node.name)
+
+    def visit_Lambda(self, node):
+        args = node.args
+        for expr in args.defaults:
+            self.visit(expr)
+        params = [arg.arg for arg in args.args + args.kwonlyargs]
+        params += [arg.arg for arg in (args.vararg, args.kwarg) if arg]
+        self._visit_scope(NameCollector(params), [node.body])
+
+    def _visit_comprehension(self, node, elements):
+        scope = NameCollector()
+        for generator in node.generators:
+            scope.visit(generator.iter)
+            scope.visit(generator.target)
+            for condition in generator.ifs:
+                scope.visit(condition)
+        self._visit_scope(scope, elements)
+
+    def visit_ListComp(self, node):
+        self._visit_comprehension(node, [node.elt])
+
+    visit_SetComp = visit_ListComp
+    visit_GeneratorExp = visit_ListComp
+
+    def visit_DictComp(self, node):
+        self._visit_comprehension(node, [node.key, node.value])
+
+
+def analyze_cell(source):
+    """
+    Find the variables that a code cell defines and uses.
+
+    A variable is only counted as used if it is read before the cell
+    assigns it, so that cells do not depend on themselves.
+
+    Parameters
+    ----------
+    source : str
+        Source of the cell, which may contain IPython syntax.
+
+    Returns
+    -------
+    dict
+        Sorted lists of the names the cell defines (`defines`) and uses
+        (`uses`), or None for both if the cell could not be analyzed.
+    """
+    try:
+        tree = ast.parse(TransformerManager().transform_cell(source))
+    except (SyntaxError, ValueError):
+        return {'defines': None, 'uses': None}
+
+    collector = NameCollector()
+    collector.visit(tree)
+    defines = collector.defines | collector.globals
+    return {'defines': sorted(defines), 'uses': sorted(collector.uses)}
+
+
+class DataflowHandler(APIHandler):
+    """Analyze the names defined and used by code cells."""
+
+    @web.authenticated
+    def post(self):
+        sources = self.get_json_body()['sources']
+        self.finish(json.dumps([analyze_cell(source) for source in sources]))
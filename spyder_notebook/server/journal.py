@@ -0,0 +1,266 @@
+"""
+Journal of unsaved changes to notebooks, for recovery after a crash.
+
+Copyright (c) Spyder Project Contributors
+Distributed under the terms of the MIT License
+"""
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import os.path as osp
+
+from jupyter_core.paths import jupyter_data_dir
+from notebook.base.handlers import APIHandler
+from notebook.utils import to_os_path
+from tornado import gen, web
+from tornado.ioloop import IOLoop
+from traitlets import Float, Integer, Unicode, default
+from traitlets.config import LoggingConfigurable
+
+
+def apply_ops(notebook, ops):
+    """
+    Apply journaled changes to the cells of a notebook.
+
+    Parameters
+    ----------
+    notebook : dict
+        Notebook in nbformat 4, which is modified in place.
+    ops : list of dict
+        Changes, each of which inserts cells (`insert`, with `index` and
+        `cells`), removes cells (`remove`, with `index` and `count`), moves
+        a cell (`move`, with `from` and `to`) or replaces a cell (`set`,
+        with `index` and `cell`).
+    """
+    cells = notebook['cells']
+    for op in ops:
+        kind = op['op']
+        if kind == 'insert':
+            cells[op['index']:op['index']] = op['cells']
+        elif kind == 'remove':
+            del cells[op['index']:op['index'] + op['count']]
+        elif kind == 'move':
+            cells.insert(op['to'], cells.pop(op['from']))
+        elif kind == 'set':
+            cells[op['index']] = op['cell']
+
+
+def get_mtime(path):
+    """Return modification time of a file, or None if it does not exist."""
+    try:
+        return osp.getmtime(path)
+    except OSError:
+        return None
+
+
+class NotebookJournal(LoggingConfigurable):
+    """
+    Append-only journals of the unsaved changes to notebooks.
+
+    The page appends the changes to the cells of a notebook every few
+    seconds. The first line of a journal records the modification time of
+    the notebook file it applies to; a journal for a file which changed
+    since is stale. Once a journal has many changes, it is compacted in
+    the background into a snapshot of the notebook, to which the changes
+    after it apply. The notebook file itself is only written when the user
+    saves or recovers it.
+
+    All files are read and written on one background thread, so that
+    changes are applied in order without blocking the server.
+    """
+
+    interval = Float(
+        0, config=True,
+        help="Time (in seconds) between appends of unsaved changes to the "
+             "journal. Use 0 to disable the journal.")
+
+    journal_dir = Unicode(
+        config=True,
+        help="Directory in which the journals are stored.")
+
+    compact_after = Integer(
+        500, config=True,
+        help="Number of changes after which a journal is compacted into a "
+             "snapshot of the notebook.")
+
+    @default('journal_dir')
+    def _default_journal_dir(self):
+        return osp.join(jupyter_data_dir(), 'spyder_journal')
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._executor = ThreadPoolExecutor(1)
+        self._counts = {}
+
+    @property
+    def enabled(self):
+        """Whether the journal is enabled."""
+        return self.interval > 0
+
+    def run(self, func, *args):
+        """Run a method on the journal thread and return a future."""
+        return IOLoop.current().run_in_executor(self._executor, func, *args)
+
+    def get_paths(self, os_path):
+        """Return paths of the journal and snapshot of a notebook."""
+        key = hashlib.sha256(osp.abspath(os_path).encode('utf-8'))
+        base = osp.join(self.journal_dir, key.hexdigest())
+        return base + '.jsonl', base + '.ipynb'
+
+    def append(self, os_path, ops, reset=False):
+        """
+        Append changes to the journal of a notebook.
+
+        If `reset` is True, the journal is started afresh, for the notebook
+        as it is saved now. Otherwise, changes for a notebook without a
+        journal are dropped, because there is nothing they apply to.
+        """
+        journal_path, snapshot_path = self.get_paths(os_path)
+        if reset:
+            self.discard(os_path)
+            os.makedirs(self.journal_dir, exist_ok=True)
+            with open(journal_path, 'w') as f:
+                f.write(json.dumps({'op': 'base',
+                                    'mtime': get_mtime(os_path)}) + '\n')
+            self._counts[journal_path] = 0
+        elif not osp.exists(journal_path):
+            return
+        with open(journal_path, 'a') as f:
+            for op in ops:
+                f.write(json.dumps(op) + '\n')
+        count = self._counts.get(journal_path, 0) + len(ops)
+        self._counts[journal_path] = count
+        if count >= self.compact_after:
+            self.compact(os_path)
+
+    def read(self, os_path):
+        """
+        Return base record and changes in the journal of a notebook.
+
+        Returns
+        -------
+        tuple of (dict, list of dict) or None
+            Base record and changes, or None if there is no journal or it
+            is stale. A line cut short by a crash ends the changes.
+        """
+        journal_path, _snapshot_path = self.get_paths(os_path)
+        try:
+            with open(journal_path) as f:
+                lines = f.readlines()
+        except OSError:
+            return None
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+        if not records or records[0].get('op') != 'base':
+            return None
+        base = records[0]
+        if base['mtime'] != get_mtime(os_path):
+            return None
+        return base, records[1:]
+
+    def recover(self, os_path):
+        """
+        Return the notebook with the changes in its journal applied.
+
+        Returns
+        -------
+        dict or None
+            Recovered notebook, or None if there is nothing to recover.
+        """
+        journal = self.read(os_path)
+        if journal is None:
+            return None
+        base, ops = journal
+        if not ops and not base.get('snapshot'):
+            return None
+        _journal_path, snapshot_path = self.get_paths(os_path)
+        try:
+            source = snapshot_path if base.get('snapshot') else os_path
+            with open(source, encoding='utf-8') as f:
+                notebook = json.load(f)
+            apply_ops(notebook, ops)
+        except (OSError, ValueError, LookupError, TypeError):
+            self.log.warning("Failed to recover journal of %s", os_path,
+                             exc_info=True)
+            return None
+        return notebook
+
+    def compact(self, os_path):
+        """Replace the changes in a journal by a snapshot of the notebook."""
+        notebook = self.recover(os_path)
+        if notebook is None:
+            return
+        journal_path, snapshot_path = self.get_paths(os_path)
+        with open(snapshot_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(notebook, f)
+        os.replace(snapshot_path + '.tmp', snapshot_path)
+        base = {'op': 'base', 'mtime': get_mtime(os_path), 'snapshot': True}
+        with open(journal_path + '.tmp', 'w') as f:
+            f.write(json.dumps(base) + '\n')
+        os.replace(journal_path + '.tmp', journal_path)
+        self._counts[journal_path] = 0
+
+    def discard(self, os_path):
+        """Remove the journal and snapshot of a notebook."""
+        for path in self.get_paths(os_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._counts.pop(path, None)
+
+
+class JournalHandler(APIHandler):
+    """
+    Append to, recover and discard the journal of a notebook.
+
+    Notebooks which the contents manager keeps in memory are not journaled,
+    because they are not recovered after a crash anyway.
+    """
+
+    @property
+    def journal(self):
+        return self.settings['journal']
+
+    def get_os_path(self, path):
+        return to_os_path(path, self.contents_manager.root_dir)
+
+    def is_in_memory(self, path):
+        in_memory = getattr(self.contents_manager, 'in_memory', None)
+        return in_memory is not None and in_memory(path)
+
+    @web.authenticated
+    @gen.coroutine
+    def get(self, path):
+        if self.is_in_memory(path):
+            raise web.HTTPError(404)
+        notebook = yield self.journal.run(self.journal.recover,
+                                          self.get_os_path(path))
+        if notebook is None:
+            raise web.HTTPError(404)
+        self.finish(json.dumps(notebook))
+
+    @web.authenticated
+    @gen.coroutine
+    def post(self, path):
+        body = self.get_json_body()
+        if not self.is_in_memory(path):
+            yield self.journal.run(
+                self.journal.append, self.get_os_path(path), body['ops'],
+                body.get('reset', False))
+        self.set_status(204)
+        self.finish()
+
+    @web.authenticated
+    @gen.coroutine
+    def delete(self, path):
+        if not self.is_in_memory(path):
+            yield self.journal.run(self.journal.discard,
+                                   self.get_os_path(path))
+        self.set_status(204)
+        self.finish()
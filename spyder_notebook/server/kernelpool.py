@@ -0,0 +1,152 @@
+"""
+Kernel manager which keeps kernels started in advance.
+
+Copyright (c) Spyder Project Contributors
+Distributed under the terms of the MIT License
+"""
+import os
+
+from notebook.services.kernels.kernelmanager import MappingKernelManager
+from notebook.utils import maybe_future
+from tornado import gen
+from tornado.ioloop import IOLoop
+from traitlets import Float, Instance, Integer
+
+
+class SpyderKernelManager(MappingKernelManager):
+    """
+    Kernel manager with a pool of kernels for the default kernel spec.
+
+    Starting a kernel for the default kernel spec takes a kernel from the
+    pool, if one is available, and changes its working directory to the
+    one the new kernel should have. The pool is refilled in the background.
+    Kernels in the pool are not listed in the REST API and are not culled.
+
+    If a CPU scheduler is set, new kernels get the environment variables it
+    returns, and it rebalances the CPUs after every kernel start.
+    """
+
+    kernel_pool_size = Integer(
+        0, config=True,
+        help="Number of kernels with the default kernel spec to start in "
+             "advance, so that new sessions do not have to wait for them.")
+
+    chdir_timeout = Float(
+        10, config=True,
+        help="Time (in seconds) to wait for a kernel from the pool to change "
+             "its working directory.")
+
+    cpu_scheduler = Instance('cpuscheduler.CpuScheduler', allow_none=True)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._pool = []
+        self._pool_starting = 0
+
+    def fill_pool(self):
+        """Start kernels in the background until the pool is full."""
+        missing = (self.kernel_pool_size - len(self._pool)
+                   - self._pool_starting)
+        for _i in range(missing):
+            self._pool_starting += 1
+            IOLoop.current().add_callback(self._start_pool_kernel)
+
+    @gen.coroutine
+    def _start_pool_kernel(self):
+        """Start a kernel and add it to the pool."""
+        try:
+            kernel_id = yield maybe_future(super().start_kernel(
+                kernel_name=self.default_kernel_name,
+                **self._scheduler_kwargs()))
+        except Exception:
+            self.log.exception("Failed to start kernel for the pool")
+        else:
+            self._pool.append(kernel_id)
+            self.log.info("Kernel added to pool: %s", kernel_id)
+            self._rebalance()
+        finally:
+            self._pool_starting -= 1
+
+    def _scheduler_kwargs(self):
+        """Return extra arguments for starting a kernel process."""
+        env = None
+        if self.cpu_scheduler is not None:
+            env = self.cpu_scheduler.kernel_env()
+        if env is None:
+            return {}
+        return {'env': dict(os.environ, **env)}
+
+    def _rebalance(self):
+        """Let the CPU scheduler rebalance the CPUs, if there is one."""
+        if self.cpu_scheduler is not None and self.cpu_scheduler.enabled:
+            self.cpu_scheduler.rebalance()
+
+    def _take_from_pool(self):
+        """Return id of a live kernel from the pool, or None."""
+        while self._pool:
+            kernel_id = self._pool.pop(0)
+            if kernel_id in self:
+                return kernel_id
+        return None
+
+    @gen.coroutine
+    def start_kernel(self, kernel_id=None, path=None, **kwargs):
+        """
+        Start a kernel for a session and return its kernel_id.
+
+        See MappingKernelManager.start_kernel() for the parameters.
+        """
+        kernel_name = kwargs.get('kernel_name') or self.default_kernel_name
+        pool_kernel_id = None
+        if kernel_id is None and kernel_name == self.default_kernel_name:
+            pool_kernel_id = self._take_from_pool()
+
+        if pool_kernel_id is None:
+            if 'env' not in kwargs:
+                kwargs.update(self._scheduler_kwargs())
+            kernel_id = yield maybe_future(super().start_kernel(
+                kernel_id=kernel_id, path=path, **kwargs))
+        else:
+            kernel_id = pool_kernel_id
+            self.log.info("Using kernel from pool: %s", kernel_id)
+            if path is not None:
+                cwd = self.cwd_for_path(path)
+                try:
+                    yield IOLoop.current().run_in_executor(
+                        None, self._change_directory, kernel_id, cwd)
+                except Exception:
+                    self.log.exception(
+                        "Failed to change directory of kernel %s", kernel_id)
+
+        self._rebalance()
+        self.fill_pool()
+        return kernel_id
+
+    def _change_directory(self, kernel_id, cwd):
+        """Change working directory of kernel; this blocks until done."""
+        client = self.get_kernel(kernel_id).blocking_client()
+        client.start_channels()
+        try:
+            msg_id = client.execute(
+                'import os as __os; __os.chdir({!r}); del __os'.format(cwd),
+                silent=True, store_history=False)
+            while True:
+                reply = client.get_shell_msg(timeout=self.chdir_timeout)
+                if reply['parent_header'].get('msg_id') == msg_id:
+                    break
+        finally:
+            client.stop_channels()
+
+    def pooled_kernel_ids(self):
+        """Return ids of the kernels in the pool."""
+        return list(self._pool)
+
+    def list_kernels(self):
+        """Return a list of models of running kernels not in the pool."""
+        return [model for model in super().list_kernels()
+                if model['id'] not in self._pool]
+
+    def cull_kernel_if_idle(self, kernel_id):
+        """Cull kernel if it is idle, unless it is in the pool."""
+        if kernel_id not in self._pool:
+            super().cull_kernel_if_idle(kernel_id)
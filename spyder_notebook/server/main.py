@@ -15,7 +15,23 @@ import os
 from jinja2 import FileSystemLoader
 from notebook.base.handlers import IPythonHandler, FileFindHandler
 from notebook.notebookapp import NotebookApp
+from notebook.services.contents.manager import ContentsManager
+from notebook.services.kernels.handlers import _kernel_id_regex
+from notebook.services.kernels.kernelmanager import MappingKernelManager
 from notebook.utils import url_path_join as ujoin
+from tornado.ioloop import IOLoop
+from traitlets import Bool, Integer, Type
+
+from cellcache import (CellCache, CellCacheEntryHandler,
+                       CellCacheLookupHandler, KEY_REGEX)
+from cpuscheduler import CpuScheduler, ThrottledChannelsHandler
+from dataflow import DataflowHandler
+from journal import JournalHandler, NotebookJournal
+from kernelpool import SpyderKernelManager
+from memorycontents import MemoryContentsManager
+from memorywatchdog import MemoryStatusHandler, MemoryWatchdog
+from metrics import (MeteredChannelsHandler, MeteredThrottledChannelsHandler,
+                     MetricsHandler, ServerMetrics)
 
 HERE = os.path.dirname(__file__)
 
@@ -37,7 +53,14 @@ class NotebookHandler(IPythonHandler):
             # FIXME: Don't use a CDN here
             'mathjaxUrl': 'https://cdnjs.cloudflare.com/ajax/libs/mathjax/'
                           '2.7.5/MathJax.js',
-            'mathjaxConfig': "TeX-AMS_CHTML-full,Safe"
+            'mathjaxConfig': "TeX-AMS_CHTML-full,Safe",
+            'maxStreamLines': self.settings['max_stream_lines'],
+            'lazyRendering': self.settings['lazy_rendering'],
+            'profilerCode': self.settings['profiler_code'],
+            'memoryLimit': self.settings['memory_watchdog'].limit,
+            'cellCache': self.settings['cell_cache'].enabled,
+            'cellCacheCode': self.settings['cell_cache_code'],
+            'journalInterval': self.settings['journal'].interval
         }
         return self.write(
             self.render_template(
@@ -54,18 +77,113 @@ class NotebookHandler(IPythonHandler):
 
 
 class SpyderNotebookServer(NotebookApp):
+    classes = NotebookApp.classes + [CellCache, CpuScheduler,
+                                     MemoryContentsManager, MemoryWatchdog,
+                                     NotebookJournal, ServerMetrics]
+
+    kernel_manager_class = Type(
+        default_value=SpyderKernelManager,
+        klass=MappingKernelManager,
+        config=True,
+        help="The kernel manager class to use.")
+
+    contents_manager_class = Type(
+        default_value=MemoryContentsManager,
+        klass=ContentsManager,
+        config=True,
+        help="The notebook manager class to use.")
+
+    max_stream_lines = Integer(
+        5000, config=True,
+        help="Maximum number of lines kept in the frontend for every stream "
+             "output; earlier lines are truncated. Use 0 for no limit.")
+
+    lazy_rendering = Bool(
+        True, config=True,
+        help="Whether to create cell editors and render outputs only when "
+             "cells come into view, so that long notebooks open quickly.")
+
+    profile_cells = Bool(
+        False, config=True,
+        help="Whether to measure the wall time, CPU time and memory used by "
+             "every cell that is run, and show them next to the cell.")
+
     def init_webapp(self):
         """initialize tornado webapp and httpserver.
         """
         super().init_webapp()
+        self.web_app.settings['max_stream_lines'] = self.max_stream_lines
+        self.web_app.settings['lazy_rendering'] = self.lazy_rendering
+        profiler_code = ''
+        if self.profile_cells:
+            with open(os.path.join(HERE, 'cellprofiler.py')) as f:
+                profiler_code = f.read()
+        self.web_app.settings['profiler_code'] = profiler_code
+        self.memory_watchdog = MemoryWatchdog(
+            parent=self, kernel_manager=self.kernel_manager)
+        self.web_app.settings['memory_watchdog'] = self.memory_watchdog
+        cell_cache = CellCache(parent=self)
+        cell_cache_code = ''
+        if cell_cache.enabled and cell_cache.store_namespaces:
+            with open(os.path.join(HERE, 'namespacecache.py')) as f:
+                cell_cache_code = f.read()
+        self.web_app.settings['cell_cache'] = cell_cache
+        self.web_app.settings['cell_cache_code'] = cell_cache_code
+        self.web_app.settings['journal'] = NotebookJournal(parent=self)
+        self.cpu_scheduler = CpuScheduler(
+            parent=self, kernel_manager=self.kernel_manager)
+        self.web_app.settings['cpu_scheduler'] = self.cpu_scheduler
+        if isinstance(self.kernel_manager, SpyderKernelManager):
+            self.kernel_manager.cpu_scheduler = self.cpu_scheduler
+        self.server_metrics = ServerMetrics(
+            parent=self, kernel_manager=self.kernel_manager,
+            cpu_scheduler=self.cpu_scheduler)
+        self.server_metrics.base_url = self.base_url
+        self.web_app.settings['server_metrics'] = self.server_metrics
 
         default_handlers = [
             (ujoin(self.base_url, r'/notebook/(.*)'), NotebookHandler),
             (ujoin(self.base_url, r"/static/(.*)"), FileFindHandler,
-                {'path': os.path.join(HERE, 'build')})
+                {'path': os.path.join(HERE, 'build')}),
+            (ujoin(self.base_url, r'/spyder/memory/%s' % _kernel_id_regex),
+                MemoryStatusHandler),
+            (ujoin(self.base_url, r'/spyder/cellcache/lookup'),
+                CellCacheLookupHandler),
+            (ujoin(self.base_url, r'/spyder/cellcache/entries/%s' % KEY_REGEX),
+                CellCacheEntryHandler),
+            (ujoin(self.base_url, r'/spyder/dataflow'), DataflowHandler),
+            (ujoin(self.base_url, r'/spyder/journal/(.*)'), JournalHandler)
         ]
+        channels_handler = None
+        if self.server_metrics.enabled:
+            self.web_app.settings['log_function'] = (
+                self.server_metrics.wrap_log_function(
+                    self.web_app.settings.get('log_function')))
+            default_handlers.append(
+                (ujoin(self.base_url, r'/spyder/metrics'), MetricsHandler))
+            if self.cpu_scheduler.max_executing:
+                channels_handler = MeteredThrottledChannelsHandler
+            else:
+                channels_handler = MeteredChannelsHandler
+        elif self.cpu_scheduler.max_executing:
+            channels_handler = ThrottledChannelsHandler
+        if channels_handler is not None:
+            default_handlers.append(
+                (ujoin(self.base_url,
+                       r'/api/kernels/%s/channels' % _kernel_id_regex),
+                    channels_handler))
         self.web_app.add_handlers('.*$', default_handlers)
 
+    def start(self):
+        """Start the server, filling the kernel pool once it runs."""
+        fill_pool = getattr(self.kernel_manager, 'fill_pool', None)
+        if fill_pool is not None:
+            IOLoop.current().add_callback(fill_pool)
+        self.memory_watchdog.start()
+        self.cpu_scheduler.start()
+        self.server_metrics.start()
+        super().start()
+
 
 if __name__ == '__main__':
     SpyderNotebookServer.launch_instance()
@@ -0,0 +1,235 @@
+"""
+Contents manager keeping the notebooks in one directory in memory.
+
+Copyright (c) Spyder Project Contributors
+Distributed under the terms of the MIT License
+"""
+import copy
+from datetime import datetime, timezone
+import os.path as osp
+
+import nbformat
+from notebook.services.contents.largefilemanager import LargeFileManager
+from tornado import web
+from traitlets import Unicode
+
+# Id of the only checkpoint of a notebook in memory
+CHECKPOINT_ID = 'checkpoint'
+
+
+def normalize_path(path):
+    """Return a canonical form of a path, for comparing paths."""
+    return osp.normcase(osp.realpath(path))
+
+
+def utcnow():
+    """Return the current time with time zone, as contents models need."""
+    return datetime.now(timezone.utc)
+
+
+class MemoryContentsManager(LargeFileManager):
+    """
+    Contents manager keeping the notebooks in one directory in memory.
+
+    Spyder creates untitled notebooks in a temporary directory and deletes
+    them when they are closed. Notebooks in `memory_dir` are never written
+    to disk, so autosaving them costs no disk I/O. A notebook leaves memory
+    when it is deleted, or written to disk when it is renamed to a path
+    outside `memory_dir`. Other files in the directory and the directory
+    itself, in which kernels are started, are on disk as usual.
+    """
+
+    memory_dir = Unicode(
+        '', config=True,
+        help="Directory whose notebooks are kept in memory instead of on "
+             "disk. Use an empty string to keep all notebooks on disk.")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._notebooks = {}
+        self._checkpoints = {}
+
+    def in_memory(self, path):
+        """Return whether the notebook at an API path is kept in memory."""
+        path = path.strip('/')
+        if not self.memory_dir or not path.endswith('.ipynb'):
+            return False
+        os_path = self._get_os_path(path)
+        return (normalize_path(osp.dirname(os_path))
+                == normalize_path(self.memory_dir))
+
+    def _get_entry(self, path):
+        """Return the notebook at a path in memory, or raise 404."""
+        try:
+            return self._notebooks[path]
+        except KeyError:
+            raise web.HTTPError(404, 'No such file or directory: %s' % path)
+
+    def file_exists(self, path=''):
+        """Return whether a file or notebook in memory exists."""
+        if self.in_memory(path):
+            return path.strip('/') in self._notebooks
+        return super().file_exists(path)
+
+    def exists(self, path):
+        """Return whether a file, directory or notebook in memory exists."""
+        if self.in_memory(path):
+            return path.strip('/') in self._notebooks
+        return super().exists(path)
+
+    def is_hidden(self, path):
+        """Return whether a path is hidden; notebooks in memory are not."""
+        if self.in_memory(path):
+            return False
+        return super().is_hidden(path)
+
+    def get(self, path, content=True, type=None, format=None):
+        """Return the model of a file, directory or notebook in memory."""
+        path = path.strip('/')
+        if not self.in_memory(path):
+            return super().get(path, content=content, type=type,
+                               format=format)
+        entry = self._get_entry(path)
+        if type not in (None, 'notebook'):
+            raise web.HTTPError(400, '%s is a notebook, not a %s'
+                                % (path, type), reason='bad type')
+        model = {
+            'name': path.rsplit('/', 1)[-1],
+            'path': path,
+            'type': 'notebook',
+            'created': entry['created'],
+            'last_modified': entry['last_modified'],
+            'content': None,
+            'format': None,
+            'mimetype': None,
+            'size': None,
+            'writable': True
+        }
+        if content:
+            nb = copy.deepcopy(entry['content'])
+            self.mark_trusted_cells(nb, path)
+            model['content'] = nb
+            model['format'] = 'json'
+            self.validate_notebook_model(model)
+        return model
+
+    def save(self, model, path=''):
+        """Save a model and return it without content."""
+        path = path.strip('/')
+        if not self.in_memory(path):
+            return super().save(model, path)
+        if model.get('type') != 'notebook':
+            raise web.HTTPError(400, 'Only notebooks can be saved in %s'
+                                % self.memory_dir)
+        if 'content' not in model:
+            raise web.HTTPError(400, 'No file content provided')
+
+        self.run_pre_save_hook(model=model, path=path)
+        nb = nbformat.from_dict(model['content'])
+        self.check_and_sign(nb, path)
+        now = utcnow()
+        entry = self._notebooks.setdefault(path, {'created': now})
+        entry['content'] = nb
+        entry['last_modified'] = now
+
+        self.validate_notebook_model(model)
+        validation_message = model.get('message', None)
+        model = self.get(path, content=False)
+        if validation_message:
+            model['message'] = validation_message
+        return model
+
+    def delete_file(self, path):
+        """Delete a file or a notebook in memory."""
+        path = path.strip('/')
+        if not self.in_memory(path):
+            return super().delete_file(path)
+        self._get_entry(path)
+        del self._notebooks[path]
+
+    def delete(self, path):
+        """Delete a file or a notebook in memory and its checkpoints."""
+        path = path.strip('/')
+        if not self.in_memory(path):
+            return super().delete(path)
+        self.delete_file(path)
+        self._checkpoints.pop(path, None)
+
+    def rename_file(self, old_path, new_path):
+        """Rename a file, writing a notebook in memory to disk if it leaves."""
+        old_path = old_path.strip('/')
+        new_path = new_path.strip('/')
+        if not self.in_memory(old_path):
+            if self.in_memory(new_path):
+                raise web.HTTPError(400, 'Cannot move files into %s'
+                                    % self.memory_dir)
+            return super().rename_file(old_path, new_path)
+        if new_path == old_path:
+            return
+        if self.exists(new_path):
+            raise web.HTTPError(409, 'File already exists: %s' % new_path)
+        entry = self._get_entry(old_path)
+        if self.in_memory(new_path):
+            self._notebooks[new_path] = entry
+        else:
+            super().save({'type': 'notebook', 'content': entry['content']},
+                         new_path)
+        del self._notebooks[old_path]
+
+    def rename(self, old_path, new_path):
+        """Rename a file and its checkpoints."""
+        old_path = old_path.strip('/')
+        new_path = new_path.strip('/')
+        if not self.in_memory(old_path):
+            return super().rename(old_path, new_path)
+        self.rename_file(old_path, new_path)
+        checkpoint = self._checkpoints.pop(old_path, None)
+        if checkpoint is not None and self.in_memory(new_path):
+            self._checkpoints[new_path] = checkpoint
+
+    def create_checkpoint(self, path):
+        """Create a checkpoint, which is kept in memory for notebooks there."""
+        path = path.strip('/')
+        if not self.in_memory(path):
+            return super().create_checkpoint(path)
+        entry = self._get_entry(path)
+        self._checkpoints[path] = {
+            'content': copy.deepcopy(entry['content']),
+            'last_modified': entry['last_modified']
+        }
+        return {'id': CHECKPOINT_ID, 'last_modified': entry['last_modified']}
+
+    def list_checkpoints(self, path):
+        """Return the models of the checkpoints of a file."""
+        path = path.strip('/')
+        if not self.in_memory(path):
+            return super().list_checkpoints(path)
+        checkpoint = self._checkpoints.get(path)
+        if checkpoint is None:
+            return []
+        return [{'id': CHECKPOINT_ID,
+                 'last_modified': checkpoint['last_modified']}]
+
+    def restore_checkpoint(self, checkpoint_id, path):
+        """Restore a file from a checkpoint."""
+        path = path.strip('/')
+        if not self.in_memory(path):
+            return super().restore_checkpoint(checkpoint_id, path)
+        checkpoint = self._checkpoints.get(path)
+        if checkpoint is None or checkpoint_id != CHECKPOINT_ID:
+            raise web.HTTPError(404, 'Checkpoint does not exist: %s@%s'
+                                % (path, checkpoint_id))
+        now = utcnow()
+        entry = self._notebooks.setdefault(path, {'created': now})
+        entry['content'] = copy.deepcopy(checkpoint['content'])
+        entry['last_modified'] = now
+
+    def delete_checkpoint(self, checkpoint_id, path):
+        """Delete a checkpoint of a file."""
+        path = path.strip('/')
+        if not self.in_memory(path):
+            return super().delete_checkpoint(checkpoint_id, path)
+        if (checkpoint_id != CHECKPOINT_ID
+                or self._checkpoints.pop(path, None) is None):
+            raise web.HTTPError(404, 'Checkpoint does not exist: %s@%s'
+                                % (path, checkpoint_id))
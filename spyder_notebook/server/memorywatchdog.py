@@ -0,0 +1,188 @@
+"""
+Watchdog enforcing a memory limit on every kernel.
+
+Copyright (c) Spyder Project Contributors
+Distributed under the terms of the MIT License
+"""
+import asyncio
+import inspect
+import json
+import time
+
+import psutil
+from notebook.base.handlers import APIHandler
+from tornado import web
+from tornado.ioloop import PeriodicCallback
+from traitlets import Float, Instance, Integer
+from traitlets.config import LoggingConfigurable
+
+# Escalation levels of a kernel which uses too much memory
+OK, WARNED, INTERRUPTED, KILLED = range(4)
+
+# Number of events kept for every kernel
+MAX_EVENTS = 20
+
+
+class MemoryWatchdog(LoggingConfigurable):
+    """
+    Watchdog which samples the memory used by kernels and reins them in.
+
+    A kernel which uses more than `warn_fraction` of the limit gets a
+    warning. A kernel which uses more than the limit is interrupted, and it
+    is killed if it still uses more than the limit `kill_grace` seconds
+    later, by restarting it without waiting for it to shut down. Every step
+    is recorded as an event, which the page polls to tell the user.
+    """
+
+    memory_limit = Integer(
+        0, config=True,
+        help="Maximum memory (in MiB) that a kernel and its children may use. "
+             "Use 0 for no limit.")
+
+    warn_fraction = Float(
+        0.9, config=True,
+        help="Fraction of the memory limit above which the user is warned.")
+
+    interval = Float(
+        2, config=True,
+        help="Time (in seconds) between checks of the memory of kernels.")
+
+    kill_grace = Float(
+        10, config=True,
+        help="Time (in seconds) that an interrupted kernel has to get below "
+             "the memory limit before it is killed.")
+
+    kernel_manager = Instance(
+        'notebook.services.kernels.kernelmanager.MappingKernelManager')
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._levels = {}
+        self._since = {}
+        self._events = {}
+        self._seq = 0
+        self._callback = None
+
+    @property
+    def limit(self):
+        """Memory limit in bytes."""
+        return self.memory_limit * 1024 ** 2
+
+    def start(self):
+        """Start checking kernels periodically, if there is a limit."""
+        if self.memory_limit and self._callback is None:
+            self._callback = PeriodicCallback(self.check_kernels,
+                                              self.interval * 1000)
+            self._callback.start()
+
+    def stop(self):
+        """Stop checking kernels."""
+        if self._callback is not None:
+            self._callback.stop()
+            self._callback = None
+
+    def get_kernel_memory(self, kernel_id):
+        """
+        Return resident memory of a kernel and its children in bytes, or
+        None if unknown.
+
+        Processes that exit while being inspected are ignored.
+        """
+        process = getattr(self.kernel_manager.get_kernel(kernel_id),
+                          'kernel', None)
+        if process is None:
+            return None
+        try:
+            kernel = psutil.Process(process.pid)
+            processes = [kernel] + kernel.children(recursive=True)
+        except psutil.Error:
+            return 0
+        total = 0
+        for proc in processes:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def check_kernels(self):
+        """Check the memory of all kernels and act on those over budget."""
+        for kernel_id in list(self.kernel_manager.list_kernel_ids()):
+            memory = self.get_kernel_memory(kernel_id)
+            if memory is not None:
+                self.check_kernel(kernel_id, memory)
+        for kernel_id in list(self._levels):
+            if kernel_id not in self.kernel_manager:
+                self.forget(kernel_id)
+
+    def check_kernel(self, kernel_id, memory, now=None):
+        """Act on the memory used by a kernel."""
+        now = time.monotonic() if now is None else now
+        level = self._levels.get(kernel_id, OK)
+
+        if memory > self.limit:
+            if level < INTERRUPTED:
+                self.log.warning("Interrupting kernel %s, which uses %d MiB",
+                                 kernel_id, memory // 1024 ** 2)
+                self._set_level(kernel_id, INTERRUPTED, memory, now)
+                self.kernel_manager.interrupt_kernel(kernel_id)
+            elif (level == INTERRUPTED
+                    and now - self._since[kernel_id] >= self.kill_grace):
+                self.log.warning("Killing kernel %s, which uses %d MiB",
+                                 kernel_id, memory // 1024 ** 2)
+                self._set_level(kernel_id, KILLED, memory, now)
+                self.kill_kernel(kernel_id)
+        elif memory > self.warn_fraction * self.limit:
+            if level < WARNED:
+                self._set_level(kernel_id, WARNED, memory, now)
+        elif level != OK:
+            self._levels[kernel_id] = OK
+
+    def kill_kernel(self, kernel_id):
+        """Kill a kernel right away and start it again with the same id."""
+        restart_kernel = self.kernel_manager.restart_kernel
+        if 'now' in inspect.signature(restart_kernel).parameters:
+            result = restart_kernel(kernel_id, now=True)
+        else:
+            # The kernel manager of notebook < 6.1 only restarts gracefully,
+            # which a kernel that is out of memory may not survive
+            result = self.kernel_manager.get_kernel(kernel_id).restart_kernel(
+                now=True)
+        if inspect.isawaitable(result):
+            asyncio.ensure_future(result)
+
+    def forget(self, kernel_id):
+        """Drop the state of a kernel that no longer exists."""
+        self._levels.pop(kernel_id, None)
+        self._since.pop(kernel_id, None)
+        self._events.pop(kernel_id, None)
+
+    def get_status(self, kernel_id):
+        """Return memory use, limit and recent events of a kernel."""
+        memory = None
+        if kernel_id in self.kernel_manager:
+            memory = self.get_kernel_memory(kernel_id)
+        return {'memory': memory,
+                'limit': self.limit,
+                'events': self._events.get(kernel_id, [])}
+
+    def _set_level(self, kernel_id, level, memory, now):
+        """Escalate a kernel to a new level and record an event for it."""
+        self._levels[kernel_id] = level
+        self._since[kernel_id] = now
+        self._seq += 1
+        action = {WARNED: 'warn', INTERRUPTED: 'interrupt',
+                  KILLED: 'kill'}[level]
+        events = self._events.setdefault(kernel_id, [])
+        events.append({'seq': self._seq, 'action': action, 'memory': memory,
+                       'limit': self.limit, 'time': time.time()})
+        del events[:-MAX_EVENTS]
+
+
+class MemoryStatusHandler(APIHandler):
+    """Report the memory use of a kernel and what the watchdog did."""
+
+    @web.authenticated
+    def get(self, kernel_id):
+        watchdog = self.settings['memory_watchdog']
+        self.finish(json.dumps(watchdog.get_status(kernel_id)))
@@ -0,0 +1,304 @@
+"""
+Metrics of the notebook server in the Prometheus text format.
+
+Copyright (c) Spyder Project Contributors
+Distributed under the terms of the MIT License
+"""
+import re
+import time
+
+from notebook.base.handlers import IPythonHandler
+from notebook.services.kernels.handlers import ZMQChannelsHandler
+from tornado import web
+from tornado.ioloop import IOLoop
+from traitlets import Bool, Float, Instance
+from traitlets.config import LoggingConfigurable
+
+from cpuscheduler import ThrottledChannelsHandler
+
+# Content type of the Prometheus text format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Prefix of the names of all metrics
+PREFIX = 'spyder_notebook_'
+
+# Upper bounds of the buckets of the histograms
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 1024 ** 2, 10 * 1024 ** 2,
+                100 * 1024 ** 2)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+
+# Kinds of handlers, with the paths (relative to the base url) they serve;
+# requests for other paths are counted as 'other'
+HANDLER_KINDS = [
+    ('channels', re.compile(r'api/kernels/[^/]+/channels')),
+    ('contents', re.compile(r'api/contents')),
+    ('sessions', re.compile(r'api/sessions')),
+    ('kernels', re.compile(r'api/kernels')),
+    ('static', re.compile(r'(static|custom|nbextensions)/')),
+    ('notebook', re.compile(r'notebook/')),
+    ('spyder', re.compile(r'spyder/')),
+]
+
+
+def get_handler_kind(path, base_url='/'):
+    """Return the kind of handler serving a request for a path."""
+    if path.startswith(base_url):
+        path = path[len(base_url):]
+    path = path.lstrip('/')
+    for kind, regex in HANDLER_KINDS:
+        if regex.match(path):
+            return kind
+    return 'other'
+
+
+def format_labels(labels):
+    """Format labels, given as a tuple of (name, value) pairs."""
+    if not labels:
+        return ''
+    values = ('{}="{}"'.format(
+        name, str(value).replace('\\', r'\\').replace('"', r'\"')
+        .replace('\n', r'\n')) for name, value in labels)
+    return '{' + ','.join(values) + '}'
+
+
+def format_value(value):
+    """Format a sample value, writing whole numbers without a fraction."""
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Histogram:
+    """
+    Histogram of observations with a set of labels.
+
+    Every combination of label values has its own counts, which are
+    cumulative over the buckets as in the Prometheus text format.
+    """
+
+    def __init__(self, name, help, buckets):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets) + (float('inf'),)
+        self._series = {}
+
+    def observe(self, value, **labels):
+        """Add an observation for the given label values."""
+        key = tuple(sorted(labels.items()))
+        counts, total = self._series.get(key, ([0] * len(self.buckets), 0))
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+        self._series[key] = (counts, total + value)
+
+    def render(self):
+        """Return the lines of the histogram in the text format."""
+        lines = ['# HELP {} {}'.format(self.name, self.help),
+                 '# TYPE {} histogram'.format(self.name)]
+        for key in sorted(self._series):
+            counts, total = self._series[key]
+            for bound, count in zip(self.buckets, counts):
+                labels = key + (('le', format_value(bound)),)
+                lines.append('{}_bucket{} {}'.format(
+                    self.name, format_labels(labels), count))
+            lines.append('{}_sum{} {}'.format(
+                self.name, format_labels(key), format_value(total)))
+            lines.append('{}_count{} {}'.format(
+                self.name, format_labels(key), counts[-1]))
+        return lines
+
+
+def render_metric(name, kind, help, samples):
+    """
+    Return the lines of a counter or gauge in the text format.
+
+    Parameters
+    ----------
+    name : str
+        Name of the metric.
+    kind : str
+        Either 'counter' or 'gauge'.
+    help : str
+        Description of the metric.
+    samples : dict
+        Values of the metric, by tuple of (name, value) label pairs.
+    """
+    lines = ['# HELP {} {}'.format(name, help),
+             '# TYPE {} {}'.format(name, kind)]
+    for key in sorted(samples):
+        lines.append('{}{} {}'.format(name, format_labels(key),
+                                      format_value(samples[key])))
+    return lines
+
+
+class ServerMetrics(LoggingConfigurable):
+    """
+    Metrics about the requests, kernels and event loop of the server.
+
+    The latency of every finished request is recorded by kind of handler,
+    so that slow responses can be put down to contents I/O, kernel
+    management or serving the frontend. The sizes of notebooks sent to and
+    from the contents handler and the number of websocket messages to and
+    from every kernel are recorded too; message rates follow from the
+    counts over time. Finally, the event loop is checked every
+    `lag_interval` seconds for how late it runs callbacks, which is a sign
+    that a handler blocks it.
+    """
+
+    enabled = Bool(
+        True, config=True,
+        help="Whether to collect metrics and serve them at /spyder/metrics.")
+
+    lag_interval = Float(
+        0.5, config=True,
+        help="Time (in seconds) between checks of the lag of the event loop.")
+
+    kernel_manager = Instance(
+        'notebook.services.kernels.kernelmanager.MappingKernelManager')
+
+    cpu_scheduler = Instance('cpuscheduler.CpuScheduler', allow_none=True)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = '/'
+        self.latency = Histogram(
+            PREFIX + 'request_duration_seconds',
+            'Time spent handling requests, by kind of handler.',
+            LATENCY_BUCKETS)
+        self.payload = Histogram(
+            PREFIX + 'contents_payload_bytes',
+            'Size of bodies of requests to and responses from the contents '
+            'handler.', SIZE_BUCKETS)
+        self.loop_lag = Histogram(
+            PREFIX + 'event_loop_lag_seconds',
+            'Delay of callbacks scheduled on the event loop.', LAG_BUCKETS)
+        self.messages = {}
+        self.last_lag = 0
+        self._expected = None
+        self._timeout = None
+
+    def wrap_log_function(self, log_function):
+        """
+        Return a function which records a finished request, then logs it.
+
+        Tornado calls the `log_function` setting of the application for
+        every finished request, so this sees all requests.
+        """
+        def log_request(handler):
+            self.record_request(handler)
+            if log_function is not None:
+                log_function(handler)
+        return log_request
+
+    def record_request(self, handler):
+        """Record the latency and payload size of a finished request."""
+        request = handler.request
+        kind = get_handler_kind(request.path, self.base_url)
+        self.latency.observe(request.request_time(), handler=kind,
+                             method=request.method)
+        if kind == 'contents':
+            if request.body:
+                self.payload.observe(len(request.body), direction='request')
+            length = handler._headers.get('Content-Length')
+            if length:
+                self.payload.observe(int(length), direction='response')
+
+    def count_message(self, kernel_id, direction):
+        """Count a websocket message to ('in') or from ('out') a kernel."""
+        key = (('direction', direction), ('kernel_id', kernel_id))
+        self.messages[key] = self.messages.get(key, 0) + 1
+
+    def start(self):
+        """Start checking the lag of the event loop, if enabled."""
+        if self.enabled and self._timeout is None:
+            self._schedule_lag_check()
+
+    def stop(self):
+        """Stop checking the lag of the event loop."""
+        if self._timeout is not None:
+            IOLoop.current().remove_timeout(self._timeout)
+            self._timeout = None
+
+    def _schedule_lag_check(self):
+        self._expected = time.monotonic() + self.lag_interval
+        self._timeout = IOLoop.current().call_later(
+            self.lag_interval, self._check_lag)
+
+    def _check_lag(self):
+        self.last_lag = max(0, time.monotonic() - self._expected)
+        self.loop_lag.observe(self.last_lag)
+        self._schedule_lag_check()
+
+    def forget_kernels(self, kernel_ids):
+        """Drop the message counts of kernels which no longer exist."""
+        for key in list(self.messages):
+            if dict(key)['kernel_id'] not in kernel_ids:
+                del self.messages[key]
+
+    def render(self):
+        """Return all metrics in the Prometheus text format."""
+        kernel_ids = set(self.kernel_manager.list_kernel_ids())
+        self.forget_kernels(kernel_ids)
+        lines = self.latency.render() + self.payload.render()
+        lines += render_metric(
+            PREFIX + 'websocket_messages_total', 'counter',
+            'Websocket messages to (in) and from (out) every kernel.',
+            self.messages)
+        lines += render_metric(
+            PREFIX + 'kernels', 'gauge', 'Number of live kernels.',
+            {(): len(kernel_ids)})
+        if self.cpu_scheduler is not None:
+            lines += render_metric(
+                PREFIX + 'executing_kernels', 'gauge',
+                'Number of kernels running code.',
+                {(): self.cpu_scheduler.executing})
+            lines += render_metric(
+                PREFIX + 'waiting_kernels', 'gauge',
+                'Number of kernels waiting to run code.',
+                {(): self.cpu_scheduler.waiting})
+        lines += self.loop_lag.render()
+        lines += render_metric(
+            PREFIX + 'event_loop_last_lag_seconds', 'gauge',
+            'Delay of the last check of the event loop.',
+            {(): self.last_lag})
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsHandler(IPythonHandler):
+    """Serve the metrics of the server in the Prometheus text format."""
+
+    @web.authenticated
+    def get(self):
+        self.set_header('Content-Type', CONTENT_TYPE)
+        self.finish(self.settings['server_metrics'].render())
+
+
+class MeteredChannelsMixin:
+    """Mixin for websocket handlers counting the messages of the kernel."""
+
+    @property
+    def server_metrics(self):
+        return self.settings['server_metrics']
+
+    def on_message(self, msg):
+        self.server_metrics.count_message(self.kernel_id, 'in')
+        super().on_message(msg)
+
+    def _on_zmq_reply(self, stream, msg_list):
+        self.server_metrics.count_message(self.kernel_id, 'out')
+        super()._on_zmq_reply(stream, msg_list)
+
+
+class MeteredChannelsHandler(MeteredChannelsMixin, ZMQChannelsHandler):
+    """Websocket handler counting the messages of the kernel."""
+
+
+class MeteredThrottledChannelsHandler(MeteredChannelsMixin,
+                                      ThrottledChannelsHandler):
+    """
+    Websocket handler counting the messages of the kernel and letting the
+    scheduler hold back execute requests.
+    """
@@ -0,0 +1,184 @@
+"""
+Kernel side of the cell cache.
+
+This file is not imported by the server. Its source is sent to the page,
+which runs it silently in every kernel it connects to when variables are
+stored in the cell cache. It registers hooks which pickle the variables
+that every cell defines, reassigns or may change in place, so that the
+page can store them in the cache, and it can load stored variables back
+into the namespace.
+
+Copyright (c) Spyder Project Contributors
+Distributed under the terms of the MIT License
+"""
+
+
+def _setup_spyder_cell_cache():
+    import ast
+    from collections import OrderedDict
+    import importlib
+    import inspect
+    import os
+    import pickle
+    import types
+
+    class NamespaceCache:
+        """
+        Pickle the variables changed by cells and load them back.
+
+        A variable is changed by a cell if it is bound to another object
+        afterwards, or if it may be changed in place: because the cell
+        names it, or because the cell calls a function that names it.
+        """
+
+        # Number of cells for which pickled variables are kept in memory
+        max_deltas = 10
+
+        def __init__(self, shell):
+            self.shell = shell
+            self.deltas = OrderedDict()
+            self._before = None
+            self._names = None
+
+        def register(self):
+            self.shell.events.register('pre_run_cell', self.pre_run_cell)
+            self.shell.events.register('post_run_cell', self.post_run_cell)
+
+        def unregister(self):
+            for event, callback in [('pre_run_cell', self.pre_run_cell),
+                                    ('post_run_cell', self.post_run_cell)]:
+                try:
+                    self.shell.events.unregister(event, callback)
+                except ValueError:
+                    pass
+
+        def get_variables(self):
+            hidden = self.shell.user_ns_hidden
+            return {name: value for name, value in self.shell.user_ns.items()
+                    if not name.startswith('_') and name not in hidden}
+
+        def get_cell_names(self, info):
+            """
+            Return the names in the source of a cell, or None if unknown.
+
+            IPython < 7 does not pass the cell to pre_run_cell hooks.
+            """
+            source = getattr(info, 'raw_cell', None)
+            if source is None:
+                return None
+            try:
+                tree = ast.parse(self.shell.transform_cell(source))
+            except (SyntaxError, ValueError):
+                return set()
+            return {node.id for node in ast.walk(tree)
+                    if isinstance(node, ast.Name)}
+
+        def get_reachable_names(self, names, namespace):
+            """Add the global names of functions called by name."""
+            reachable = set()
+            pending = list(names)
+            while pending:
+                name = pending.pop()
+                if name in reachable:
+                    continue
+                reachable.add(name)
+                value = namespace.get(name)
+                if inspect.isfunction(value):
+                    codes = [value.__code__]
+                    while codes:
+                        code = codes.pop()
+                        pending.extend(code.co_names)
+                        codes.extend(const for const in code.co_consts
+                                     if inspect.iscode(const))
+            return reachable
+
+        def may_change_in_place(self, value):
+            return not (isinstance(value, types.ModuleType)
+                        or inspect.isfunction(value)
+                        or inspect.isclass(value))
+
+        def pre_run_cell(self, info=None):
+            variables = self.get_variables()
+            self._before = {name: id(value)
+                            for name, value in variables.items()}
+            names = self.get_cell_names(info)
+            if names is not None:
+                names = self.get_reachable_names(names, variables)
+            self._names = names
+
+        def post_run_cell(self, result=None):
+            if self._before is None:
+                return
+            before, names = self._before, self._names
+            self._before = self._names = None
+            after = self.get_variables()
+            changed = {name: value for name, value in after.items()
+                       if before.get(name) != id(value)
+                       or (self.may_change_in_place(value)
+                           and (names is None or name in names))}
+            deleted = [name for name in before if name not in after]
+
+            count = getattr(result, 'execution_count', None)
+            if count is None:
+                count = self.shell.execution_count - 1
+            self.deltas[count] = self.dump(changed, deleted)
+            while len(self.deltas) > self.max_deltas:
+                self.deltas.popitem(last=False)
+
+        def dump(self, changed, deleted):
+            """Pickle a delta, or return None if that is not possible."""
+            modules = {}
+            values = {}
+            for name, value in changed.items():
+                if isinstance(value, types.ModuleType):
+                    modules[name] = value.__name__
+                elif ((inspect.isfunction(value) or inspect.isclass(value))
+                        and value.__module__ == '__main__'):
+                    # Pickled by reference to a namespace that is not there
+                    # when the delta is loaded in a new kernel
+                    return None
+                else:
+                    values[name] = value
+            try:
+                return pickle.dumps({'modules': modules, 'values': values,
+                                     'deleted': deleted})
+            except Exception:
+                return None
+
+        def save(self, count, path):
+            """Write pickled variables of a cell to a file."""
+            data = self.deltas.pop(count, None)
+            if data is None:
+                return False
+            with open(path + '.tmp', 'wb') as f:
+                f.write(data)
+            os.replace(path + '.tmp', path)
+            return True
+
+        def load(self, paths):
+            """Load the variables of a sequence of cells into the namespace."""
+            deltas = []
+            for path in paths:
+                with open(path, 'rb') as f:
+                    deltas.append(pickle.load(f))
+            user_ns = self.shell.user_ns
+            for delta in deltas:
+                for name, module in delta['modules'].items():
+                    user_ns[name] = importlib.import_module(module)
+                user_ns.update(delta['values'])
+                for name in delta['deleted']:
+                    user_ns.pop(name, None)
+            return True
+
+    shell = get_ipython()  # noqa: F821
+    previous = shell.user_ns.get('__spyder_cell_cache__')
+    if previous is not None:
+        previous.unregister()
+    cache = NamespaceCache(shell)
+    cache.register()
+    shell.user_ns['__spyder_cell_cache__'] = cache
+    shell.user_ns_hidden['__spyder_cell_cache__'] = cache
+
+
+_setup_spyder_cell_cache()
+del _setup_spyder_cell_cache
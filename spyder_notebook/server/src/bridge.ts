@@ -0,0 +1,223 @@
+/**
+ * Bridge for calls from Spyder into the notebook frontend.
+ *
+ * Spyder shares a Python object called `spyder` with the page, through
+ * QWebChannel in QtWebEngine or as a window object in QtWebKit. Spyder
+ * sends batches of calls through its `sig_calls` signal; the calls are
+ * executed in order and their results are returned in one batch by
+ * calling its `reply` slot.
+ */
+import { PromiseDelegate } from '@phosphor/coreutils';
+import { NotebookPanel, NotebookActions } from '@jupyterlab/notebook';
+import { ICellProfile, PROFILE_KEY } from './profiler';
+import { ISearchOptions, SearchIndex } from './search';
+
+declare const QWebChannel: any;
+declare const qt: any;
+
+/**
+ * A call from Spyder.
+ */
+interface ICall {
+  id: number;
+  method: string;
+  args: any[];
+}
+
+/**
+ * The reply to a call from Spyder.
+ */
+interface IReply {
+  id: number;
+  result?: any;
+  error?: string;
+}
+
+/**
+ * A method that can be called from Spyder.
+ */
+export type BridgeMethod = (...args: any[]) => any;
+
+export class SpyderBridge {
+  constructor() {
+    if (typeof qt !== 'undefined' && typeof QWebChannel !== 'undefined') {
+      // tslint:disable-next-line:no-unused-expression
+      new QWebChannel(qt.webChannelTransport, (channel: any) => {
+        this._connect(channel.objects.spyder);
+      });
+    } else if ((window as any).spyder) {
+      this._connect((window as any).spyder);
+    }
+  }
+
+  /**
+   * Whether the page is connected to Spyder.
+   */
+  get isConnected(): boolean {
+    return this._spyder !== null;
+  }
+
+  /**
+   * Register a method so that Spyder can call it.
+   */
+  register(name: string, method: BridgeMethod): void {
+    this._methods[name] = method;
+  }
+
+  private _connect(spyder: any): void {
+    this._spyder = spyder;
+    spyder.sig_calls.connect((calls: string) => {
+      void this._handle(JSON.parse(calls));
+    });
+    spyder.connected();
+  }
+
+  private async _handle(calls: ICall[]): Promise<void> {
+    let replies: IReply[] = [];
+    for (let call of calls) {
+      replies.push(await this._dispatch(call));
+    }
+    this._spyder.reply(JSON.stringify(replies));
+  }
+
+  private async _dispatch(call: ICall): Promise<IReply> {
+    let method = this._methods[call.method];
+    if (!method) {
+      return { id: call.id, error: `Unknown method: ${call.method}` };
+    }
+    try {
+      let result = await method(...call.args);
+      return { id: call.id, result: result === undefined ? null : result };
+    } catch (reason) {
+      return { id: call.id, error: String(reason) };
+    }
+  }
+
+  private _methods: { [name: string]: BridgeMethod } = {};
+  private _spyder: any = null;
+}
+
+/**
+ * Register the methods that act on the notebook.
+ *
+ * The methods wait until the notebook is opened, so Spyder can call them
+ * as soon as the page is connected.
+ */
+export const SetupBridge = (
+  bridge: SpyderBridge,
+  notebook: PromiseDelegate<NotebookPanel>
+) => {
+  async function ready(): Promise<NotebookPanel> {
+    let nbWidget = await notebook.promise;
+    await nbWidget.context.ready;
+    return nbWidget;
+  }
+
+  let searchIndex: SearchIndex | null = null;
+
+  async function search(): Promise<SearchIndex> {
+    let nbWidget = await ready();
+    if (!searchIndex) {
+      searchIndex = new SearchIndex(nbWidget.content);
+    }
+    return searchIndex;
+  }
+
+  bridge.register('save', async () => {
+    let nbWidget = await ready();
+    await nbWidget.context.save();
+    return true;
+  });
+
+  bridge.register('getState', async () => {
+    let nbWidget = await ready();
+    let session = nbWidget.context.session;
+    return {
+      path: nbWidget.context.path,
+      ready: true,
+      dirty: nbWidget.context.model.dirty,
+      cellCount: nbWidget.content.widgets.length,
+      activeCellIndex: nbWidget.content.activeCellIndex,
+      kernelId: session.kernel ? session.kernel.id : null,
+      kernelStatus: session.status
+    };
+  });
+
+  bridge.register('getCellProfiles', async () => {
+    let nbWidget = await ready();
+    let profiles: any[] = [];
+    nbWidget.content.widgets.forEach((cell, index) => {
+      let profile = cell.model.metadata.get(PROFILE_KEY) as ICellProfile;
+      if (profile) {
+        let source = cell.model.value.text.trim().split('\n')[0];
+        profiles.push({ index, source, ...profile });
+      }
+    });
+    return profiles;
+  });
+
+  bridge.register('goToCell', async (index: number, line?: number) => {
+    let nbWidget = await ready();
+    let notebook = nbWidget.content;
+    if (index < 0 || index >= notebook.widgets.length) {
+      return false;
+    }
+    notebook.deselectAll();
+    notebook.activeCellIndex = index;
+    let cell = notebook.widgets[index];
+    notebook.scrollToCell(cell);
+    if (line !== undefined && line !== null && cell.editor) {
+      cell.editor.setCursorPosition({ line, column: 0 });
+    }
+    return true;
+  });
+
+  bridge.register(
+    'find',
+    async (
+      query: string,
+      options: ISearchOptions,
+      forward: boolean,
+      changed: boolean
+    ) => {
+      let index = await search();
+      return index.find(query, options, forward, changed);
+    }
+  );
+
+  bridge.register(
+    'replace',
+    async (
+      query: string,
+      replacement: string,
+      options: ISearchOptions,
+      all: boolean
+    ) => {
+      let index = await search();
+      return index.replace(query, replacement, options, all);
+    }
+  );
+
+  bridge.register('run', async () => {
+    let nbWidget = await ready();
+    return NotebookActions.run(nbWidget.content, nbWidget.context.session);
+  });
+
+  bridge.register('runAll', async () => {
+    let nbWidget = await ready();
+    return NotebookActions.runAll(nbWidget.content, nbWidget.context.session);
+  });
+
+  bridge.register('interrupt', async () => {
+    let nbWidget = await ready();
+    if (nbWidget.context.session.kernel) {
+      await nbWidget.context.session.kernel.interrupt();
+    }
+    return true;
+  });
+
+  bridge.register('restart', async () => {
+    let nbWidget = await ready();
+    return nbWidget.context.session.restart();
+  });
+};
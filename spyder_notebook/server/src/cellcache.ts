@@ -0,0 +1,203 @@
+/**
+ * Run all cells, skipping cells whose outputs are in the cell cache.
+ *
+ * The server keys every code cell by its source and the sources of the
+ * code cells above it. Running all cells with the cache replays the
+ * cached outputs of the unchanged cells at the top of the notebook and
+ * runs the cells from the first changed one on, storing their outputs.
+ * If the kernel side of the cache is installed, the variables defined by
+ * the skipped cells are loaded into the kernel, and the variables defined
+ * by the cells that are run are stored; otherwise cells are only skipped
+ * if the whole notebook is cached.
+ */
+import { CommandRegistry } from '@phosphor/commands';
+import { Cell, ICodeCellModel } from '@jupyterlab/cells';
+import { nbformat, URLExt } from '@jupyterlab/coreutils';
+import { Notebook, NotebookActions, NotebookPanel } from '@jupyterlab/notebook';
+import { ServerConnection } from '@jupyterlab/services';
+import { KernelCode } from './kernelcode';
+
+/**
+ * Id of the command running all cells with the cache.
+ */
+export const RUN_ALL_CACHED = 'notebook-cells:run-all-cached';
+
+/**
+ * Cache status of a code cell, as returned by the server.
+ */
+interface ILookup {
+  key: string;
+  hit: boolean;
+  namespace: boolean;
+  namespacePath: string;
+}
+
+/**
+ * A cached entry.
+ */
+interface IEntry {
+  outputs: nbformat.IOutput[];
+  executionCount: number | null;
+}
+
+export class CellCache {
+  constructor(nbWidget: NotebookPanel, code: string) {
+    this._nbWidget = nbWidget;
+    this._settings = ServerConnection.makeSettings();
+    if (code) {
+      this._kernelCode = new KernelCode(nbWidget.session, code);
+    }
+    NotebookActions.executed.connect(this._onExecuted, this);
+  }
+
+  /**
+   * Run all cells, skipping cached cells at the top.
+   */
+  async runAll(): Promise<boolean> {
+    let notebook = this._nbWidget.content;
+    let session = this._nbWidget.context.session;
+    let cells = notebook.widgets.filter(cell => cell.model.type === 'code');
+    let lookups = await this._lookup(
+      cells.map(cell => cell.model.value.text)
+    );
+
+    let skip = 0;
+    let withNamespace = 0;
+    if (this._kernelCode && this._kernelCode.installed) {
+      while (
+        withNamespace < lookups.length &&
+        lookups[withNamespace].hit &&
+        lookups[withNamespace].namespace
+      ) {
+        withNamespace++;
+      }
+      let paths = lookups.slice(0, withNamespace).map(l => l.namespacePath);
+      if (paths.length && !(await this._loadNamespaces(paths))) {
+        withNamespace = 0;
+      }
+      skip = withNamespace;
+    }
+    if (lookups.every(lookup => lookup.hit)) {
+      skip = lookups.length;
+    }
+
+    for (let i = 0; i < skip; i++) {
+      let entry = await this._get(lookups[i].key);
+      if (!entry) {
+        skip = i;
+        break;
+      }
+      let model = cells[i].model as ICodeCellModel;
+      model.outputs.clear();
+      for (let output of entry.outputs) {
+        model.outputs.add(output);
+      }
+      model.executionCount = entry.executionCount;
+    }
+
+    this._pending.clear();
+    for (let i = skip; i < cells.length; i++) {
+      this._pending.set(cells[i], lookups[i]);
+    }
+    NotebookActions.renderAllMarkdown(notebook, session);
+    if (skip === cells.length) {
+      return true;
+    }
+    notebook.activeCellIndex = notebook.widgets.indexOf(cells[skip]);
+    notebook.deselectAll();
+    return NotebookActions.runAllBelow(notebook, session);
+  }
+
+  /**
+   * Store the outputs of a cell run by `runAll()`.
+   */
+  private async _onExecuted(
+    sender: any,
+    args: { notebook: Notebook; cell: Cell }
+  ): Promise<void> {
+    let lookup = this._pending.get(args.cell);
+    if (args.notebook !== this._nbWidget.content || !lookup) {
+      return;
+    }
+    this._pending.delete(args.cell);
+    let model = args.cell.model as ICodeCellModel;
+    let outputs = model.outputs.toJSON();
+    if (outputs.some(output => output.output_type === 'error')) {
+      // The run stops here, so the cells below will not be stored either
+      this._pending.clear();
+      return;
+    }
+    let entry: IEntry = { outputs, executionCount: model.executionCount };
+    await this._request('entries/' + lookup.key, 'PUT', entry);
+    let kernel = this._nbWidget.session.kernel;
+    if (this._kernelCode && this._kernelCode.installed && kernel) {
+      let count = JSON.stringify(model.executionCount);
+      let path = JSON.stringify(lookup.namespacePath);
+      kernel.requestExecute({
+        code: `__spyder_cell_cache__.save(${count}, ${path})`,
+        silent: true,
+        store_history: false
+      });
+    }
+  }
+
+  /**
+   * Load the variables stored for a sequence of cells into the kernel.
+   */
+  private async _loadNamespaces(paths: string[]): Promise<boolean> {
+    let kernel = this._nbWidget.session.kernel;
+    if (!kernel) {
+      return false;
+    }
+    let future = kernel.requestExecute({
+      code: '',
+      silent: true,
+      store_history: false,
+      user_expressions: {
+        loaded: `__spyder_cell_cache__.load(${JSON.stringify(paths)})`
+      }
+    });
+    let reply = await future.done;
+    let result = (reply.content as any).user_expressions.loaded;
+    return !!result && result.status === 'ok';
+  }
+
+  private async _lookup(sources: string[]): Promise<ILookup[]> {
+    let response = await this._request('lookup', 'POST', { sources });
+    return response.json();
+  }
+
+  private async _get(key: string): Promise<IEntry | null> {
+    let response = await this._request('entries/' + key, 'GET');
+    return response.ok ? response.json() : null;
+  }
+
+  private _request(path: string, method: string, body?: any) {
+    let url = URLExt.join(this._settings.baseUrl, 'spyder/cellcache', path);
+    let init: RequestInit = { method };
+    if (body !== undefined) {
+      init.body = JSON.stringify(body);
+    }
+    return ServerConnection.makeRequest(url, init, this._settings);
+  }
+
+  private _nbWidget: NotebookPanel;
+  private _settings: ServerConnection.ISettings;
+  private _kernelCode: KernelCode | null = null;
+  private _pending = new Map<Cell, ILookup>();
+}
+
+/**
+ * Add the command running all cells with the cache.
+ */
+export const SetupCellCache = (
+  commands: CommandRegistry,
+  nbWidget: NotebookPanel,
+  code: string
+) => {
+  let cache = new CellCache(nbWidget, code);
+  commands.addCommand(RUN_ALL_CACHED, {
+    label: 'Run All Cells (Cached)',
+    execute: () => cache.runAll()
+  });
+};
@@ -5,6 +5,8 @@ import { CommandRegistry } from '@phosphor/commands';
 import { Menu, MenuBar } from '@phosphor/widgets';
 import { CompletionHandler } from '@jupyterlab/completer';
 import { NotebookPanel, NotebookActions } from '@jupyterlab/notebook';
+import { RUN_ALL_CACHED } from './cellcache';
+import { RUN_STALE } from './dataflow';
 import {
   SearchInstance,
   NotebookSearchProvider
@@ -611,6 +613,10 @@ export const SetupCommands = (
   runMenu.insertItem(5, { command: cmdIds.renderAllMarkdown });
   runMenu.insertItem(6, { command: cmdIds.runAll });
   runMenu.insertItem(7, { command: cmdIds.restartRunAll });
+  runMenu.insertItem(8, { command: RUN_STALE });
+  if (commands.hasCommand(RUN_ALL_CACHED)) {
+    runMenu.insertItem(9, { command: RUN_ALL_CACHED });
+  }
 
   // Create Kernel menu.
   let kernelMenu = new Menu({ commands });
@@ -0,0 +1,139 @@
+/**
+ * Run the cells that are stale after editing cells.
+ *
+ * The server analyzes which variables every code cell defines and uses. A
+ * cell is edited if its source changed since it was last run. Running the
+ * stale cells runs the edited cells and, in order, every cell below them
+ * that uses a variable defined by a cell that is run.
+ */
+import { CommandRegistry } from '@phosphor/commands';
+import { Cell, ICellModel } from '@jupyterlab/cells';
+import { URLExt } from '@jupyterlab/coreutils';
+import { Notebook, NotebookActions, NotebookPanel } from '@jupyterlab/notebook';
+import { ServerConnection } from '@jupyterlab/services';
+
+/**
+ * Id of the command running the stale cells.
+ */
+export const RUN_STALE = 'notebook-cells:run-stale';
+
+/**
+ * Variables defined and used by a cell, or null if they are not known.
+ */
+export interface IDataflow {
+  defines: string[] | null;
+  uses: string[] | null;
+}
+
+/**
+ * Return which cells are stale, given which cells are edited.
+ *
+ * Cells whose variables are not known are assumed to define and use every
+ * variable.
+ */
+export function findStale(flows: IDataflow[], edited: boolean[]): boolean[] {
+  let dirty = new Set<string>();
+  let dirtyAll = false;
+  return flows.map((flow, index) => {
+    let stale = edited[index];
+    if (!stale && (dirtyAll || dirty.size)) {
+      stale =
+        flow.uses === null ||
+        dirtyAll ||
+        flow.uses.some(name => dirty.has(name));
+    }
+    if (stale) {
+      if (flow.defines === null) {
+        dirtyAll = true;
+      } else {
+        flow.defines.forEach(name => dirty.add(name));
+      }
+    }
+    return stale;
+  });
+}
+
+export class DataflowTracker {
+  constructor(nbWidget: NotebookPanel) {
+    this._nbWidget = nbWidget;
+    this._settings = ServerConnection.makeSettings();
+    NotebookActions.executed.connect(this._onExecuted, this);
+  }
+
+  /**
+   * Return the stale code cells, from top to bottom.
+   */
+  async getStaleCells(): Promise<Cell[]> {
+    let cells = this._nbWidget.content.widgets.filter(
+      cell => cell.model.type === 'code'
+    );
+    let sources = cells.map(cell => cell.model.value.text);
+    let edited = cells.map(cell => {
+      let lastRun = this._lastRun.get(cell.model);
+      return lastRun !== undefined && lastRun !== cell.model.value.text;
+    });
+    if (!edited.some(value => value)) {
+      return [];
+    }
+
+    let url = URLExt.join(this._settings.baseUrl, 'spyder/dataflow');
+    let response = await ServerConnection.makeRequest(
+      url,
+      { method: 'POST', body: JSON.stringify({ sources }) },
+      this._settings
+    );
+    if (!response.ok) {
+      throw new ServerConnection.ResponseError(response);
+    }
+    let flows = (await response.json()) as IDataflow[];
+    let stale = findStale(flows, edited);
+    return cells.filter((cell, index) => stale[index]);
+  }
+
+  /**
+   * Run the stale cells.
+   */
+  async runStale(): Promise<boolean> {
+    let notebook = this._nbWidget.content;
+    let stale = await this.getStaleCells();
+    if (!stale.length) {
+      return true;
+    }
+    notebook.activeCellIndex = notebook.widgets.indexOf(stale[0]);
+    notebook.deselectAll();
+    for (let cell of stale) {
+      notebook.select(cell);
+    }
+    return NotebookActions.run(notebook, this._nbWidget.context.session);
+  }
+
+  /**
+   * Remember the source of a cell when it is run.
+   */
+  private _onExecuted(
+    sender: any,
+    args: { notebook: Notebook; cell: Cell }
+  ): void {
+    if (args.notebook === this._nbWidget.content) {
+      this._lastRun.set(args.cell.model, args.cell.model.value.text);
+    }
+  }
+
+  private _nbWidget: NotebookPanel;
+  private _settings: ServerConnection.ISettings;
+  private _lastRun = new WeakMap<ICellModel, string>();
+}
+
+/**
+ * Add the command running the stale cells.
+ */
+export const SetupDataflow = (
+  commands: CommandRegistry,
+  nbWidget: NotebookPanel
+) => {
+  let tracker = new DataflowTracker(nbWidget);
+  commands.addCommand(RUN_STALE, {
+    label: 'Run Stale Cells',
+    execute: () => tracker.runStale()
+  });
+};
@@ -13,6 +13,8 @@ import '../index.css';
 
 import { CommandRegistry } from '@phosphor/commands';
 
+import { PromiseDelegate } from '@phosphor/coreutils';
+
 import { MenuBar, SplitPanel, Widget } from '@phosphor/widgets';
 
 import { ServiceManager } from '@jupyterlab/services';
@@ -41,9 +43,50 @@ import {
   RenderMimeRegistry,
   standardRendererFactories as initialFactories
 } from '@jupyterlab/rendermime';
+import { SetupBridge, SpyderBridge } from './bridge';
+import { SetupCellCache } from './cellcache';
+import { SetupDataflow } from './dataflow';
 import { SetupCommands } from './commands';
+import { Journal } from './journal';
+import {
+  LazyRenderMimeRegistry,
+  lazyEditorFactory,
+  Viewport
+} from './lazy';
+import { MemoryMonitor } from './memory';
+import { CoalescingContentFactory } from './outputs';
+import { CellProfiler } from './profiler';
+
+/**
+ * Path of the notebook to be opened.
+ *
+ * The path is either given in the page config, or it is supplied later by
+ * Spyder if the page is loaded in advance without a notebook.
+ */
+const notebookPath = new PromiseDelegate<string>();
+
+/**
+ * The notebook widget, once the notebook is opened.
+ */
+const notebook = new PromiseDelegate<NotebookPanel>();
+
+/**
+ * Bridge for calls from Spyder.
+ */
+const bridge = new SpyderBridge();
+
+bridge.register('open', (path: string) => {
+  notebookPath.resolve(path);
+  return true;
+});
+SetupBridge(bridge, notebook);
 
 function main(): void {
+  let path = PageConfig.getOption('notebookPath');
+  if (path) {
+    notebookPath.resolve(path);
+  }
+
   let manager = new ServiceManager();
   void manager.ready.then(() => {
     createApp(manager);
@@ -64,13 +107,22 @@ function createApp(manager: ServiceManager.IManager): void {
     useCapture
   );
 
-  let rendermime = new RenderMimeRegistry({
+  // Create editors and render outputs only for cells that are in view
+  let viewport =
+    PageConfig.getOption('lazyRendering') === 'true' && Viewport.isSupported
+      ? new Viewport()
+      : null;
+
+  let rendermimeOptions = {
     initialFactories: initialFactories,
     latexTypesetter: new MathJaxTypesetter({
       url: PageConfig.getOption('mathjaxUrl'),
       config: PageConfig.getOption('mathjaxConfig')
     })
-  });
+  };
+  let rendermime = viewport
+    ? new LazyRenderMimeRegistry({ ...rendermimeOptions, viewport })
+    : new RenderMimeRegistry(rendermimeOptions);
 
   let opener = {
     open: (widget: Widget) => {
@@ -84,8 +136,14 @@ function createApp(manager: ServiceManager.IManager): void {
     manager,
     opener
   });
-  let mFactory = new NotebookModelFactory({});
+  let maxStreamLines = parseInt(PageConfig.getOption('maxStreamLines'), 10);
+  let mFactory = new NotebookModelFactory({
+    codeCellContentFactory: new CoalescingContentFactory(maxStreamLines || 0)
+  });
   let editorFactory = editorServices.factoryService.newInlineEditor;
+  if (viewport) {
+    editorFactory = lazyEditorFactory(editorFactory, viewport);
+  }
   let contentFactory = new NotebookPanel.ContentFactory({ editorFactory });
 
   let wFactory = new NotebookWidgetFactory({
@@ -102,8 +160,21 @@ function createApp(manager: ServiceManager.IManager): void {
   docRegistry.addModelFactory(mFactory);
   docRegistry.addWidgetFactory(wFactory);
 
-  let notebookPath = PageConfig.getOption('notebookPath');
-  let nbWidget = docManager.open(notebookPath) as NotebookPanel;
+  void notebookPath.promise.then(path => {
+    openNotebook(path, commands, docManager, viewport);
+  });
+}
+
+function openNotebook(
+  path: string,
+  commands: CommandRegistry,
+  docManager: DocumentManager,
+  viewport: Viewport | null
+): void {
+  let nbWidget = docManager.open(path) as NotebookPanel;
+  if (viewport) {
+    viewport.attach(nbWidget.content.node);
+  }
 
   // Create menu bar.
   let menuBar = new MenuBar();
@@ -146,7 +217,27 @@ function createApp(manager: ServiceManager.IManager): void {
     panel.update();
   });
 
+  if (PageConfig.getOption('cellCache') === 'true') {
+    SetupCellCache(commands, nbWidget, PageConfig.getOption('cellCacheCode'));
+  }
+  SetupDataflow(commands, nbWidget);
   SetupCommands(commands, menuBar, nbWidget, handler);
+
+  let profilerCode = PageConfig.getOption('profilerCode');
+  if (profilerCode) {
+    // tslint:disable-next-line:no-unused-expression
+    new CellProfiler(nbWidget, profilerCode);
+  }
+  let journalInterval = parseFloat(PageConfig.getOption('journalInterval'));
+  if (journalInterval > 0) {
+    // tslint:disable-next-line:no-unused-expression
+    new Journal(nbWidget, journalInterval);
+  }
+  if (parseInt(PageConfig.getOption('memoryLimit'), 10) > 0) {
+    // tslint:disable-next-line:no-unused-expression
+    new MemoryMonitor(nbWidget);
+  }
+  notebook.resolve(nbWidget);
 }
 
 window.addEventListener('load', main);
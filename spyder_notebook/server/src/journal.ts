@@ -0,0 +1,183 @@
+/**
+ * Journal of unsaved changes, which Spyder can recover after a crash.
+ *
+ * Changes to the cells are sent to the server every few seconds and
+ * appended to a journal, which is much cheaper than saving a large
+ * notebook. Structural changes are recorded as they happen; a cell whose
+ * source or outputs changed is recorded once per interval, at its index at
+ * that time. The journal is discarded when the notebook is saved.
+ */
+import { ICellModel } from '@jupyterlab/cells';
+import { nbformat, URLExt } from '@jupyterlab/coreutils';
+import { DocumentRegistry } from '@jupyterlab/docregistry';
+import { INotebookModel, NotebookPanel } from '@jupyterlab/notebook';
+import { IObservableList } from '@jupyterlab/observables';
+import { ServerConnection } from '@jupyterlab/services';
+
+/**
+ * A change to the cells, as understood by the server.
+ */
+type JournalOp =
+  | { op: 'insert'; index: number; cells: nbformat.ICell[] }
+  | { op: 'remove'; index: number; count: number }
+  | { op: 'move'; from: number; to: number }
+  | { op: 'set'; index: number; cell: nbformat.ICell };
+
+export class Journal {
+  constructor(nbWidget: NotebookPanel, interval: number) {
+    this._context = nbWidget.context;
+    this._settings = ServerConnection.makeSettings();
+    void this._context.ready.then(() => {
+      let cells = this._context.model.cells;
+      for (let i = 0; i < cells.length; i++) {
+        this._watch(cells.get(i));
+      }
+      cells.changed.connect(this._onCellsChanged, this);
+      this._context.fileChanged.connect(this._onFileChanged, this);
+      this._timer = window.setInterval(() => this.flush(), interval * 1000);
+    });
+    this._context.disposed.connect(() => window.clearInterval(this._timer));
+  }
+
+  /**
+   * Send the changes since the last flush to the server.
+   */
+  flush(): Promise<void> {
+    let cells = this._context.model.cells;
+    if (this._dirty.size) {
+      for (let i = 0; i < cells.length; i++) {
+        let cell = cells.get(i);
+        if (this._dirty.has(cell)) {
+          this._ops.push({ op: 'set', index: i, cell: cell.toJSON() });
+        }
+      }
+      this._dirty.clear();
+    }
+    if (!this._ops.length) {
+      return this._queue;
+    }
+    let body = { ops: this._ops, reset: this._reset };
+    this._ops = [];
+    this._reset = false;
+    return this._request('POST', body);
+  }
+
+  /**
+   * Record structural changes to the cells.
+   */
+  private _onCellsChanged(
+    sender: any,
+    args: IObservableList.IChangedArgs<ICellModel>
+  ): void {
+    switch (args.type) {
+      case 'add':
+        args.newValues.forEach(cell => this._watch(cell));
+        this._ops.push({
+          op: 'insert',
+          index: args.newIndex,
+          cells: args.newValues.map(cell => cell.toJSON())
+        });
+        break;
+      case 'remove':
+        args.oldValues.forEach(cell => this._unwatch(cell));
+        this._ops.push({
+          op: 'remove',
+          index: Math.max(args.oldIndex, 0),
+          count: args.oldValues.length
+        });
+        break;
+      case 'move':
+        this._ops.push({ op: 'move', from: args.oldIndex, to: args.newIndex });
+        break;
+      case 'set':
+        args.oldValues.forEach(cell => this._unwatch(cell));
+        args.newValues.forEach((cell, i) => {
+          this._watch(cell);
+          this._ops.push({
+            op: 'set',
+            index: args.newIndex + i,
+            cell: cell.toJSON()
+          });
+        });
+        break;
+      default:
+        break;
+    }
+  }
+
+  /**
+   * Discard the journal once the notebook is saved or reverted.
+   */
+  private _onFileChanged(): void {
+    this._generation++;
+    this._ops = [];
+    this._dirty.clear();
+    this._reset = true;
+    void this._request('DELETE');
+  }
+
+  private _watch(cell: ICellModel): void {
+    cell.contentChanged.connect(this._onContentChanged, this);
+  }
+
+  private _unwatch(cell: ICellModel): void {
+    cell.contentChanged.disconnect(this._onContentChanged, this);
+    this._dirty.delete(cell);
+  }
+
+  private _onContentChanged(cell: ICellModel): void {
+    this._dirty.add(cell);
+  }
+
+  /**
+   * Send a request after the previous ones, so they arrive in order.
+   */
+  private _request(method: string, body?: any): Promise<void> {
+    let url = URLExt.join(
+      this._settings.baseUrl,
+      'spyder/journal',
+      URLExt.encodeParts(this._context.path)
+    );
+    let init: RequestInit = { method };
+    if (body !== undefined) {
+      init.body = JSON.stringify(body);
+    }
+    let generation = this._generation;
+    this._queue = this._queue.then(async () => {
+      let ok = false;
+      try {
+        let response = await ServerConnection.makeRequest(
+          url,
+          init,
+          this._settings
+        );
+        ok = response.ok;
+      } catch (error) {
+        ok = false;
+      }
+      if (!ok && body !== undefined && generation === this._generation) {
+        this._restore(body);
+      }
+    });
+    return this._queue;
+  }
+
+  /**
+   * Put back changes which could not be sent, to send them again later.
+   *
+   * Changes made before the notebook was last saved are not put back.
+   */
+  private _restore(body: { ops: JournalOp[]; reset: boolean }): void {
+    this._ops = body.ops.concat(this._ops);
+    this._reset = this._reset || body.reset;
+  }
+
+  private _context: DocumentRegistry.IContext<INotebookModel>;
+  private _settings: ServerConnection.ISettings;
+  private _timer = 0;
+  private _ops: JournalOp[] = [];
+  private _dirty = new Set<ICellModel>();
+  private _reset = true;
+  private _generation = 0;
+  private _queue = Promise.resolve();
+}
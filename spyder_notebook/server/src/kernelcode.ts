@@ -0,0 +1,62 @@
+/**
+ * Helper code which runs in the kernel.
+ */
+import { IClientSession } from '@jupyterlab/apputils';
+import { Kernel } from '@jupyterlab/services';
+
+/**
+ * Code which is run silently in every kernel the notebook connects to.
+ *
+ * The code is run again after the kernel restarts. Requests sent after
+ * the code is sent are executed after it, so code that registers hooks
+ * sees every cell that is run later.
+ */
+export class KernelCode {
+  constructor(session: IClientSession, code: string) {
+    this._session = session;
+    this._code = code;
+    session.kernelChanged.connect(this._onKernelChanged, this);
+    session.statusChanged.connect(this._onStatusChanged, this);
+    this._onKernelChanged();
+  }
+
+  /**
+   * Whether the code has been sent to the current kernel.
+   */
+  get installed(): boolean {
+    return this._installed;
+  }
+
+  private _onKernelChanged(): void {
+    this._installed = false;
+    let kernel = this._session.kernel;
+    if (kernel) {
+      void kernel.ready.then(() => this._install());
+    }
+  }
+
+  private _onStatusChanged(sender: any, status: Kernel.Status): void {
+    if (status === 'restarting' || status === 'autorestarting') {
+      this._installed = false;
+    } else if (status === 'idle' && !this._installed) {
+      this._install();
+    }
+  }
+
+  private _install(): void {
+    let kernel = this._session.kernel;
+    if (!kernel || this._installed) {
+      return;
+    }
+    this._installed = true;
+    kernel.requestExecute({
+      code: this._code,
+      silent: true,
+      store_history: false
+    });
+  }
+
+  private _session: IClientSession;
+  private _code: string;
+  private _installed = false;
+}
@@ -0,0 +1,494 @@
+/**
+ * Lazy rendering of the cells of long notebooks.
+ *
+ * Creating a CodeMirror editor for every cell and rendering every output
+ * when a notebook is opened takes time and memory proportional to the
+ * length of the notebook. Instead, cell editors are created and outputs
+ * and markdown are rendered only when they come near the visible part of
+ * the notebook. Until then, an editor is shown as a plain text copy of the
+ * source, and a rendered output as an empty placeholder of estimated
+ * height, so that the notebook can be scrolled as usual.
+ */
+import { CodeEditor } from '@jupyterlab/codeeditor';
+import {
+  IRenderMimeRegistry,
+  RenderMimeRegistry
+} from '@jupyterlab/rendermime';
+import { IRenderMime } from '@jupyterlab/rendermime-interfaces';
+import { UUID } from '@phosphor/coreutils';
+import { DisposableDelegate, IDisposable } from '@phosphor/disposable';
+import { Signal } from '@phosphor/signaling';
+import { PanelLayout, Widget } from '@phosphor/widgets';
+
+/**
+ * Class of the plain text copy of the source of a cell.
+ */
+const LAZY_EDITOR_CLASS = 'spyder-LazyEditor';
+
+/**
+ * Class of an output which is not rendered yet.
+ */
+const LAZY_RENDERER_CLASS = 'spyder-LazyRenderer';
+
+/**
+ * Distance from the visible part of the notebook, as a fraction of its
+ * height, within which editors are created and outputs rendered.
+ */
+const MARGIN = '100% 0px';
+
+/**
+ * Estimated height in pixels of a line of text in an output.
+ */
+const LINE_HEIGHT = 17;
+
+/**
+ * Estimated height in pixels of an output which is not text.
+ */
+const DEFAULT_HEIGHT = 150;
+
+/**
+ * Calls callbacks when elements come near the visible part of a notebook.
+ */
+export class Viewport {
+  /**
+   * Whether lazy rendering is supported by the browser.
+   */
+  static get isSupported(): boolean {
+    return typeof IntersectionObserver !== 'undefined';
+  }
+
+  /**
+   * Start watching elements in the scrolled node of a notebook.
+   *
+   * Elements can be observed before, in which case they are watched from
+   * now on.
+   */
+  attach(root: HTMLElement): void {
+    this._observer = new IntersectionObserver(
+      entries => this._onIntersection(entries),
+      { root, rootMargin: MARGIN }
+    );
+    this._callbacks.forEach((callback, element) => {
+      this._observer.observe(element);
+    });
+  }
+
+  /**
+   * Call a function once, when an element comes near the visible part.
+   */
+  observe(element: Element, callback: () => void): void {
+    this._callbacks.set(element, callback);
+    if (this._observer) {
+      this._observer.observe(element);
+    }
+  }
+
+  /**
+   * Stop watching an element.
+   */
+  unobserve(element: Element): void {
+    this._callbacks.delete(element);
+    if (this._observer) {
+      this._observer.unobserve(element);
+    }
+  }
+
+  private _onIntersection(entries: IntersectionObserverEntry[]): void {
+    for (let entry of entries) {
+      let callback = this._callbacks.get(entry.target);
+      if (entry.isIntersecting && callback) {
+        this.unobserve(entry.target);
+        callback();
+      }
+    }
+  }
+
+  private _callbacks = new Map<Element, () => void>();
+  private _observer: IntersectionObserver | null = null;
+}
+
+/**
+ * Return an editor factory creating editors when they come into view.
+ */
+export function lazyEditorFactory(
+  factory: CodeEditor.Factory,
+  viewport: Viewport
+): CodeEditor.Factory {
+  return (options: CodeEditor.IOptions) => {
+    let editor = new LazyEditor(factory, options, viewport);
+    return (new Proxy(editor, {
+      get: (target: any, name) => {
+        if (name in target) {
+          return target[name];
+        }
+        let real: any = target.materialize();
+        let value = real[name];
+        return typeof value === 'function' ? value.bind(real) : value;
+      },
+      set: (target: any, name, value) => {
+        if (name in target) {
+          target[name] = value;
+        } else {
+          (target.materialize() as any)[name] = value;
+        }
+        return true;
+      }
+    }) as unknown) as CodeEditor.IEditor;
+  };
+}
+
+/**
+ * Editor which creates the real editor when it comes into view.
+ *
+ * The members used by the notebook for cells that are not in view are
+ * implemented without the real editor; using any other member creates it.
+ * This object is wrapped in a proxy forwarding those to the real editor.
+ */
+class LazyEditor implements IDisposable {
+  constructor(
+    factory: CodeEditor.Factory,
+    options: CodeEditor.IOptions,
+    viewport: Viewport
+  ) {
+    this._factory = factory;
+    this._options = { ...options, uuid: options.uuid || UUID.uuid4() };
+    this._config = { ...CodeEditor.defaultConfig, ...options.config };
+    this._viewport = viewport;
+
+    this._placeholder = document.createElement('pre');
+    this._placeholder.className = LAZY_EDITOR_CLASS;
+    this._placeholder.textContent = options.model.value.text;
+    options.host.appendChild(this._placeholder);
+    options.model.value.changed.connect(this._onValueChanged, this);
+    viewport.observe(options.host, () => this.materialize());
+  }
+
+  get host(): HTMLElement {
+    return this._options.host;
+  }
+
+  get model(): CodeEditor.IModel {
+    return this._options.model;
+  }
+
+  get uuid(): string {
+    return this._options.uuid;
+  }
+
+  get edgeRequested(): Signal<LazyEditor, CodeEditor.EdgeLocation> {
+    return this._edgeRequested;
+  }
+
+  get isDisposed(): boolean {
+    return this._isDisposed;
+  }
+
+  get lineCount(): number {
+    return this._editor
+      ? this._editor.lineCount
+      : this.model.value.text.split('\n').length;
+  }
+
+  /**
+   * Create the real editor, if it does not exist yet, and return it.
+   */
+  materialize(): CodeEditor.IEditor {
+    if (!this._editor) {
+      this._viewport.unobserve(this.host);
+      this.model.value.changed.disconnect(this._onValueChanged, this);
+      this.host.removeChild(this._placeholder);
+      let editor = (this._editor = this._factory({
+        ...this._options,
+        config: this._config
+      }));
+      editor.edgeRequested.connect((sender, location) => {
+        this._edgeRequested.emit(location);
+      });
+      this._handlers.forEach((disposable, handler) => {
+        this._handlers.set(handler, editor.addKeydownHandler(handler));
+      });
+      editor.refresh();
+    }
+    return this._editor;
+  }
+
+  getOption<K extends keyof CodeEditor.IConfig>(
+    option: K
+  ): CodeEditor.IConfig[K] {
+    return this._editor
+      ? this._editor.getOption(option)
+      : this._config[option];
+  }
+
+  setOption<K extends keyof CodeEditor.IConfig>(
+    option: K,
+    value: CodeEditor.IConfig[K]
+  ): void {
+    this._config[option] = value;
+    if (this._editor) {
+      this._editor.setOption(option, value);
+    }
+  }
+
+  getLine(line: number): string | undefined {
+    return this._editor
+      ? this._editor.getLine(line)
+      : this.model.value.text.split('\n')[line];
+  }
+
+  getOffsetAt(position: CodeEditor.IPosition): number {
+    if (this._editor) {
+      return this._editor.getOffsetAt(position);
+    }
+    let lines = this.model.value.text.split('\n');
+    let offset = position.column;
+    for (let i = 0; i < position.line && i < lines.length; i++) {
+      offset += lines[i].length + 1;
+    }
+    return offset;
+  }
+
+  getPositionAt(offset: number): CodeEditor.IPosition | undefined {
+    if (this._editor) {
+      return this._editor.getPositionAt(offset);
+    }
+    let before = this.model.value.text.slice(0, offset).split('\n');
+    return {
+      line: before.length - 1,
+      column: before[before.length - 1].length
+    };
+  }
+
+  getCursorPosition(): CodeEditor.IPosition {
+    return this._editor
+      ? this._editor.getCursorPosition()
+      : this.getSelection().start;
+  }
+
+  getSelection(): CodeEditor.ITextSelection {
+    return this._editor ? this._editor.getSelection() : this.getSelections()[0];
+  }
+
+  getSelections(): CodeEditor.ITextSelection[] {
+    if (this._editor) {
+      return this._editor.getSelections();
+    }
+    let selections = this.model.selections.get(this.uuid);
+    if (selections && selections.length) {
+      return selections;
+    }
+    let start = { line: 0, column: 0 };
+    return [{ uuid: this.uuid, start, end: start }];
+  }
+
+  addKeydownHandler(handler: CodeEditor.KeydownHandler): IDisposable {
+    let disposable = this._editor
+      ? this._editor.addKeydownHandler(handler)
+      : null;
+    this._handlers.set(handler, disposable);
+    return new DisposableDelegate(() => {
+      let current = this._handlers.get(handler);
+      if (current) {
+        current.dispose();
+      }
+      this._handlers.delete(handler);
+    });
+  }
+
+  hasFocus(): boolean {
+    return this._editor ? this._editor.hasFocus() : false;
+  }
+
+  blur(): void {
+    if (this._editor) {
+      this._editor.blur();
+    }
+  }
+
+  refresh(): void {
+    if (this._editor) {
+      this._editor.refresh();
+    }
+  }
+
+  resizeToFit(): void {
+    if (this._editor) {
+      this._editor.resizeToFit();
+    }
+  }
+
+  setSize(size: CodeEditor.IDimension | null): void {
+    if (this._editor) {
+      this._editor.setSize(size);
+    }
+  }
+
+  dispose(): void {
+    if (this._isDisposed) {
+      return;
+    }
+    this._isDisposed = true;
+    this._viewport.unobserve(this.host);
+    this.model.value.changed.disconnect(this._onValueChanged, this);
+    if (this._editor) {
+      this._editor.dispose();
+    }
+    Signal.clearData(this);
+  }
+
+  private _onValueChanged(): void {
+    this._placeholder.textContent = this.model.value.text;
+  }
+
+  private _factory: CodeEditor.Factory;
+  private _options: CodeEditor.IOptions & { uuid: string };
+  private _config: CodeEditor.IConfig;
+  private _viewport: Viewport;
+  private _placeholder: HTMLElement;
+  private _editor: CodeEditor.IEditor | null = null;
+  private _edgeRequested = new Signal<LazyEditor, CodeEditor.EdgeLocation>(
+    this
+  );
+  private _handlers = new Map<
+    CodeEditor.KeydownHandler,
+    IDisposable | null
+  >();
+  private _isDisposed = false;
+}
+
+/**
+ * Rendermime registry whose renderers render when they come into view.
+ *
+ * This applies to outputs and to rendered markdown cells.
+ */
+export class LazyRenderMimeRegistry extends RenderMimeRegistry {
+  constructor(options: LazyRenderMimeRegistry.IOptions) {
+    super(options);
+    this.viewport = options.viewport;
+  }
+
+  /**
+   * The viewport that renderers wait for.
+   */
+  readonly viewport: Viewport;
+
+  /**
+   * Create a renderer for a mime type, which renders when in view.
+   */
+  createRenderer(mimeType: string): IRenderMime.IRenderer {
+    let renderer = super.createRenderer(mimeType);
+    return new LazyRenderer(renderer, mimeType, this.viewport);
+  }
+
+  /**
+   * Create a clone of the registry, which also renders lazily.
+   */
+  clone(options: IRenderMimeRegistry.ICloneOptions = {}): RenderMimeRegistry {
+    let clone = new LazyRenderMimeRegistry({
+      resolver: options.resolver || this.resolver || undefined,
+      sanitizer: options.sanitizer || this.sanitizer || undefined,
+      linkHandler: options.linkHandler || this.linkHandler || undefined,
+      latexTypesetter:
+        options.latexTypesetter || this.latexTypesetter || undefined,
+      viewport: this.viewport
+    });
+    for (let mimeType of this.mimeTypes) {
+      let factory = this.getFactory(mimeType);
+      if (factory && !clone.getFactory(mimeType)) {
+        clone.addFactory(factory, this.getRank(mimeType));
+      }
+    }
+    return clone;
+  }
+}
+
+export namespace LazyRenderMimeRegistry {
+  export interface IOptions extends RenderMimeRegistry.IOptions {
+    viewport: Viewport;
+  }
+}
+
+/**
+ * Renderer rendering with another renderer when it comes into view.
+ */
+class LazyRenderer extends Widget implements IRenderMime.IRenderer {
+  constructor(
+    renderer: IRenderMime.IRenderer,
+    mimeType: string,
+    viewport: Viewport
+  ) {
+    super();
+    this.addClass(LAZY_RENDERER_CLASS);
+    this.layout = new PanelLayout();
+    this._renderer = renderer;
+    this._mimeType = mimeType;
+    this._viewport = viewport;
+  }
+
+  /**
+   * Render a model now if in view, or else when it comes into view.
+   *
+   * The returned promise resolves at once if the model is not rendered
+   * yet, since the renderer only comes into view after it is attached.
+   */
+  renderModel(model: IRenderMime.IMimeModel): Promise<void> {
+    if (this._rendered) {
+      return this._renderer.renderModel(model);
+    }
+    if (!this._model) {
+      this._viewport.observe(this.node, () => this._render());
+    }
+    this._model = model;
+    let height = Private.estimateHeight(model, this._mimeType);
+    this.node.style.minHeight = `${height}px`;
+    return Promise.resolve(undefined);
+  }
+
+  dispose(): void {
+    if (this.isDisposed) {
+      return;
+    }
+    this._viewport.unobserve(this.node);
+    this._renderer.dispose();
+    super.dispose();
+  }
+
+  private _render(): void {
+    this._rendered = true;
+    this.removeClass(LAZY_RENDERER_CLASS);
+    this.node.style.minHeight = '';
+    (this.layout as PanelLayout).addWidget(this._renderer);
+    this._renderer.renderModel(this._model).catch(error => {
+      this._renderer.node.textContent = `Output could not be rendered: ${error}`;
+    });
+  }
+
+  private _renderer: IRenderMime.IRenderer;
+  private _mimeType: string;
+  private _viewport: Viewport;
+  private _model: IRenderMime.IMimeModel | null = null;
+  private _rendered = false;
+}
+
+namespace Private {
+  /**
+   * Estimate the height of a model rendered as a mime type.
+   *
+   * Images may give their height in the metadata; text is estimated from
+   * the number of lines.
+   */
+  export function estimateHeight(
+    model: IRenderMime.IMimeModel,
+    mimeType: string
+  ): number {
+    let metadata = model.metadata[mimeType] as any;
+    if (metadata && typeof metadata.height === 'number') {
+      return metadata.height;
+    }
+    let data = model.data[mimeType];
+    if (mimeType.startsWith('text/') && typeof data === 'string') {
+      return data.split('\n').length * LINE_HEIGHT;
+    }
+    return DEFAULT_HEIGHT;
+  }
+}
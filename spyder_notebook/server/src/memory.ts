@@ -0,0 +1,111 @@
+/**
+ * Tell the user when the memory watchdog of the server acts on the kernel.
+ */
+import { Dialog, showDialog } from '@jupyterlab/apputils';
+import { URLExt } from '@jupyterlab/coreutils';
+import { NotebookPanel } from '@jupyterlab/notebook';
+import { ServerConnection } from '@jupyterlab/services';
+
+/**
+ * Time in milliseconds between requests for the memory status.
+ */
+const POLL_INTERVAL = 3000;
+
+/**
+ * Something the watchdog did to the kernel.
+ */
+interface IMemoryEvent {
+  seq: number;
+  action: 'warn' | 'interrupt' | 'kill';
+  memory: number;
+  limit: number;
+  time: number;
+}
+
+/**
+ * Memory status of a kernel, as reported by the server.
+ */
+interface IMemoryStatus {
+  memory: number | null;
+  limit: number;
+  events: IMemoryEvent[];
+}
+
+export class MemoryMonitor {
+  constructor(nbWidget: NotebookPanel) {
+    this._nbWidget = nbWidget;
+    this._settings = ServerConnection.makeSettings();
+    window.setInterval(() => {
+      void this._poll();
+    }, POLL_INTERVAL);
+  }
+
+  private async _poll(): Promise<void> {
+    let kernel = this._nbWidget.session.kernel;
+    if (!kernel || this._polling) {
+      return;
+    }
+    this._polling = true;
+    try {
+      let url = URLExt.join(this._settings.baseUrl, 'spyder/memory', kernel.id);
+      let response = await ServerConnection.makeRequest(
+        url,
+        {},
+        this._settings
+      );
+      if (!response.ok) {
+        return;
+      }
+      let status = (await response.json()) as IMemoryStatus;
+      let events = status.events.filter(event => event.seq > this._lastSeq);
+      if (events.length) {
+        this._lastSeq = events[events.length - 1].seq;
+        // Events from before the page was loaded are old news
+        if (this._initialized) {
+          await this._show(events[events.length - 1]);
+        }
+      }
+      this._initialized = true;
+    } catch (reason) {
+      console.warn('Could not get memory status of kernel', reason);
+    } finally {
+      this._polling = false;
+    }
+  }
+
+  private _show(event: IMemoryEvent): Promise<any> {
+    let used = formatMiB(event.memory);
+    let limit = formatMiB(event.limit);
+    let body: string;
+    if (event.action === 'warn') {
+      body =
+        `The kernel uses ${used} of memory, close to its limit of ` +
+        `${limit}. If it uses more, it will be interrupted.`;
+    } else if (event.action === 'interrupt') {
+      body =
+        `The kernel used ${used} of memory, more than its limit of ` +
+        `${limit}, so it has been interrupted. If it does not free ` +
+        'memory soon, it will be killed.';
+    } else {
+      body =
+        `The kernel used ${used} of memory, more than its limit of ` +
+        `${limit}, and has been killed. It is being restarted; all ` +
+        'variables have been lost.';
+    }
+    return showDialog({
+      title: 'Kernel memory limit',
+      body,
+      buttons: [Dialog.okButton()]
+    });
+  }
+
+  private _nbWidget: NotebookPanel;
+  private _settings: ServerConnection.ISettings;
+  private _lastSeq = 0;
+  private _initialized = false;
+  private _polling = false;
+}
+
+function formatMiB(bytes: number): string {
+  return `${Math.round(bytes / (1024 * 1024))} MiB`;
+}
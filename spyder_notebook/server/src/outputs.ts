@@ -0,0 +1,167 @@
+/**
+ * Output handling which keeps chatty cells responsive.
+ */
+import { CodeCellModel } from '@jupyterlab/cells';
+import { nbformat } from '@jupyterlab/coreutils';
+import { IOutputAreaModel, OutputAreaModel } from '@jupyterlab/outputarea';
+
+/**
+ * Output area model which coalesces and bounds stream output.
+ *
+ * Stream messages are buffered and added at most once per animation frame,
+ * so that a cell which prints in a tight loop does not cause a re-render
+ * for every message. Only the last `maxLines` lines of every stream output
+ * are kept; earlier lines are replaced by a note saying how many lines
+ * were truncated.
+ */
+export class CoalescingOutputAreaModel extends OutputAreaModel {
+  constructor(options: CoalescingOutputAreaModel.IOptions) {
+    super(options);
+    this._maxLines = options.maxLines;
+  }
+
+  /**
+   * Add an output, which may be combined with the previous output.
+   */
+  add(output: nbformat.IOutput): number {
+    if (nbformat.isStream(output)) {
+      this._pending.push(output);
+      if (!this._frame) {
+        this._frame = requestAnimationFrame(() => {
+          this._frame = 0;
+          this.flush();
+        });
+      }
+      return this.length;
+    }
+    this.flush();
+    return super.add(output);
+  }
+
+  /**
+   * Clear all of the output.
+   */
+  clear(wait: boolean = false): void {
+    this.flush();
+    this._truncated = {};
+    super.clear(wait);
+  }
+
+  /**
+   * Add the buffered stream outputs to the model.
+   */
+  flush(): void {
+    if (this._frame) {
+      cancelAnimationFrame(this._frame);
+      this._frame = 0;
+    }
+    if (!this._pending.length) {
+      return;
+    }
+    let pending = this._pending;
+    this._pending = [];
+
+    // Merge consecutive outputs to the same stream
+    let merged: nbformat.IStream[] = [];
+    for (let output of pending) {
+      let last = merged[merged.length - 1];
+      if (last && last.name === output.name) {
+        last.text = (last.text as string) + Private.getText(output);
+      } else {
+        merged.push({
+          output_type: 'stream',
+          name: output.name,
+          text: Private.getText(output)
+        });
+      }
+    }
+
+    for (let output of merged) {
+      super.add(output);
+      this._truncate(this.length - 1);
+    }
+  }
+
+  dispose(): void {
+    if (this._frame) {
+      cancelAnimationFrame(this._frame);
+      this._frame = 0;
+    }
+    this._pending = [];
+    super.dispose();
+  }
+
+  /**
+   * Drop lines of a stream output beyond the maximum number of lines.
+   */
+  private _truncate(index: number): void {
+    if (this._maxLines <= 0 || index < 0) {
+      return;
+    }
+    let output = this.get(index).toJSON();
+    if (!nbformat.isStream(output)) {
+      return;
+    }
+    let lines = Private.getText(output).split('\n');
+    let dropped = this._truncated[index] || 0;
+    if (dropped) {
+      // Remove note added by previous truncation
+      lines.shift();
+    }
+    if (lines.length <= this._maxLines) {
+      return;
+    }
+    let extra = lines.length - this._maxLines;
+    dropped += extra;
+    this._truncated[index] = dropped;
+    this.set(index, {
+      output_type: 'stream',
+      name: output.name,
+      text: `[... ${dropped} lines truncated ...]\n` +
+        lines.slice(extra).join('\n')
+    });
+  }
+
+  private _frame = 0;
+  private _maxLines: number;
+  private _pending: nbformat.IStream[] = [];
+  private _truncated: { [index: number]: number } = {};
+}
+
+export namespace CoalescingOutputAreaModel {
+  export interface IOptions extends IOutputAreaModel.IOptions {
+    /**
+     * Maximum number of lines kept in a stream output, or 0 for no limit.
+     */
+    maxLines: number;
+  }
+}
+
+/**
+ * Content factory for code cells using `CoalescingOutputAreaModel`.
+ */
+export class CoalescingContentFactory extends CodeCellModel.ContentFactory {
+  constructor(maxLines: number) {
+    super();
+    this._maxLines = maxLines;
+  }
+
+  createOutputArea(options: IOutputAreaModel.IOptions): IOutputAreaModel {
+    return new CoalescingOutputAreaModel({
+      ...options,
+      maxLines: this._maxLines
+    });
+  }
+
+  private _maxLines: number;
+}
+
+namespace Private {
+  /**
+   * Get the text of a stream output as a single string.
+   */
+  export function getText(output: nbformat.IStream): string {
+    let text = output.text;
+    return Array.isArray(text) ? text.join('') : text;
+  }
+}
@@ -0,0 +1,195 @@
+/**
+ * Per-cell profiler showing the time and memory used by every cell.
+ *
+ * The wall time of a cell is taken from the timestamps of the
+ * execute_input and execute_reply messages of the kernel. The CPU time and
+ * the increase in peak memory are measured in the kernel, by hooks which
+ * are installed by running the code given in the page config. The results
+ * are stored in the metadata of the cell and shown in a badge on the cell.
+ */
+import { JSONObject } from '@phosphor/coreutils';
+import { Cell, ICodeCellModel } from '@jupyterlab/cells';
+import { Kernel, KernelMessage } from '@jupyterlab/services';
+import { Notebook, NotebookActions, NotebookPanel } from '@jupyterlab/notebook';
+import { KernelCode } from './kernelcode';
+
+/**
+ * Metadata key under which the profile of a cell is stored.
+ */
+export const PROFILE_KEY = 'spyder_profile';
+
+/**
+ * Class of the badge showing the profile of a cell.
+ */
+const BADGE_CLASS = 'spyder-CellProfile';
+
+/**
+ * The measurements of one cell.
+ */
+export interface ICellProfile extends JSONObject {
+  /** Wall time in seconds. */
+  wall: number;
+  /** CPU time of the kernel in seconds, or null if not measured. */
+  cpu: number | null;
+  /** Increase in peak memory of the kernel in bytes, or null. */
+  memory: number | null;
+}
+
+export class CellProfiler {
+  constructor(nbWidget: NotebookPanel, code: string) {
+    this._nbWidget = nbWidget;
+    this._kernelCode = new KernelCode(nbWidget.session, code);
+
+    nbWidget.session.kernelChanged.connect(this._onKernelChanged, this);
+    NotebookActions.executed.connect(this._onExecuted, this);
+    this._onKernelChanged();
+
+    void nbWidget.context.ready.then(() => {
+      for (let cell of nbWidget.content.widgets) {
+        CellProfiler.renderBadge(cell);
+      }
+    });
+  }
+
+  /**
+   * Show the profile stored in the metadata of a cell in its badge.
+   */
+  static renderBadge(cell: Cell): void {
+    let profile = cell.model.metadata.get(PROFILE_KEY) as ICellProfile;
+    let badge = cell.node.querySelector('.' + BADGE_CLASS) as HTMLElement;
+    if (!profile) {
+      if (badge) {
+        badge.remove();
+      }
+      return;
+    }
+    if (!badge) {
+      badge = document.createElement('div');
+      badge.className = BADGE_CLASS;
+      cell.node.appendChild(badge);
+    }
+    let parts = [formatSeconds(profile.wall)];
+    if (profile.cpu !== null) {
+      parts.push('CPU ' + formatSeconds(profile.cpu));
+    }
+    if (profile.memory !== null) {
+      parts.push(formatBytes(profile.memory));
+    }
+    badge.textContent = parts.join(' · ');
+    badge.title = 'Wall time · kernel CPU time · peak memory increase';
+  }
+
+  /**
+   * Track the messages of the new kernel.
+   */
+  private _onKernelChanged(): void {
+    let kernel = this._nbWidget.session.kernel;
+    if (this._kernel) {
+      this._kernel.anyMessage.disconnect(this._onMessage, this);
+    }
+    this._kernel = kernel;
+    this._startTimes = {};
+    this._wallTimes = {};
+    if (kernel) {
+      kernel.anyMessage.connect(this._onMessage, this);
+    }
+  }
+
+  /**
+   * Record the timestamps of the execution of a cell.
+   */
+  private _onMessage(
+    sender: Kernel.IKernelConnection,
+    args: Kernel.IAnyMessageArgs
+  ): void {
+    let msg = args.msg;
+    if (args.direction !== 'recv') {
+      return;
+    }
+    let content = msg.content as KernelMessage.IExecuteInputMsg['content'];
+    if (msg.header.msg_type === 'execute_input') {
+      this._startTimes[content.execution_count] = Date.parse(msg.header.date);
+    } else if (msg.header.msg_type === 'execute_reply') {
+      let start = this._startTimes[content.execution_count];
+      if (start !== undefined) {
+        delete this._startTimes[content.execution_count];
+        this._wallTimes[content.execution_count] =
+          (Date.parse(msg.header.date) - start) / 1000;
+      }
+    }
+  }
+
+  /**
+   * Store and show the profile of a cell which has been run.
+   */
+  private async _onExecuted(
+    sender: any,
+    args: { notebook: Notebook; cell: Cell }
+  ): Promise<void> {
+    if (args.notebook !== this._nbWidget.content) {
+      return;
+    }
+    let cell = args.cell;
+    if (cell.model.type !== 'code') {
+      return;
+    }
+    let count = (cell.model as ICodeCellModel).executionCount;
+    let wall = this._wallTimes[count];
+    if (count === null || wall === undefined) {
+      return;
+    }
+    delete this._wallTimes[count];
+
+    let profile: ICellProfile = { wall, cpu: null, memory: null };
+    let measured = await this._getKernelProfile(count);
+    if (measured) {
+      profile.cpu = measured.cpu;
+      profile.memory = measured.memory;
+    }
+    cell.model.metadata.set(PROFILE_KEY, profile);
+    CellProfiler.renderBadge(cell);
+  }
+
+  /**
+   * Ask the kernel for its measurements of a cell.
+   */
+  private async _getKernelProfile(count: number): Promise<ICellProfile> {
+    let kernel = this._nbWidget.session.kernel;
+    if (!kernel || !this._kernelCode.installed) {
+      return null;
+    }
+    let future = kernel.requestExecute({
+      code: '',
+      silent: true,
+      store_history: false,
+      user_expressions: {
+        profile: `__spyder_cell_profiler__.get(${count})`
+      }
+    });
+    let reply = await future.done;
+    let result = (reply.content as any).user_expressions.profile;
+    if (!result || result.status !== 'ok') {
+      return null;
+    }
+    return (result.data['application/json'] as ICellProfile) || null;
+  }
+
+  private _nbWidget: NotebookPanel;
+  private _kernelCode: KernelCode;
+  private _kernel: Kernel.IKernelConnection | null = null;
+  private _startTimes: { [count: number]: number } = {};
+  private _wallTimes: { [count: number]: number } = {};
+}
+
+function formatSeconds(seconds: number): string {
+  if (seconds < 1) {
+    return `${Math.round(seconds * 1000)} ms`;
+  }
+  return `${seconds.toFixed(seconds < 10 ? 2 : 1)} s`;
+}
+
+function formatBytes(bytes: number): string {
+  let sign = bytes < 0 ? '-' : '+';
+  let mebibytes = Math.abs(bytes) / (1024 * 1024);
+  return `${sign}${mebibytes.toFixed(mebibytes < 10 ? 1 : 0)} MiB`;
+}
@@ -0,0 +1,348 @@
+/**
+ * Search in the sources and text outputs of the cells of a notebook.
+ *
+ * Spyder's find widget searches here instead of in the rendered page, so
+ * that searching is fast in notebooks with thousands of cells and also
+ * finds text in cells that are collapsed or hidden. The text of a cell is
+ * taken from the notebook model, and only again after the cell changed.
+ */
+import { CodeCell, ICellModel, ICodeCellModel, MarkdownCell } from '@jupyterlab/cells';
+import { nbformat } from '@jupyterlab/coreutils';
+import { Notebook } from '@jupyterlab/notebook';
+import { IObservableList } from '@jupyterlab/observables';
+
+/**
+ * How to match the query, as set in Spyder's find widget.
+ */
+export interface ISearchOptions {
+  caseSensitive: boolean;
+  wholeWord: boolean;
+  regexp: boolean;
+}
+
+/**
+ * Result of a search, as returned to Spyder.
+ */
+export interface ISearchResult {
+  /**
+   * Number of matches in the notebook.
+   */
+  count: number;
+
+  /**
+   * Number of the current match, starting at 1, or 0 if there is none.
+   */
+  index: number;
+}
+
+/**
+ * A match, or a position between matches, in the notebook.
+ *
+ * Matches are ordered by cell, then source before outputs, then offset.
+ */
+interface IPosition {
+  cell: number;
+  inOutputs: boolean;
+  start: number;
+}
+
+interface IMatch extends IPosition {
+  end: number;
+}
+
+/**
+ * Text of a cell that is searched.
+ */
+interface ICellText {
+  source: string;
+  outputs: string;
+}
+
+export class SearchIndex {
+  constructor(notebook: Notebook) {
+    this._notebook = notebook;
+    let cells = notebook.model.cells;
+    for (let i = 0; i < cells.length; i++) {
+      this._watch(cells.get(i));
+    }
+    cells.changed.connect(this._onCellsChanged, this);
+  }
+
+  /**
+   * Go to the next or previous match and return where it is.
+   *
+   * If the query changed, go to the first match from the active cell.
+   */
+  find(
+    query: string,
+    options: ISearchOptions,
+    forward: boolean,
+    changed: boolean
+  ): ISearchResult {
+    this._update(query, options);
+    if (!this._matches.length) {
+      this._position = null;
+      return { count: 0, index: 0 };
+    }
+    if (changed || !this._position) {
+      let active = this._notebook.activeCellIndex;
+      this._position = forward
+        ? { cell: active, inOutputs: false, start: -1 }
+        : { cell: active, inOutputs: true, start: Infinity };
+    }
+    let index = this._next(this._position, forward);
+    this._position = this._matches[index];
+    this._show(this._matches[index]);
+    return { count: this._matches.length, index: index + 1 };
+  }
+
+  /**
+   * Replace the current match, or all matches, in the cell sources.
+   *
+   * Matches in outputs are not replaced. After replacing the current
+   * match, go to the next match.
+   */
+  replace(
+    query: string,
+    replacement: string,
+    options: ISearchOptions,
+    all: boolean
+  ): ISearchResult {
+    this._update(query, options);
+    let cells = this._notebook.model.cells;
+    let regex = Private.makeRegExp(query, options);
+    if (all) {
+      let replaced = new Set<number>();
+      for (let match of this._matches) {
+        if (!match.inOutputs && !replaced.has(match.cell)) {
+          replaced.add(match.cell);
+          let value = cells.get(match.cell).value;
+          value.text = value.text.replace(regex, replacement);
+        }
+      }
+      this._position = null;
+      this._update(query, options);
+      return { count: this._matches.length, index: 0 };
+    }
+
+    let current = this._position;
+    let match = this._matches.find(
+      match =>
+        current &&
+        !match.inOutputs &&
+        Private.compare(match, current) === 0
+    );
+    if (match) {
+      let value = cells.get(match.cell).value;
+      let text = value.text;
+      let single = new RegExp(regex.source, regex.flags.replace('g', ''));
+      let found = text.slice(match.start, match.end);
+      let result = found.replace(single, replacement);
+      value.text = text.slice(0, match.start) + result + text.slice(match.end);
+      // Continue after the replaced text
+      this._position = {
+        cell: match.cell,
+        inOutputs: false,
+        start: match.start + result.length - 1
+      };
+    }
+    return this.find(query, options, true, false);
+  }
+
+  /**
+   * Find all matches, unless the query and the notebook did not change.
+   */
+  private _update(query: string, options: ISearchOptions): void {
+    let key = JSON.stringify([query, options]);
+    if (key === this._key && this._matchesVersion === this._version) {
+      return;
+    }
+    let regex = Private.makeRegExp(query, options);
+    let matches: IMatch[] = [];
+    let cells = this._notebook.model.cells;
+    for (let i = 0; i < cells.length; i++) {
+      let text = this._getText(cells.get(i));
+      Private.findAll(regex, text.source, i, false, matches);
+      Private.findAll(regex, text.outputs, i, true, matches);
+    }
+    this._matches = matches;
+    this._key = key;
+    this._matchesVersion = this._version;
+  }
+
+  /**
+   * Return index of the first match after, or the last match before, a
+   * position, wrapping around the notebook.
+   */
+  private _next(position: IPosition, forward: boolean): number {
+    let matches = this._matches;
+    if (forward) {
+      for (let i = 0; i < matches.length; i++) {
+        if (Private.compare(matches[i], position) > 0) {
+          return i;
+        }
+      }
+      return 0;
+    }
+    for (let i = matches.length - 1; i >= 0; i--) {
+      if (Private.compare(matches[i], position) < 0) {
+        return i;
+      }
+    }
+    return matches.length - 1;
+  }
+
+  /**
+   * Make the cell of a match active, showing and selecting the match.
+   */
+  private _show(match: IMatch): void {
+    let notebook = this._notebook;
+    notebook.deselectAll();
+    notebook.activeCellIndex = match.cell;
+    let cell = notebook.widgets[match.cell];
+    if (match.inOutputs) {
+      if (cell instanceof CodeCell && cell.outputHidden) {
+        cell.outputHidden = false;
+      }
+    } else {
+      if (cell.inputHidden) {
+        cell.inputHidden = false;
+      }
+      if (cell instanceof MarkdownCell && cell.rendered) {
+        cell.rendered = false;
+      }
+      let start = cell.editor.getPositionAt(match.start);
+      let end = cell.editor.getPositionAt(match.end);
+      if (start && end) {
+        cell.editor.setSelection({ start, end });
+      }
+    }
+    notebook.scrollToCell(cell);
+  }
+
+  private _getText(cell: ICellModel): ICellText {
+    let text = this._texts.get(cell);
+    if (!text) {
+      text = { source: cell.value.text, outputs: Private.getOutputsText(cell) };
+      this._texts.set(cell, text);
+    }
+    return text;
+  }
+
+  private _onCellsChanged(
+    sender: any,
+    args: IObservableList.IChangedArgs<ICellModel>
+  ): void {
+    if (args.type === 'remove' || args.type === 'set') {
+      args.oldValues.forEach(cell => this._unwatch(cell));
+    }
+    if (args.type === 'add' || args.type === 'set') {
+      args.newValues.forEach(cell => this._watch(cell));
+    }
+    this._version++;
+  }
+
+  private _watch(cell: ICellModel): void {
+    cell.contentChanged.connect(this._onContentChanged, this);
+  }
+
+  private _unwatch(cell: ICellModel): void {
+    cell.contentChanged.disconnect(this._onContentChanged, this);
+    this._texts.delete(cell);
+  }
+
+  private _onContentChanged(cell: ICellModel): void {
+    this._texts.delete(cell);
+    this._version++;
+  }
+
+  private _notebook: Notebook;
+  private _texts = new Map<ICellModel, ICellText>();
+  private _version = 0;
+  private _matches: IMatch[] = [];
+  private _matchesVersion = -1;
+  private _key = '';
+  private _position: IPosition | null = null;
+}
+
+namespace Private {
+  /**
+   * Create a global regular expression for a query.
+   */
+  export function makeRegExp(query: string, options: ISearchOptions): RegExp {
+    let pattern = options.regexp
+      ? query
+      : query.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+    if (options.wholeWord) {
+      pattern = `\\b${pattern}\\b`;
+    }
+    return new RegExp(pattern, options.caseSensitive ? 'gm' : 'gim');
+  }
+
+  /**
+   * Add the non-empty matches of a regular expression in a text.
+   */
+  export function findAll(
+    regex: RegExp,
+    text: string,
+    cell: number,
+    inOutputs: boolean,
+    matches: IMatch[]
+  ): void {
+    regex.lastIndex = 0;
+    let match: RegExpExecArray | null;
+    while ((match = regex.exec(text)) !== null) {
+      if (!match[0].length) {
+        regex.lastIndex++;
+        continue;
+      }
+      let start = match.index;
+      matches.push({ cell, inOutputs, start, end: start + match[0].length });
+    }
+  }
+
+  /**
+   * Compare two positions in the notebook.
+   */
+  export function compare(a: IPosition, b: IPosition): number {
+    if (a.cell !== b.cell) {
+      return a.cell - b.cell;
+    }
+    if (a.inOutputs !== b.inOutputs) {
+      return a.inOutputs ? 1 : -1;
+    }
+    return a.start === b.start ? 0 : a.start < b.start ? -1 : 1;
+  }
+
+  /**
+   * Get the text of the stream, error and plain text outputs of a cell.
+   */
+  export function getOutputsText(cell: ICellModel): string {
+    if (cell.type !== 'code') {
+      return '';
+    }
+    let outputs = (cell as ICodeCellModel).outputs;
+    let parts: string[] = [];
+    for (let i = 0; i < outputs.length; i++) {
+      let output = outputs.get(i).toJSON();
+      if (nbformat.isStream(output)) {
+        parts.push(join(output.text));
+      } else if (nbformat.isError(output)) {
+        parts.push(`${output.ename}: ${output.evalue}`);
+      } else if (
+        nbformat.isExecuteResult(output) ||
+        nbformat.isDisplayData(output)
+      ) {
+        let text = output.data['text/plain'] as nbformat.MultilineString;
+        if (text) {
+          parts.push(join(text));
+        }
+      }
+    }
+    return parts.join('\n');
+  }
+
+  function join(text: nbformat.MultilineString): string {
+    return Array.isArray(text) ? text.join('') : text;
+  }
+}
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Configuration for tests of the notebook server."""
+
+# Standard library imports
+import os.path as osp
+import sys
+
+# The server is run as a script, so its modules import each other as
+# top-level modules
+sys.path.insert(0, osp.dirname(osp.dirname(__file__)))
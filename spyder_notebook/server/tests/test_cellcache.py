@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for cellcache.py"""
+
+# Standard library imports
+import os
+
+# Local imports
+from cellcache import CellCache, compute_keys
+
+
+def test_compute_keys_depend_on_cells_above():
+    """Test that changing a cell changes its key and the keys below."""
+    keys = compute_keys(['a = 1', 'b = a', 'print(b)'])
+    changed = compute_keys(['a = 2', 'b = a', 'print(b)'])
+
+    assert len(set(keys)) == 3
+    assert all(key != other for key, other in zip(keys, changed))
+    assert compute_keys(['a = 1', 'b = a']) == keys[:2]
+
+
+def test_cellcache_put_get_and_lookup(tmpdir):
+    """Test that stored entries are found and returned."""
+    cache = CellCache(max_size=1, cache_dir=str(tmpdir))
+    key = compute_keys(['a = 1'])[0]
+    entry = {'outputs': [], 'executionCount': 1}
+
+    assert not cache.lookup(['a = 1'])[0]['hit']
+    cache.put(key, entry)
+
+    lookup = cache.lookup(['a = 1', 'b = 2'])
+    assert [item['hit'] for item in lookup] == [True, False]
+    assert cache.get(key) == entry
+    assert cache.get(compute_keys(['b = 2'])[0]) is None
+
+
+def test_cellcache_evicts_least_recently_used(tmpdir):
+    """Test that the oldest entries are removed when over the size."""
+    cache = CellCache(max_size=1, cache_dir=str(tmpdir))
+    keys = compute_keys(['a', 'b', 'c'])
+    text = 'x' * (400 * 1024)
+    for index, key in enumerate(keys):
+        cache.put(key, {'outputs': [text], 'executionCount': index})
+        path = cache.get_output_path(key)
+        os.utime(path, (index, index))
+        tmpdir.join(key + '.pkl').write('')
+        os.utime(cache.get_namespace_path(key), (index, index))
+
+    cache.evict()
+
+    assert cache.get(keys[0]) is None
+    assert not os.path.exists(cache.get_namespace_path(keys[0]))
+    assert cache.get(keys[2]) is not None
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for cpuscheduler.py"""
+
+# Third-party library imports
+from notebook.services.kernels.kernelmanager import MappingKernelManager
+import pytest
+
+# Local imports
+from cpuscheduler import CpuScheduler, partition_cpus
+from kernelpool import SpyderKernelManager
+
+
+@pytest.mark.parametrize('cpus, count, expected', [
+    ([0, 1, 2, 3], 2, [[0, 1], [2, 3]]),
+    ([0, 1, 2, 3, 4], 2, [[0, 1, 2], [3, 4]]),
+    ([0, 1], 3, [[0], [1], [0]]),
+    ([4, 5, 6], 1, [[4, 5, 6]]),
+])
+def test_partition_cpus(cpus, count, expected):
+    """Test that CPUs are split in nearly equal sets of adjacent CPUs."""
+    assert partition_cpus(cpus, count) == expected
+
+
+def test_cpuscheduler_kernel_env(mocker):
+    """Test that a new kernel gets thread pools the size of its share."""
+    kernel_manager = mocker.Mock(spec=MappingKernelManager)
+    kernel_manager.list_kernel_ids.return_value = ['1', '2', '3']
+    scheduler = CpuScheduler(enabled=True, cpus=[0, 1, 2, 3, 4, 5, 6, 7])
+    scheduler.kernel_manager = kernel_manager
+    mocker.patch.object(scheduler, 'available_cpus',
+                        return_value=list(range(8)))
+
+    env = scheduler.kernel_env()
+
+    assert env['OMP_NUM_THREADS'] == '2'
+    assert env['MKL_NUM_THREADS'] == '2'
+
+
+def test_cpuscheduler_kernel_env_ignores_pooled_kernels(mocker):
+    """Test that idle kernels in the pool do not shrink the share of a new
+    kernel."""
+    kernel_manager = mocker.Mock(spec=SpyderKernelManager)
+    kernel_manager.list_kernel_ids.return_value = ['1', 'pool1', 'pool2']
+    kernel_manager.pooled_kernel_ids.return_value = ['pool1', 'pool2']
+    scheduler = CpuScheduler(enabled=True)
+    scheduler.kernel_manager = kernel_manager
+    mocker.patch.object(scheduler, 'available_cpus',
+                        return_value=list(range(8)))
+
+    env = scheduler.kernel_env()
+
+    assert env['OMP_NUM_THREADS'] == '4'
+
+
+def test_cpuscheduler_rebalance_pins_pooled_kernels_to_all_cpus(mocker):
+    """Test that kernels used by sessions share the CPUs, while kernels in
+    the pool may use all of them."""
+    kernel_manager = mocker.Mock(spec=SpyderKernelManager)
+    kernel_manager.list_kernel_ids.return_value = ['1', 'pool', '2']
+    kernel_manager.pooled_kernel_ids.return_value = ['pool']
+    scheduler = CpuScheduler(enabled=True)
+    scheduler.kernel_manager = kernel_manager
+    mocker.patch.object(scheduler, 'available_cpus',
+                        return_value=[0, 1, 2, 3])
+    mocker.patch.object(scheduler, 'get_kernel_pid',
+                        side_effect=lambda kernel_id: 'pid' + kernel_id)
+    set_affinity = mocker.patch('cpuscheduler.set_process_affinity',
+                                return_value=True)
+
+    scheduler.rebalance()
+
+    assert sorted(call[0] for call in set_affinity.call_args_list) == [
+        ('pid1', [0, 1]), ('pid2', [2, 3]), ('pidpool', [0, 1, 2, 3])]
+
+
+def test_cpuscheduler_kernel_env_when_disabled():
+    """Test that kernels keep their environment if placement is disabled."""
+    assert CpuScheduler().kernel_env() is None
+
+
+def test_cpuscheduler_caps_executing_kernels(mocker):
+    """Test that requests wait until another kernel finished executing."""
+    scheduler = CpuScheduler(max_executing=1)
+    send_a1, send_a2, send_b = mocker.Mock(), mocker.Mock(), mocker.Mock()
+
+    scheduler.request_execution('a', 'handler_a', send_a1)
+    scheduler.request_execution('b', 'handler_b', send_b)
+    scheduler.request_execution('a', 'handler_a', send_a2)
+    send_a1.assert_called_once_with()
+    send_a2.assert_called_once_with()
+    send_b.assert_not_called()
+    assert scheduler.waiting == 1
+
+    scheduler.execution_finished('a', 'handler_a')
+    send_b.assert_not_called()
+    scheduler.execution_finished('a', 'handler_a')
+    send_b.assert_called_once_with()
+    assert scheduler.executing == 1
+    assert scheduler.waiting == 0
+
+
+def test_cpuscheduler_forgets_closed_connections(mocker):
+    """Test that a closed connection does not keep its kernel executing."""
+    scheduler = CpuScheduler(max_executing=1)
+    send_a, send_b = mocker.Mock(), mocker.Mock()
+    scheduler.request_execution('a', 'handler_a', send_a)
+    scheduler.request_execution('b', 'handler_b', send_b)
+
+    scheduler.forget_handler('handler_a')
+
+    send_b.assert_called_once_with()
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for dataflow.py"""
+
+# Third-party library imports
+import pytest
+
+# Local imports
+from dataflow import analyze_cell
+
+
+@pytest.mark.parametrize('source, defines, uses', [
+    ('a = b + 1', ['a'], ['b']),
+    ('a = 1\nprint(a)', ['a'], ['print']),
+    ('a += 1', ['a'], ['a']),
+    ('import numpy as np\nimport os.path', ['np', 'os'], []),
+    ('df["x"] = y', ['df'], ['df', 'y']),
+    ('def f(x):\n    z = x + w\n    return z', ['f'], ['w']),
+    ('for i in items:\n    total = i', ['i', 'total'], ['items']),
+    ('squares = [x * k for x in xs]', ['squares'], ['k', 'xs']),
+    ('%matplotlib inline\nplt.plot(x)', [], ['get_ipython', 'plt', 'x']),
+])
+def test_analyze_cell(source, defines, uses):
+    """Test names defined and used by cells."""
+    result = analyze_cell(source)
+
+    assert result['defines'] == defines
+    assert result['uses'] == uses
+
+
+def test_analyze_cell_with_syntax_error():
+    """Test that a cell which cannot be parsed is marked as unknown."""
+    assert analyze_cell('a = (') == {'defines': None, 'uses': None}
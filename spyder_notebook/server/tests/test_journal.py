@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for journal.py"""
+
+# Standard library imports
+import json
+import os
+
+# Third-party library imports
+import pytest
+
+# Local imports
+from journal import apply_ops, NotebookJournal
+
+
+def make_cell(source):
+    return {'cell_type': 'code', 'source': source, 'metadata': {},
+            'outputs': [], 'execution_count': None}
+
+
+@pytest.fixture
+def notebook_file(tmpdir):
+    """Notebook file with two cells."""
+    path = tmpdir.join('spam.ipynb')
+    notebook = {'cells': [make_cell('a'), make_cell('b')], 'metadata': {},
+                'nbformat': 4, 'nbformat_minor': 2}
+    path.write(json.dumps(notebook))
+    return str(path)
+
+
+@pytest.fixture
+def journal(tmpdir):
+    return NotebookJournal(interval=2, journal_dir=str(tmpdir.join('j')))
+
+
+def sources(notebook):
+    return [cell['source'] for cell in notebook['cells']]
+
+
+def test_apply_ops():
+    """Test that insertions, removals, moves and edits are applied."""
+    notebook = {'cells': [make_cell('a'), make_cell('b'), make_cell('c')]}
+    apply_ops(notebook, [
+        {'op': 'insert', 'index': 1, 'cells': [make_cell('x')]},
+        {'op': 'remove', 'index': 2, 'count': 1},
+        {'op': 'move', 'from': 0, 'to': 2},
+        {'op': 'set', 'index': 0, 'cell': make_cell('y')}])
+
+    assert sources(notebook) == ['y', 'c', 'a']
+
+
+def test_journal_recover(journal, notebook_file):
+    """Test that journaled changes are recovered."""
+    journal.append(notebook_file, [{'op': 'set', 'index': 1,
+                                    'cell': make_cell('B')}], reset=True)
+    journal.append(notebook_file, [{'op': 'insert', 'index': 2,
+                                    'cells': [make_cell('c')]}])
+
+    assert sources(journal.recover(notebook_file)) == ['a', 'B', 'c']
+
+
+def test_journal_without_changes(journal, notebook_file):
+    """Test that there is nothing to recover without a journal."""
+    assert journal.recover(notebook_file) is None
+    journal.append(notebook_file, [{'op': 'remove', 'index': 0,
+                                    'count': 1}])
+    assert journal.recover(notebook_file) is None
+
+
+def test_journal_is_stale_after_file_changes(journal, notebook_file):
+    """Test that a journal is not recovered if the file changed since."""
+    journal.append(notebook_file, [{'op': 'remove', 'index': 0,
+                                    'count': 1}], reset=True)
+    mtime = os.path.getmtime(notebook_file)
+    os.utime(notebook_file, (mtime + 10, mtime + 10))
+
+    assert journal.recover(notebook_file) is None
+
+
+def test_journal_ignores_truncated_line(journal, notebook_file):
+    """Test that a line cut short by a crash ends the changes."""
+    journal.append(notebook_file, [{'op': 'remove', 'index': 0,
+                                    'count': 1}], reset=True)
+    journal_path, _snapshot_path = journal.get_paths(notebook_file)
+    with open(journal_path, 'a') as f:
+        f.write('{"op": "remo')
+
+    assert sources(journal.recover(notebook_file)) == ['b']
+
+
+def test_journal_compacts(journal, notebook_file):
+    """Test that a long journal is replaced by a snapshot."""
+    journal.compact_after = 3
+    ops = [{'op': 'insert', 'index': 0, 'cells': [make_cell(str(i))]}
+           for i in range(3)]
+    journal.append(notebook_file, ops, reset=True)
+
+    journal_path, snapshot_path = journal.get_paths(notebook_file)
+    assert os.path.exists(snapshot_path)
+    with open(journal_path) as f:
+        assert len(f.readlines()) == 1
+
+    journal.append(notebook_file, [{'op': 'remove', 'index': 0,
+                                    'count': 1}])
+    assert sources(journal.recover(notebook_file)) == ['1', '0', 'a', 'b']
+
+    journal.discard(notebook_file)
+    assert not os.path.exists(journal_path)
+    assert not os.path.exists(snapshot_path)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for memorycontents.py"""
+
+# Standard library imports
+import os
+
+# Third-party library imports
+import nbformat
+import pytest
+from tornado import web
+
+# Local imports
+from memorycontents import MemoryContentsManager
+
+
+@pytest.fixture
+def manager(tmpdir):
+    """Contents manager keeping the notebooks in `scratch` in memory."""
+    tmpdir.mkdir('scratch')
+    return MemoryContentsManager(root_dir=str(tmpdir),
+                                 memory_dir=str(tmpdir.join('scratch')))
+
+
+def notebook_model(source):
+    notebook = nbformat.v4.new_notebook(
+        cells=[nbformat.v4.new_code_cell(source)])
+    return {'type': 'notebook', 'content': notebook}
+
+
+def get_source(manager, path):
+    return manager.get(path)['content']['cells'][0]['source']
+
+
+def test_notebook_in_memory(manager, tmpdir):
+    """Test that notebooks in the memory directory are not on disk."""
+    manager.save(notebook_model('a'), 'scratch/untitled0.ipynb')
+
+    assert manager.in_memory('scratch/untitled0.ipynb')
+    assert manager.file_exists('scratch/untitled0.ipynb')
+    assert get_source(manager, 'scratch/untitled0.ipynb') == 'a'
+    assert os.listdir(str(tmpdir.join('scratch'))) == []
+
+    manager.delete('scratch/untitled0.ipynb')
+    assert not manager.exists('scratch/untitled0.ipynb')
+    with pytest.raises(web.HTTPError):
+        manager.get('scratch/untitled0.ipynb')
+
+
+def test_notebook_outside_memory(manager, tmpdir):
+    """Test that other notebooks are saved to disk."""
+    manager.save(notebook_model('a'), 'spam.ipynb')
+
+    assert not manager.in_memory('spam.ipynb')
+    assert tmpdir.join('spam.ipynb').check(file=True)
+    assert get_source(manager, 'spam.ipynb') == 'a'
+
+
+def test_checkpoint_in_memory(manager):
+    """Test that a notebook in memory can be restored from a checkpoint."""
+    path = 'scratch/untitled0.ipynb'
+    manager.save(notebook_model('a'), path)
+    checkpoint = manager.create_checkpoint(path)
+    manager.save(notebook_model('b'), path)
+
+    assert manager.list_checkpoints(path) == [checkpoint]
+    manager.restore_checkpoint(checkpoint['id'], path)
+    assert get_source(manager, path) == 'a'
+
+
+def test_rename_writes_notebook_to_disk(manager, tmpdir):
+    """Test that renaming a notebook out of memory writes it to disk."""
+    manager.save(notebook_model('a'), 'scratch/untitled0.ipynb')
+    manager.rename('scratch/untitled0.ipynb', 'scratch/untitled1.ipynb')
+    manager.rename('scratch/untitled1.ipynb', 'spam.ipynb')
+
+    assert not manager.exists('scratch/untitled1.ipynb')
+    assert tmpdir.join('spam.ipynb').check(file=True)
+    assert get_source(manager, 'spam.ipynb') == 'a'
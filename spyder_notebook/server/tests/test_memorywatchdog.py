@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for memorywatchdog.py"""
+
+# Standard library imports
+import os
+import os.path as osp
+import subprocess
+import sys
+
+# Third-party library imports
+from jupyter_client.manager import KernelManager
+from notebook.services.kernels.kernelmanager import MappingKernelManager
+import psutil
+import pytest
+
+# Local imports
+from memorywatchdog import MemoryWatchdog
+
+MiB = 1024 ** 2
+
+SERVER_DIR = osp.dirname(osp.dirname(__file__))
+
+
+class GracefulRestartKernelManager(MappingKernelManager):
+    """Kernel manager of notebook < 6.1, which only restarts gracefully."""
+
+    def restart_kernel(self, kernel_id):
+        pass
+
+
+class ImmediateRestartKernelManager(MappingKernelManager):
+    """Kernel manager of notebook >= 6.1, which can restart immediately."""
+
+    def restart_kernel(self, kernel_id, now=False):
+        pass
+
+
+@pytest.fixture
+def kernel_manager(mocker):
+    """Create a mock kernel manager whose kernels are mock managers too."""
+    kernel_manager = mocker.create_autospec(GracefulRestartKernelManager,
+                                            instance=True)
+    kernel_manager.get_kernel.return_value = mocker.create_autospec(
+        KernelManager, instance=True)
+    return kernel_manager
+
+
+def test_memorywatchdog_escalates(kernel_manager):
+    """Test that a kernel over its limit is warned, interrupted and killed."""
+    watchdog = MemoryWatchdog(memory_limit=100, kill_grace=10)
+    watchdog.kernel_manager = kernel_manager
+    kill = kernel_manager.get_kernel.return_value.restart_kernel
+
+    watchdog.check_kernel('42', 95 * MiB, now=0)
+    watchdog.check_kernel('42', 120 * MiB, now=1)
+    kernel_manager.interrupt_kernel.assert_called_once_with('42')
+
+    watchdog.check_kernel('42', 120 * MiB, now=5)
+    kill.assert_not_called()
+    watchdog.check_kernel('42', 120 * MiB, now=11)
+    kill.assert_called_once_with(now=True)
+
+    events = watchdog._events['42']
+    assert [event['action'] for event in events] == [
+        'warn', 'interrupt', 'kill']
+
+
+def test_memorywatchdog_kills_with_immediate_restart(mocker):
+    """Test that kernels are restarted immediately through the kernel manager
+    if it supports that."""
+    kernel_manager = mocker.create_autospec(ImmediateRestartKernelManager,
+                                            instance=True)
+    watchdog = MemoryWatchdog(memory_limit=100)
+    watchdog.kernel_manager = kernel_manager
+
+    watchdog.kill_kernel('42')
+
+    kernel_manager.restart_kernel.assert_called_once_with('42', now=True)
+
+
+def test_memorywatchdog_resets_when_memory_freed(kernel_manager):
+    """Test that a kernel which frees memory is not killed later."""
+    watchdog = MemoryWatchdog(memory_limit=100, kill_grace=10)
+    watchdog.kernel_manager = kernel_manager
+
+    watchdog.check_kernel('42', 120 * MiB, now=0)
+    watchdog.check_kernel('42', 10 * MiB, now=5)
+    watchdog.check_kernel('42', 120 * MiB, now=20)
+
+    kernel = kernel_manager.get_kernel.return_value
+    kernel.restart_kernel.assert_not_called()
+    assert kernel_manager.interrupt_kernel.call_count == 2
+
+
+def test_memorywatchdog_get_kernel_memory(mocker):
+    """Test that the memory of a kernel includes its children."""
+    child = subprocess.Popen([sys.executable, '-c', 'input()'],
+                             stdin=subprocess.PIPE)
+    try:
+        kernel_manager = mocker.create_autospec(MappingKernelManager,
+                                                instance=True)
+        kernel_manager.get_kernel.return_value.kernel.pid = os.getpid()
+        watchdog = MemoryWatchdog(kernel_manager=kernel_manager)
+
+        memory = watchdog.get_kernel_memory('id')
+    finally:
+        child.communicate(b'\n')
+
+    assert memory > psutil.Process().memory_info().rss
+
+
+def test_server_runs_without_package():
+    """Test that the server modules import neither the plugin nor Qt, so
+    that the server starts without them."""
+    code = ('import sys; import main; '
+            'sys.exit(any(name in sys.modules for name in '
+            '["spyder_notebook", "qtpy", "PyQt5"]))')
+    env = dict(os.environ, PYTHONPATH='')
+    subprocess.check_call([sys.executable, '-c', code], cwd=SERVER_DIR,
+                          env=env)
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for metrics.py"""
+
+# Standard library imports
+import time
+
+# Third-party library imports
+from notebook.services.kernels.kernelmanager import MappingKernelManager
+import pytest
+from tornado.httputil import HTTPHeaders
+
+# Local imports
+from cpuscheduler import CpuScheduler
+from metrics import get_handler_kind, Histogram, ServerMetrics
+
+
+@pytest.fixture
+def metrics(mocker):
+    """Create metrics of a server with kernels 'a' and 'b'."""
+    kernel_manager = mocker.Mock(spec=MappingKernelManager)
+    kernel_manager.list_kernel_ids.return_value = ['a', 'b']
+    server_metrics = ServerMetrics(kernel_manager=kernel_manager)
+    server_metrics.base_url = '/base/'
+    return server_metrics
+
+
+def make_handler(mocker, path, method='GET', seconds=0.02, body=b'',
+                 length=None):
+    """Create a mock handler of a finished request."""
+    handler = mocker.Mock()
+    handler.request.path = path
+    handler.request.method = method
+    handler.request.body = body
+    handler.request.request_time.return_value = seconds
+    handler._headers = HTTPHeaders()
+    if length is not None:
+        handler._headers['Content-Length'] = str(length)
+    return handler
+
+
+@pytest.mark.parametrize('path, kind', [
+    ('/base/api/contents/ham.ipynb', 'contents'),
+    ('/base/api/sessions', 'sessions'),
+    ('/base/api/kernels/1234-abcd', 'kernels'),
+    ('/base/api/kernels/1234-abcd/channels', 'channels'),
+    ('/base/static/main.js', 'static'),
+    ('/base/notebook/ham.ipynb', 'notebook'),
+    ('/base/spyder/journal/ham.ipynb', 'spyder'),
+    ('/base/api/status', 'other'),
+])
+def test_get_handler_kind(path, kind):
+    """Test that requests are attributed to the handler serving them."""
+    assert get_handler_kind(path, '/base/') == kind
+
+
+def test_histogram_render():
+    """Test that histograms have cumulative buckets, a sum and a count for
+    every set of labels."""
+    histogram = Histogram('latency', 'Request latency.', [0.1, 1])
+    histogram.observe(0.05, handler='static')
+    histogram.observe(0.5, handler='static')
+    histogram.observe(2, handler='static')
+    histogram.observe(0.5, handler='contents')
+
+    assert histogram.render() == [
+        '# HELP latency Request latency.',
+        '# TYPE latency histogram',
+        'latency_bucket{handler="contents",le="0.1"} 0',
+        'latency_bucket{handler="contents",le="1"} 1',
+        'latency_bucket{handler="contents",le="+Inf"} 1',
+        'latency_sum{handler="contents"} 0.5',
+        'latency_count{handler="contents"} 1',
+        'latency_bucket{handler="static",le="0.1"} 1',
+        'latency_bucket{handler="static",le="1"} 2',
+        'latency_bucket{handler="static",le="+Inf"} 3',
+        'latency_sum{handler="static"} 2.55',
+        'latency_count{handler="static"} 3']
+
+
+def test_servermetrics_records_requests(metrics, mocker):
+    """Test that requests are recorded by kind of handler and method, that
+    contents payloads are recorded and that requests are still logged."""
+    log_function = mocker.Mock()
+    log_request = metrics.wrap_log_function(log_function)
+    save = make_handler(mocker, '/base/api/contents/ham.ipynb', 'PUT', 0.3,
+                        body=b'x' * 2000, length=500)
+    asset = make_handler(mocker, '/base/static/main.js', length=50000)
+
+    log_request(save)
+    log_request(asset)
+
+    assert log_function.call_count == 2
+    text = metrics.render()
+    assert ('spyder_notebook_request_duration_seconds_count'
+            '{handler="contents",method="PUT"} 1') in text
+    assert ('spyder_notebook_request_duration_seconds_bucket'
+            '{handler="static",method="GET",le="0.025"} 1') in text
+    assert ('spyder_notebook_contents_payload_bytes_bucket'
+            '{direction="request",le="1024"} 0') in text
+    assert ('spyder_notebook_contents_payload_bytes_bucket'
+            '{direction="request",le="10240"} 1') in text
+    assert ('spyder_notebook_contents_payload_bytes_sum'
+            '{direction="response"} 500') in text
+    assert ('spyder_notebook_contents_payload_bytes_count'
+            '{direction="response"} 1') in text
+
+
+def test_servermetrics_kernels(metrics):
+    """Test that messages are counted for live kernels only, and that the
+    kernel count and the state of the scheduler are reported."""
+    metrics.cpu_scheduler = CpuScheduler(max_executing=1)
+    metrics.cpu_scheduler.request_execution('a', 'handler', lambda: None)
+    for direction in ['in', 'out', 'out']:
+        metrics.count_message('a', direction)
+    metrics.count_message('gone', 'in')
+
+    text = metrics.render()
+
+    assert ('spyder_notebook_websocket_messages_total'
+            '{direction="out",kernel_id="a"} 2') in text
+    assert 'gone' not in text
+    assert 'spyder_notebook_kernels 2\n' in text
+    assert 'spyder_notebook_executing_kernels 1\n' in text
+    assert 'spyder_notebook_waiting_kernels 0\n' in text
+
+
+def test_servermetrics_event_loop_lag(metrics, mocker):
+    """Test that the lag of the event loop is measured until stopped."""
+    ioloop = mocker.patch('metrics.IOLoop').current.return_value
+    metrics.start()
+    ioloop.call_later.assert_called_once_with(0.5, metrics._check_lag)
+
+    metrics._expected = time.monotonic() - 0.2
+    metrics._check_lag()
+    metrics.stop()
+
+    assert metrics.last_lag >= 0.2
+    assert ioloop.call_later.call_count == 2
+    ioloop.remove_timeout.assert_called_once_with(
+        ioloop.call_later.return_value)
+    assert ('spyder_notebook_event_loop_lag_seconds_count 1'
+            in metrics.render())
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for namespacecache.py"""
+
+# Standard library imports
+import os.path as osp
+import pickle
+
+# Third-party library imports
+from IPython.core.interactiveshell import InteractiveShell
+import pytest
+
+NAMESPACECACHE = osp.join(osp.dirname(osp.dirname(__file__)),
+                          'namespacecache.py')
+
+
+@pytest.fixture
+def shell():
+    """Create an IPython shell running the kernel side of the cell cache."""
+    shell = InteractiveShell()
+    with open(NAMESPACECACHE) as f:
+        shell.run_cell(f.read(), store_history=False, silent=True)
+    yield shell
+    shell.user_ns['__spyder_cell_cache__'].unregister()
+    InteractiveShell.clear_instance()
+
+
+def run_cell(shell, source):
+    """Run a cell and return the variables it changed, as pickled."""
+    result = shell.run_cell(source, store_history=True)
+    cache = shell.user_ns['__spyder_cell_cache__']
+    data = cache.deltas[result.execution_count]
+    return None if data is None else pickle.loads(data)['values']
+
+
+def test_namespacecache_stores_reassigned_variables(shell):
+    """Test that variables bound to new objects are stored, and others are
+    not."""
+    run_cell(shell, 'x = 1\ny = [1]')
+
+    assert run_cell(shell, 'x = x + 1') == {'x': 2}
+
+
+def test_namespacecache_stores_variables_changed_in_place(shell):
+    """Test that variables that a cell changes in place are stored."""
+    run_cell(shell, 'lst = []\nd = {}\nother = [0]')
+
+    assert run_cell(shell, 'lst.append(1)\nd["x"] = 2') == {
+        'lst': [1], 'd': {'x': 2}}
+
+
+def test_namespacecache_stores_variables_changed_by_functions(shell):
+    """Test that variables that functions called by a cell change in place
+    are stored, while the functions themselves are not."""
+    run_cell(shell, 'lst = []\n'
+                    'def add(x):\n'
+                    '    lst.append(x)\n'
+                    'def helper():\n'
+                    '    add(3)')
+
+    assert run_cell(shell, 'helper()') == {'lst': [3]}
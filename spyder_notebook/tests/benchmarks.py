@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Synthetic notebooks and stored results for the benchmarks."""
+
+# Standard library imports
+import contextlib
+import datetime
+import json
+import os
+import os.path as osp
+import platform
+import statistics
+import sys
+import time
+
+# Third-party library imports
+import nbformat
+
+# Local imports
+from spyder_notebook._version import __version__
+
+# Environment variable with the directory to store benchmark results in;
+# the benchmarks only run if it is set
+BENCHMARK_ENV = 'SPYDER_NOTEBOOK_BENCHMARKS'
+
+# File names of the results of the last run and of the baseline, in the
+# benchmark directory
+RESULTS_FILE = 'results.json'
+BASELINE_FILE = 'baseline.json'
+
+# A measurement regresses if it is slower than the baseline by this factor
+REGRESSION_FACTOR = 1.5
+
+# Measurements faster than this (in seconds) are never regressions, since
+# they are dominated by noise
+MIN_REGRESSION_TIME = 0.05
+
+
+def get_benchmark_dir():
+    """Return the directory to store results in, or None if not set."""
+    return os.environ.get(BENCHMARK_ENV) or None
+
+
+def make_notebook(num_cells, output_lines=0, markdown_every=5):
+    """
+    Create a synthetic notebook.
+
+    Parameters
+    ----------
+    num_cells : int
+        Number of cells.
+    output_lines : int, optional
+        Number of lines of stream output of every code cell. The default
+        is 0, meaning that code cells have no outputs.
+    markdown_every : int, optional
+        Every cell with an index that is a multiple of this is a markdown
+        cell; the others are code cells. The default is 5.
+
+    Returns
+    -------
+    nbformat.NotebookNode
+        The notebook.
+    """
+    cells = []
+    execution_count = 0
+    for index in range(num_cells):
+        if markdown_every and index % markdown_every == 0:
+            source = '## Section {}\n\nSome *text* about step {}.'.format(
+                index // markdown_every, index)
+            cells.append(nbformat.v4.new_markdown_cell(source))
+            continue
+        execution_count += 1
+        source = ('def step_{0}(x):\n'
+                  '    return [x * i for i in range({0})]\n'
+                  'result = step_{0}(2)').format(index)
+        outputs = []
+        if output_lines:
+            text = ''.join('line {} of cell {}\n'.format(line, index)
+                           for line in range(output_lines))
+            outputs.append(nbformat.v4.new_output(
+                'stream', name='stdout', text=text))
+        cells.append(nbformat.v4.new_code_cell(
+            source, execution_count=execution_count, outputs=outputs))
+    metadata = {'kernelspec': {'display_name': 'Python 3 (Spyder)',
+                               'name': 'python3'}}
+    return nbformat.v4.new_notebook(cells=cells, metadata=metadata)
+
+
+def write_notebook(filename, num_cells, output_lines=0):
+    """Write a synthetic notebook to a file and return the file name."""
+    nbformat.write(make_notebook(num_cells, output_lines), filename)
+    return filename
+
+
+class BenchmarkResults:
+    """
+    Measurements of a benchmark run.
+
+    Every measurement is stored under a name with all its samples, and is
+    compared to a baseline by the median of the samples.
+    """
+
+    def __init__(self, samples=None, info=None):
+        """Constructor."""
+        self.samples = samples if samples is not None else {}
+        self.info = info if info is not None else self.get_info()
+
+    @staticmethod
+    def get_info():
+        """Return information about the environment of the run."""
+        return {'date': datetime.datetime.now().isoformat(),
+                'version': __version__,
+                'python': sys.version.split()[0],
+                'platform': platform.platform()}
+
+    def record(self, name, seconds):
+        """Add a sample, in seconds, to a measurement."""
+        self.samples.setdefault(name, []).append(seconds)
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        """Context manager recording the time spent in its block."""
+        start = time.perf_counter()
+        yield
+        self.record(name, time.perf_counter() - start)
+
+    def medians(self):
+        """Return the median time of every measurement."""
+        return {name: statistics.median(samples)
+                for name, samples in self.samples.items() if samples}
+
+    def compare(self, baseline, factor=REGRESSION_FACTOR):
+        """
+        Return the measurements which are slower than in a baseline.
+
+        Parameters
+        ----------
+        baseline : BenchmarkResults
+            Results to compare with. Measurements which are not in both
+            results are ignored.
+        factor : float, optional
+            A measurement regresses if its median is slower than the median
+            in the baseline by this factor. The default is
+            `REGRESSION_FACTOR`.
+
+        Returns
+        -------
+        list of (str, float, float)
+            Name, baseline median and median of every regression, sorted by
+            name.
+        """
+        medians = self.medians()
+        baseline_medians = baseline.medians()
+        regressions = []
+        for name in sorted(medians):
+            if name not in baseline_medians:
+                continue
+            old, new = baseline_medians[name], medians[name]
+            if new > MIN_REGRESSION_TIME and new > old * factor:
+                regressions.append((name, old, new))
+        return regressions
+
+    def save(self, filename):
+        """Write the results to a JSON file."""
+        dirname = osp.dirname(filename)
+        if dirname and not osp.isdir(dirname):
+            os.makedirs(dirname)
+        with open(filename, 'w') as f:
+            json.dump({'info': self.info, 'samples': self.samples}, f,
+                      indent=2, sort_keys=True)
+
+    @classmethod
+    def load(cls, filename):
+        """Read results written by `save()`."""
+        with open(filename) as f:
+            data = json.load(f)
+        return cls(samples=data['samples'], info=data['info'])
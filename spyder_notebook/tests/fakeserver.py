@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Stand-in for a notebook server, for testing and benchmarking clients.
+
+The server runs in a thread of the test process and implements the parts
+of the REST API of the notebook server that the plugin uses: status,
+sessions, kernels and contents. Kernels do not run any code. Every
+response can be delayed, requests can be made to hang until they are
+released, and requests can be made to fail.
+"""
+
+# Standard library imports
+import datetime
+import json
+import os
+import os.path as osp
+import re
+import socketserver
+import sys
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Token that clients have to send, unless another one is given
+DEFAULT_TOKEN = 'fake-token'
+
+# Time (in seconds) that hung requests wait at most to be released, so
+# that a test that forgets to release them does not hang forever
+MAX_HANG = 60
+
+# Time (in seconds) between checks whether the server should stop
+POLL_INTERVAL = 0.01
+
+
+def utcnow():
+    """Return the current time in the format of the notebook server."""
+    return datetime.datetime.utcnow().isoformat() + 'Z'
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """HTTP server handling every request in a thread."""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        """Ignore clients that disconnect, for instance after a timeout."""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class Failure:
+    """Failure injected into requests matching a method and a path."""
+
+    def __init__(self, method, pattern, status, body, count):
+        """Constructor."""
+        self.method = method
+        self.pattern = re.compile(pattern)
+        self.status = status
+        self.body = body
+        self.count = count
+
+    def matches(self, method, path):
+        """Return whether the failure applies to a request."""
+        return ((self.method is None or self.method == method)
+                and self.pattern.search(path) is not None)
+
+
+class FakeNotebookServer:
+    """
+    Stand-in for a notebook server.
+
+    Use as a context manager, or call `start()` and `stop()`. The state of
+    the server is in the attributes `kernels` (dict from kernel id to
+    kernel model), `sessions` (dict from session id to session model) and
+    `notebooks` (dict from path to notebook).
+    """
+
+    def __init__(self, notebook_dir, token=DEFAULT_TOKEN, latency=0):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        notebook_dir : str
+            Directory that the server claims to serve.
+        token : str, optional
+            Token that clients have to send. The default is
+            `DEFAULT_TOKEN`.
+        latency : float, optional
+            Time in seconds by which every response is delayed. The
+            default is 0.
+        """
+        self.notebook_dir = notebook_dir
+        self.token = token
+        self.latency = latency
+        self.kernels = {}
+        self.sessions = {}
+        self.notebooks = {}
+        self.requests = []
+        self.started = utcnow()
+        self._failures = []
+        self._released = threading.Event()
+        self._released.set()
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+        self._info_file = None
+
+    # ---- Control -----------------------------------------------------------
+    def start(self):
+        """Start serving on a free port of localhost."""
+        server = self
+
+        class Handler(RequestHandler):
+            fake_server = server
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            kwargs={'poll_interval': POLL_INTERVAL}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving, releasing hung requests, and unregister."""
+        self.release()
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        self.unregister()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def port(self):
+        """Port the server listens on."""
+        return self._httpd.server_address[1]
+
+    @property
+    def url(self):
+        """Url of the server, ending with a slash."""
+        return 'http://127.0.0.1:{}/'.format(self.port)
+
+    def server_info(self):
+        """Return information about the server, as the notebook server."""
+        return {'base_url': '/',
+                'hostname': '127.0.0.1',
+                'notebook_dir': self.notebook_dir,
+                'password': False,
+                'pid': os.getpid(),
+                'port': self.port,
+                'secure': False,
+                'token': self.token,
+                'url': self.url}
+
+    def register(self, runtime_dir):
+        """
+        Make the server discoverable in a Jupyter runtime directory.
+
+        Set the environment variable JUPYTER_RUNTIME_DIR to the directory
+        for `notebookapp.list_running_servers()` to find the server.
+        """
+        self._info_file = osp.join(
+            runtime_dir, 'nbserver-{}-{}.json'.format(os.getpid(), self.port))
+        with open(self._info_file, 'w') as f:
+            json.dump(self.server_info(), f)
+
+    def unregister(self):
+        """Remove the file written by `register()`."""
+        if self._info_file is not None and osp.exists(self._info_file):
+            os.remove(self._info_file)
+        self._info_file = None
+
+    def hang(self):
+        """Make requests hang until `release()` is called."""
+        self._released.clear()
+
+    def release(self):
+        """Let hung requests continue."""
+        self._released.set()
+
+    def fail(self, pattern, method=None, status=500, body=None, count=None):
+        """
+        Make requests fail.
+
+        Parameters
+        ----------
+        pattern : str
+            Regular expression searched for in the path of requests, such
+            as `'^/api/kernels/'`.
+        method : str or None, optional
+            HTTP method of the requests, such as `'DELETE'`. The default is
+            None, meaning that all methods fail.
+        status : int or None, optional
+            Status of the response. The default is 500. If None, the
+            connection is closed without response.
+        body : str or None, optional
+            Body of the response. The default is None, meaning a JSON
+            object with a message, as sent by the notebook server.
+        count : int or None, optional
+            Number of requests that fail. The default is None, meaning that
+            all matching requests fail.
+        """
+        with self._lock:
+            self._failures.append(
+                Failure(method, pattern, status, body, count))
+
+    def clear_failures(self):
+        """Make requests succeed again."""
+        with self._lock:
+            self._failures = []
+
+    def add_kernel(self, name='python3'):
+        """Add a kernel and return its id."""
+        kernel_id = str(uuid.uuid4())
+        self.kernels[kernel_id] = {
+            'id': kernel_id, 'name': name, 'last_activity': utcnow(),
+            'execution_state': 'idle', 'connections': 0}
+        return kernel_id
+
+    def add_session(self, path, kernel_id=None):
+        """Add a session for a notebook and return its id."""
+        if kernel_id is None:
+            kernel_id = self.add_kernel()
+        session_id = str(uuid.uuid4())
+        self.sessions[session_id] = {
+            'id': session_id, 'path': path, 'name': osp.basename(path),
+            'type': 'notebook', 'notebook': {'path': path,
+                                             'name': osp.basename(path)},
+            'kernel': kernel_id}
+        return session_id
+
+    # ---- Requests ----------------------------------------------------------
+    def take_failure(self, method, path):
+        """Return the failure for a request, if any, and count it."""
+        with self._lock:
+            for failure in self._failures:
+                if failure.matches(method, path):
+                    if failure.count is not None:
+                        failure.count -= 1
+                        if failure.count <= 0:
+                            self._failures.remove(failure)
+                    return failure
+        return None
+
+    def wait(self):
+        """Wait for the latency and for hung requests to be released."""
+        self._released.wait(MAX_HANG)
+        if self.latency:
+            threading.Event().wait(self.latency)
+
+    def session_model(self, session):
+        """Return the model of a session with its kernel, as in the API."""
+        model = dict(session)
+        model['kernel'] = self.kernels.get(
+            session['kernel'], {'id': session['kernel']})
+        return model
+
+    def handle(self, method, path, body):
+        """
+        Handle an API request.
+
+        Returns
+        -------
+        (int, object)
+            Status and body of the response, which is encoded as JSON
+            unless it is None.
+        """
+        if path == '/api/status':
+            return 200, {'started': self.started, 'last_activity': utcnow(),
+                         'connections': 0, 'kernels': len(self.kernels)}
+
+        if path == '/api/kernels':
+            if method == 'GET':
+                return 200, list(self.kernels.values())
+            if method == 'POST':
+                kernel_id = self.add_kernel((body or {}).get('name',
+                                                             'python3'))
+                return 201, self.kernels[kernel_id]
+        match = re.match('^/api/kernels/([^/]+)$', path)
+        if match:
+            kernel_id = match.group(1)
+            if kernel_id not in self.kernels:
+                return 404, {'message': 'Kernel does not exist: '
+                                        + kernel_id}
+            if method == 'GET':
+                return 200, self.kernels[kernel_id]
+            if method == 'DELETE':
+                del self.kernels[kernel_id]
+                for session_id, session in list(self.sessions.items()):
+                    if session['kernel'] == kernel_id:
+                        del self.sessions[session_id]
+                return 204, None
+
+        if path == '/api/sessions':
+            if method == 'GET':
+                return 200, [self.session_model(session)
+                             for session in self.sessions.values()]
+            if method == 'POST':
+                kernel_id = ((body or {}).get('kernel') or {}).get('id')
+                if kernel_id is not None and kernel_id not in self.kernels:
+                    return 404, {'message': 'Kernel does not exist: '
+                                            + kernel_id}
+                session_id = self.add_session(body['path'], kernel_id)
+                return 201, self.session_model(self.sessions[session_id])
+        match = re.match('^/api/sessions/([^/]+)$', path)
+        if match:
+            session_id = match.group(1)
+            if session_id not in self.sessions:
+                return 404, {'message': 'Session not found: ' + session_id}
+            if method == 'GET':
+                return 200, self.session_model(self.sessions[session_id])
+            if method == 'DELETE':
+                kernel_id = self.sessions.pop(session_id)['kernel']
+                self.kernels.pop(kernel_id, None)
+                return 204, None
+
+        match = re.match('^/api/contents/(.+)$', path)
+        if match:
+            nb_path = match.group(1)
+            if method == 'PUT':
+                created = nb_path not in self.notebooks
+                self.notebooks[nb_path] = body['content']
+                return (201 if created else 200), self.contents_model(
+                    nb_path, content=False)
+            if nb_path not in self.notebooks:
+                return 404, {'message': 'No such file or directory: '
+                                        + nb_path}
+            if method == 'GET':
+                return 200, self.contents_model(nb_path)
+            if method == 'DELETE':
+                del self.notebooks[nb_path]
+                return 204, None
+
+        return 404, {'message': 'Not found'}
+
+    def contents_model(self, path, content=True):
+        """Return the contents model of a notebook."""
+        return {'name': osp.basename(path), 'path': path, 'type': 'notebook',
+                'format': 'json' if content else None, 'writable': True,
+                'created': self.started, 'last_modified': utcnow(),
+                'mimetype': None,
+                'content': self.notebooks[path] if content else None}
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """Handler passing requests to a FakeNotebookServer."""
+
+    fake_server = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        """Do not log requests to stderr."""
+
+    def do_GET(self):
+        self.dispatch('GET')
+
+    def do_POST(self):
+        self.dispatch('POST')
+
+    def do_PUT(self):
+        self.dispatch('PUT')
+
+    def do_PATCH(self):
+        self.dispatch('PATCH')
+
+    def do_DELETE(self):
+        self.dispatch('DELETE')
+
+    def dispatch(self, method):
+        """Authenticate, apply failures and latency, and respond."""
+        server = self.fake_server
+        url = urlsplit(self.path)
+        path = unquote(url.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        data = self.rfile.read(length) if length else b''
+        server.requests.append((method, path))
+        server.wait()
+
+        failure = server.take_failure(method, path)
+        if failure is not None and failure.status is None:
+            self.close_connection = True
+            return
+        if failure is not None:
+            if failure.body is None:
+                body = json.dumps({'message': 'Injected failure'})
+            else:
+                body = failure.body
+            self.respond(failure.status, body.encode('utf-8'))
+            return
+
+        token = parse_qs(url.query).get('token', [None])[0]
+        header = self.headers.get('Authorization', '')
+        if token != server.token and header != 'token ' + server.token:
+            self.respond(403, json.dumps({'message': 'Forbidden'}).encode())
+            return
+
+        try:
+            body = json.loads(data.decode('utf-8')) if data else None
+        except ValueError:
+            self.respond(400, json.dumps({'message': 'Bad JSON'}).encode())
+            return
+        status, result = server.handle(method, path, body)
+        self.respond(status, b'' if result is None
+                     else json.dumps(result).encode('utf-8'))
+
+    def respond(self, status, body):
+        """Send a response with a JSON body."""
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Memory sampling of Spyder, its renderers and servers for soak tests."""
+
+# Standard library imports
+import json
+import os
+import os.path as osp
+import statistics
+import tracemalloc
+
+# Third-party library imports
+import psutil
+
+# Local imports
+from spyder_notebook.tests.benchmarks import BenchmarkResults
+from spyder_notebook.utils.kernels import get_process_memory
+
+# Environment variable with the number of open and close cycles of the soak
+# test; the soak test only runs if it is set
+SOAK_ENV = 'SPYDER_NOTEBOOK_SOAK'
+
+# File name of the samples of the last soak test, in the benchmark directory
+SOAK_FILE = 'soak.json'
+
+# Name of the processes of QtWebEngine which render the pages
+RENDERER_NAME = 'QtWebEngineProcess'
+
+MiB = 1024 * 1024
+
+# Allowed growth of every quantity over the soak test, after warming up.
+# Memory is in bytes; the other quantities are numbers of processes or
+# objects, which should not grow at all.
+GROWTH_LIMITS = {
+    'spyder_rss': 100 * MiB,
+    'python_heap': 20 * MiB,
+    'renderer_rss': 100 * MiB,
+    'renderer_count': 0,
+    'server_rss': 50 * MiB,
+    'kernel_rss': 50 * MiB,
+    'kernel_count': 0,
+}
+
+
+def get_soak_cycles():
+    """Return the number of cycles of the soak test, or None if not set."""
+    value = os.environ.get(SOAK_ENV)
+    return int(value) if value else None
+
+
+def get_renderers(process):
+    """Return the QtWebEngine renderer processes started by a process."""
+    renderers = []
+    try:
+        children = process.children(recursive=True)
+    except psutil.Error:
+        return renderers
+    for child in children:
+        try:
+            if child.name().startswith(RENDERER_NAME):
+                renderers.append(child)
+        except psutil.Error:
+            pass
+    return renderers
+
+
+def get_rss(process):
+    """Return resident memory of a process in bytes, or 0 if it exited."""
+    try:
+        return process.memory_info().rss
+    except psutil.Error:
+        return 0
+
+
+class MemorySampler:
+    """
+    Samples of the memory used by Spyder and the notebook server.
+
+    Every sample records the resident memory of the Spyder process itself,
+    the memory allocated by Python code according to tracemalloc, and the
+    number and resident memory of the renderer processes of Spyder, of the
+    server process and of the kernels started by the server.
+    """
+
+    def __init__(self, server_pid=None):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        server_pid : int or None, optional
+            Process id of the notebook server. The default is None, meaning
+            that the server and its kernels are not sampled.
+        """
+        self.process = psutil.Process()
+        self.server = psutil.Process(server_pid) if server_pid else None
+        self.samples = []
+        self.started_tracing = False
+
+    def start(self):
+        """Start tracing memory allocations of Python code."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+
+    def stop(self):
+        """Stop tracing memory allocations, if started by `start()`."""
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def sample(self, **extra):
+        """
+        Take a sample and add it to the samples.
+
+        Parameters
+        ----------
+        **extra
+            Additional quantities to record in the sample, for instance the
+            number of objects of some class.
+
+        Returns
+        -------
+        dict
+            The sample.
+        """
+        renderers = get_renderers(self.process)
+        sample = {
+            'spyder_rss': get_rss(self.process),
+            'python_heap': (tracemalloc.get_traced_memory()[0]
+                            if tracemalloc.is_tracing() else 0),
+            'renderer_rss': sum(get_rss(proc) for proc in renderers),
+            'renderer_count': len(renderers),
+        }
+        if self.server is not None:
+            try:
+                kernels = self.server.children()
+            except psutil.Error:
+                kernels = []
+            sample['server_rss'] = get_rss(self.server)
+            sample['kernel_rss'] = sum(get_process_memory(proc)
+                                       for proc in kernels)
+            sample['kernel_count'] = len(kernels)
+        sample.update(extra)
+        self.samples.append(sample)
+        return sample
+
+    def growth(self, skip=0, window=5):
+        """
+        Return how much every quantity grew over the samples.
+
+        Growth is the difference between the medians of the last `window`
+        samples and of the first `window` samples after the skipped ones,
+        so that a single outlier does not count as growth.
+
+        Parameters
+        ----------
+        skip : int, optional
+            Number of samples taken while warming up, which are ignored.
+            The default is 0.
+        window : int, optional
+            Number of samples at the start and at the end to take the median
+            of. The default is 5.
+
+        Returns
+        -------
+        dict
+            Growth of every quantity in all the samples, or an empty dict
+            if there are no samples after the skipped ones.
+        """
+        samples = self.samples[skip:]
+        if not samples:
+            return {}
+        first, last = samples[:window], samples[-window:]
+        return {name: (statistics.median(sample[name] for sample in last)
+                       - statistics.median(sample[name] for sample in first))
+                for name in samples[0]}
+
+    def check(self, limits=None, skip=0, window=5):
+        """
+        Return the quantities that grew more than allowed.
+
+        Parameters
+        ----------
+        limits : dict or None, optional
+            Allowed growth of quantities; quantities without a limit are
+            not checked. The default is None, meaning `GROWTH_LIMITS`.
+        skip, window : int, optional
+            Passed to `growth()`.
+
+        Returns
+        -------
+        list of (str, float, float)
+            Name, growth and allowed growth of every quantity that grew
+            more than allowed, sorted by name.
+        """
+        if limits is None:
+            limits = GROWTH_LIMITS
+        growth = self.growth(skip, window)
+        return [(name, growth[name], limits[name]) for name in sorted(growth)
+                if name in limits and growth[name] > limits[name]]
+
+    def save(self, filename):
+        """Write the samples to a JSON file."""
+        dirname = osp.dirname(filename)
+        if dirname and not osp.isdir(dirname):
+            os.makedirs(dirname)
+        with open(filename, 'w') as f:
+            json.dump({'info': BenchmarkResults.get_info(),
+                       'samples': self.samples}, f, indent=2, sort_keys=True)
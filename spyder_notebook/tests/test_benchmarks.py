@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Benchmarks for opening, saving and closing notebooks.
+
+The benchmarks only run if the environment variable
+SPYDER_NOTEBOOK_BENCHMARKS is set to a directory. The results are written
+to results.json in that directory and compared to baseline.json there, if
+it exists; the run fails if a measurement is much slower than in the
+baseline. To make a baseline, copy the results of a run to baseline.json.
+"""
+
+# Standard library imports
+import os.path as osp
+
+# Third-party library imports
+import pytest
+
+# Local imports
+from spyder_notebook.notebookplugin import NotebookPlugin
+from spyder_notebook.tests.benchmarks import (
+    BASELINE_FILE, BenchmarkResults, get_benchmark_dir, make_notebook,
+    RESULTS_FILE, write_notebook)
+
+# =============================================================================
+# Constants
+# =============================================================================
+# Time (in ms) to wait for a large notebook to be opened
+NOTEBOOK_UP = 120000
+
+# Number of cells and lines of output per code cell of the notebooks
+SIZES = [(10, 0), (500, 20), (3000, 0), (3000, 20)]
+
+# Number of times that quick operations are measured
+REPEATS = 5
+
+benchmark = pytest.mark.skipif(
+    get_benchmark_dir() is None,
+    reason='Benchmarks only run if SPYDER_NOTEBOOK_BENCHMARKS is set')
+
+
+# =============================================================================
+# Utility functions
+# =============================================================================
+def is_interactive(client, num_cells):
+    """Check if the notebook is displayed and its kernel is idle."""
+    if not client.notebookwidget.bridge.is_connected:
+        return False
+    state = client.get_state()
+    return (state is not None and state['cellCount'] == num_cells
+            and state['kernelStatus'] == 'idle')
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+@pytest.fixture(scope='session')
+def benchmark_results():
+    """
+    Collect the measurements of all benchmarks, then write them and fail
+    if they regressed compared to the baseline.
+    """
+    results = BenchmarkResults()
+    yield results
+
+    benchmark_dir = get_benchmark_dir()
+    if benchmark_dir is None or not results.samples:
+        return
+    results.save(osp.join(benchmark_dir, RESULTS_FILE))
+    baseline_file = osp.join(benchmark_dir, BASELINE_FILE)
+    if osp.exists(baseline_file):
+        regressions = results.compare(BenchmarkResults.load(baseline_file))
+        if regressions:
+            pytest.fail('Slower than baseline:\n' + '\n'.join(
+                '{}: {:.3f} s -> {:.3f} s'.format(*regression)
+                for regression in regressions))
+
+
+@pytest.fixture
+def notebook(qtbot):
+    """Set up the Notebook plugin without opening notebooks."""
+    notebook_plugin = NotebookPlugin(None, testing=True)
+    qtbot.addWidget(notebook_plugin)
+    return notebook_plugin
+
+
+# =============================================================================
+# Tests
+# =============================================================================
+def test_make_notebook():
+    """Test that synthetic notebooks have the requested cells and outputs."""
+    nb = make_notebook(10, output_lines=3)
+
+    assert len(nb.cells) == 10
+    assert [cell.cell_type for cell in nb.cells[:6]] == [
+        'markdown', 'code', 'code', 'code', 'code', 'markdown']
+    assert nb.cells[1].outputs[0].text.count('\n') == 3
+    assert not make_notebook(2).cells[1].outputs
+
+
+def test_benchmarkresults_compare(tmpdir):
+    """Test that results survive a round trip and that only measurements
+    that are much slower than in the baseline are regressions."""
+    baseline = BenchmarkResults()
+    baseline.samples = {'open': [1.0, 1.2, 1.1], 'save': [0.2],
+                        'close': [0.01], 'removed': [1.0]}
+    filename = str(tmpdir.join('baseline.json'))
+    baseline.save(filename)
+    baseline = BenchmarkResults.load(filename)
+
+    results = BenchmarkResults()
+    results.samples = {'open': [1.2], 'save': [0.5], 'close': [0.04],
+                       'added': [9.0]}
+
+    assert results.compare(baseline) == [('save', 0.2, 0.5)]
+
+
+@benchmark
+def test_benchmark_nbopen(benchmark_results, tmp_path_factory):
+    """Measure starting a notebook server and finding a running one."""
+    from notebook import notebookapp
+    from spyder_notebook.utils.nbopen import find_best_server, nbopen
+
+    filename = write_notebook(
+        str(tmp_path_factory.mktemp('nbopen') / 'spam.ipynb'), 10)
+    if find_best_server(filename) is not None:
+        pytest.skip('A notebook server is already running for ' + filename)
+
+    with benchmark_results.measure('nbopen_cold'):
+        server_info = nbopen(filename)
+    try:
+        for _x in range(REPEATS):
+            with benchmark_results.measure('nbopen_warm'):
+                assert nbopen(filename)['url'] == server_info['url']
+    finally:
+        notebookapp.shutdown_server(server_info)
+
+
+@benchmark
+@pytest.mark.parametrize('num_cells, output_lines', SIZES)
+def test_benchmark_lifecycle(benchmark_results, notebook, qtbot, mocker,
+                             tmpdir, num_cells, output_lines):
+    """Measure opening, saving and closing a notebook in the plugin."""
+    from spyder_notebook.utils.nbopen import nbopen
+
+    suffix = '[{}x{}]'.format(num_cells, output_lines)
+    filename = write_notebook(str(tmpdir.join('spam.ipynb')), num_cells,
+                              output_lines)
+    tabwidget = notebook.tabwidget
+
+    # Start the server beforehand, so that its startup is not measured
+    nbopen(filename, tabwidget.server_options)
+
+    with benchmark_results.measure('time_to_interactive' + suffix):
+        tabwidget.open_notebook(filenames=[filename])
+        client = tabwidget.currentWidget()
+        qtbot.waitUntil(lambda: is_interactive(client, num_cells),
+                        timeout=NOTEBOOK_UP)
+
+    for _x in range(REPEATS):
+        with benchmark_results.measure('save_notebook' + suffix):
+            tabwidget.save_notebook(client)
+
+    copy = str(tmpdir.join('ham.ipynb'))
+    mocker.patch('spyder_notebook.widgets.notebooktabwidget.getsavefilename',
+                 return_value=(copy, 'ignored'))
+    with benchmark_results.measure('save_as' + suffix):
+        tabwidget.save_as(reopen_after_save=False)
+    assert osp.exists(copy)
+
+    with benchmark_results.measure('close_client' + suffix):
+        tabwidget.close_client(tabwidget.indexOf(client))
+    assert tabwidget.indexOf(client) == -1
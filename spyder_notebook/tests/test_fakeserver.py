@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for fakeserver.py"""
+
+# Standard library imports
+import time
+
+# Third-party library imports
+import pytest
+import requests
+
+# Local imports
+from spyder_notebook.tests.fakeserver import DEFAULT_TOKEN, FakeNotebookServer
+
+
+@pytest.fixture
+def server(tmpdir):
+    """Start a stand-in notebook server and stop it after the test."""
+    with FakeNotebookServer(str(tmpdir)) as fake_server:
+        yield fake_server
+
+
+def api(server, path):
+    """Return url of an API endpoint of the server, with the token."""
+    return '{}api/{}?token={}'.format(server.url, path, DEFAULT_TOKEN)
+
+
+def test_fakeserver_sessions_and_kernels(server):
+    """Test that sessions are created for kernels and that shutting down a
+    kernel removes its session."""
+    kernel_id = server.add_kernel()
+    response = requests.post(api(server, 'sessions'), json={
+        'path': 'ham.ipynb', 'type': 'notebook',
+        'kernel': {'id': kernel_id}})
+    assert response.status_code == 201
+
+    sessions = requests.get(api(server, 'sessions')).json()
+    assert [(session['notebook']['path'], session['kernel']['id'])
+            for session in sessions] == [('ham.ipynb', kernel_id)]
+
+    response = requests.delete(api(server, 'kernels/' + kernel_id))
+    assert response.status_code == 204
+    assert requests.get(api(server, 'sessions')).json() == []
+    response = requests.delete(api(server, 'kernels/' + kernel_id))
+    assert response.status_code == 404
+
+
+def test_fakeserver_contents(server):
+    """Test that notebooks can be saved, read and deleted."""
+    notebook = {'cells': [], 'metadata': {}, 'nbformat': 4,
+                'nbformat_minor': 4}
+    url = api(server, 'contents/sub/ham.ipynb')
+
+    assert requests.put(url, json={'type': 'notebook',
+                                   'content': notebook}).status_code == 201
+    assert requests.get(url).json()['content'] == notebook
+    assert requests.delete(url).status_code == 204
+    assert requests.get(url).status_code == 404
+
+
+def test_fakeserver_token(server):
+    """Test that requests without the right token are forbidden."""
+    response = requests.get(server.url + 'api/status?token=wrong')
+    assert response.status_code == 403
+    response = requests.get(server.url + 'api/status', headers={
+        'Authorization': 'token ' + DEFAULT_TOKEN})
+    assert response.status_code == 200
+
+
+def test_fakeserver_failures(server):
+    """Test that failures are injected into matching requests only, for
+    the given number of requests."""
+    server.fail('^/api/sessions', method='GET', status=503, body='<html>',
+                count=1)
+    server.fail('^/api/kernels$', status=None)
+
+    response = requests.get(api(server, 'sessions'))
+    assert (response.status_code, response.text) == (503, '<html>')
+    assert requests.get(api(server, 'sessions')).status_code == 200
+    with pytest.raises(requests.exceptions.ConnectionError):
+        requests.get(api(server, 'kernels'))
+
+    server.clear_failures()
+    assert requests.get(api(server, 'kernels')).status_code == 200
+
+
+def test_fakeserver_hang_and_latency(server):
+    """Test that hung requests time out and that latency delays requests."""
+    server.hang()
+    with pytest.raises(requests.exceptions.Timeout):
+        requests.get(api(server, 'status'), timeout=0.2)
+    server.release()
+
+    server.latency = 0.2
+    start = time.perf_counter()
+    assert requests.get(api(server, 'status')).status_code == 200
+    assert time.perf_counter() - start >= 0.2
+
+
+def test_fakeserver_many_sessions(server):
+    """Test that a server with many sessions lists them all."""
+    for index in range(1000):
+        server.add_session('notebook{}.ipynb'.format(index))
+
+    sessions = requests.get(api(server, 'sessions')).json()
+
+    assert len(sessions) == 1000
+    assert requests.get(api(server, 'status')).json()['kernels'] == 1000
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for the cost of importing the plugin at Spyder startup."""
+
+# Standard library imports
+import subprocess
+import sys
+
+# Third-party library imports
+import pytest
+
+# =============================================================================
+# Constants
+# =============================================================================
+# Spyder modules used by the plugin. Spyder has already imported these by
+# the time it loads the plugin, so they do not count towards our share.
+SPYDER_MODULES = [
+    'qtpy.QtCore', 'qtpy.QtGui', 'qtpy.QtWidgets', 'spyder.api.plugins',
+    'spyder.config.base', 'spyder.utils.icon_manager',
+    'spyder.utils.programs', 'spyder.utils.qthelpers',
+    'spyder.utils.switcher']
+
+# Modules that should only be imported when the first notebook is opened
+HEAVY_MODULES = ['nbformat', 'notebook.notebookapp', 'requests',
+                 'qtpy.QtWebEngineWidgets']
+
+# Maximum time (in microseconds) that importing the plugin may take
+IMPORT_TIME_BUDGET = 300000
+
+SCRIPT = """
+import sys
+{preimports}
+before = set(sys.modules)
+import spyder_notebook
+print('\\n'.join(sorted(set(sys.modules) - before)))
+"""
+
+
+# =============================================================================
+# Utility functions
+# =============================================================================
+def import_plugin(*options):
+    """
+    Import the plugin in a fresh interpreter.
+
+    Return the completed process; its stdout lists the modules that were
+    imported because of the plugin.
+    """
+    preimports = '\n'.join('import {}'.format(module)
+                           for module in SPYDER_MODULES)
+    command = [sys.executable] + list(options)
+    command += ['-c', SCRIPT.format(preimports=preimports)]
+    return subprocess.run(command, stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE, universal_newlines=True,
+                          check=True)
+
+
+# =============================================================================
+# Tests
+# =============================================================================
+def test_import_does_not_load_heavy_modules():
+    """Test that importing the plugin does not import heavy modules."""
+    result = import_plugin()
+    imported = set(result.stdout.split())
+
+    for module in HEAVY_MODULES:
+        assert module not in imported
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason='-X importtime needs Python 3.7 or later')
+def test_import_time():
+    """Test that importing the plugin stays within its time budget."""
+    result = import_plugin('-X', 'importtime')
+
+    # Lines look like "import time: self [us] | cumulative | package"
+    cumulative = None
+    for line in result.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == 'spyder_notebook':
+            cumulative = int(fields[1])
+
+    assert cumulative is not None
+    assert cumulative < IMPORT_TIME_BUDGET
@@ -228,8 +228,7 @@ def test_save_notebook_as_with_error(mocker, notebook, qtbot, tmpdir):
     name = osp.join(str(tmpdir), 'save.ipynb')
     mocker.patch('spyder_notebook.widgets.notebooktabwidget.getsavefilename',
                  return_value=(name, 'ignored'))
-    mocker.patch('spyder_notebook.widgets.notebooktabwidget.nbformat.write',
-                 side_effect=PermissionError)
+    mocker.patch('nbformat.write', side_effect=PermissionError)
     mock_critical = mocker.patch('spyder_notebook.widgets.notebooktabwidget'
                                  '.QMessageBox.critical')
 
@@ -255,6 +254,112 @@ def test_new_notebook(notebook, qtbot):
     assert notebook.tabwidget.count() == 2
 
 
+@flaky(max_runs=3)
+def test_new_notebook_uses_prewarmed_page(notebook, qtbot):
+    """Test that a second new notebook is displayed in a prewarmed page."""
+    # Wait for prompt and for the prewarmed page to be ready
+    nbwidget = notebook.tabwidget.currentWidget().notebookwidget
+    qtbot.waitUntil(lambda: prompt_present(nbwidget), timeout=NOTEBOOK_UP)
+    qtbot.waitUntil(
+        lambda: any(widget.prewarm_ready
+                    for widget in notebook.tabwidget.prewarmed_widgets),
+        timeout=NOTEBOOK_UP)
+    prewarmed = notebook.tabwidget.prewarmed_widgets[0]
+
+    # Create second notebook
+    notebook.create_new_client()
+
+    # Assert that it uses the prewarmed page and displays a notebook
+    nbwidget = notebook.tabwidget.currentWidget().notebookwidget
+    assert nbwidget is prewarmed
+    assert prewarmed not in notebook.tabwidget.prewarmed_widgets
+    qtbot.waitUntil(lambda: prompt_present(nbwidget), timeout=NOTEBOOK_UP)
+
+
+@flaky(max_runs=3)
+def test_restore_session(notebook, qtbot, tmpdir):
+    """Test that restored notebooks are only loaded when they are selected
+    and that placeholder tabs can be closed."""
+    # Copy the test file to three notebooks
+    filenames = []
+    for name in ['spam', 'ham', 'eggs']:
+        filename = osp.join(str(tmpdir), name + '.ipynb')
+        shutil.copyfile(osp.join(LOCATION, 'test.ipynb'), filename)
+        filenames.append(filename)
+    missing = osp.join(str(tmpdir), 'missing.ipynb')
+
+    # Restore a session with the second notebook selected
+    tabwidget = notebook.tabwidget
+    count = tabwidget.count()
+    assert tabwidget.restore_session(filenames + [missing], current=1) == 3
+    spam, ham, eggs = [tabwidget.widget(count + i) for i in range(3)]
+
+    # Assert that only the selected notebook is loaded
+    assert tabwidget.currentWidget() is ham
+    assert not tabwidget.is_placeholder(ham)
+    assert tabwidget.is_placeholder(spam) and tabwidget.is_placeholder(eggs)
+    qtbot.waitUntil(lambda: text_present(ham.notebookwidget),
+                    timeout=NOTEBOOK_UP)
+
+    # Assert that a placeholder is loaded when it is selected
+    tabwidget.setCurrentWidget(spam)
+    assert not tabwidget.is_placeholder(spam)
+    qtbot.waitUntil(lambda: text_present(spam.notebookwidget),
+                    timeout=NOTEBOOK_UP)
+
+    # Close the remaining placeholder and assert that the tab is gone
+    tabwidget.close_client(tabwidget.indexOf(eggs))
+    assert tabwidget.indexOf(eggs) == -1
+    assert not tabwidget.placeholders
+
+
+@flaky(max_runs=3)
+def test_restore_session_in_background(notebook, qtbot, tmpdir):
+    """Test that placeholders are loaded one by one in the background, and
+    that a placeholder closed meanwhile is left alone."""
+    filenames = []
+    for name in ['spam', 'ham', 'eggs']:
+        filename = osp.join(str(tmpdir), name + '.ipynb')
+        shutil.copyfile(osp.join(LOCATION, 'test.ipynb'), filename)
+        filenames.append(filename)
+    tabwidget = notebook.tabwidget
+    count = tabwidget.count()
+    tabwidget.restore_session(filenames)
+    spam, ham, eggs = [tabwidget.widget(count + i) for i in range(3)]
+
+    # Start loading the first placeholder and close it meanwhile
+    tabwidget.load_next_placeholder()
+    tabwidget.close_client(tabwidget.indexOf(ham))
+    qtbot.waitUntil(lambda: tabwidget.opening_placeholder is None)
+    assert tabwidget.indexOf(ham) == -1
+
+    # Load the next placeholder without selecting it
+    tabwidget.load_next_placeholder()
+    qtbot.waitUntil(lambda: not tabwidget.is_placeholder(eggs))
+    assert tabwidget.currentWidget() is spam
+    qtbot.waitUntil(lambda: text_present(eggs.notebookwidget),
+                    timeout=NOTEBOOK_UP)
+
+
+def test_close_client_is_not_reentered(notebook, qtbot, mocker):
+    """Test that closing a tab again while it is saved before closing does
+    nothing."""
+    nbwidget = notebook.tabwidget.currentWidget().notebookwidget
+    qtbot.waitUntil(lambda: prompt_present(nbwidget), timeout=NOTEBOOK_UP)
+    tabwidget = notebook.tabwidget
+    client = tabwidget.currentWidget()
+    mocker.patch.object(
+        tabwidget, 'save_notebook',
+        side_effect=lambda client: tabwidget.close_client(
+            tabwidget.indexOf(client)))
+    mock_shutdown = mocker.patch.object(client, 'shutdown_kernel')
+
+    tabwidget.close_client()
+
+    mock_shutdown.assert_called_once_with()
+    assert tabwidget.indexOf(client) == -1
+
+
 def test_open_console_when_no_kernel(notebook, qtbot, mocker):
     """Test that open_console() handles the case when there is no kernel."""
     # Create mock IPython console plugin and QMessageBox
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Soak test opening and closing notebooks many times to find leaks.
+
+The soak test only runs if the environment variable SPYDER_NOTEBOOK_SOAK is
+set to the number of cycles. Every cycle opens a new notebook, waits until
+its kernel is idle and closes it again. Memory of Spyder, its renderers,
+the notebook server and its kernels is sampled every few cycles, and the
+test fails if it keeps growing after warming up. If SPYDER_NOTEBOOK_BENCHMARKS
+is set as well, the samples are written to soak.json in that directory.
+"""
+
+# Standard library imports
+import gc
+import os
+import os.path as osp
+import subprocess
+import sys
+
+# Third-party library imports
+import psutil
+import pytest
+
+# Local imports
+from spyder_notebook.notebookplugin import NotebookPlugin
+from spyder_notebook.tests.benchmarks import get_benchmark_dir
+from spyder_notebook.tests.soak import (
+    get_soak_cycles, GROWTH_LIMITS, MemorySampler, MiB, SOAK_FILE)
+
+# =============================================================================
+# Constants
+# =============================================================================
+# Time (in ms) to wait for a notebook to be opened
+NOTEBOOK_UP = 40000
+
+# Time (in ms) to wait after closing a notebook, so that its kernel and
+# page can go away
+SETTLE_TIME = 500
+
+# Number of cycles between samples
+SAMPLE_EVERY = 5
+
+# Number of samples taken while warming up, which are not checked
+WARMUP_SAMPLES = 4
+
+soak = pytest.mark.skipif(
+    get_soak_cycles() is None,
+    reason='Soak test only runs if SPYDER_NOTEBOOK_SOAK is set')
+
+
+# =============================================================================
+# Utility functions
+# =============================================================================
+def is_idle(client):
+    """Check if the notebook is displayed and its kernel is idle."""
+    if not client.notebookwidget.bridge.is_connected:
+        return False
+    state = client.get_state()
+    return state is not None and state['kernelStatus'] == 'idle'
+
+
+def count_notebook_widgets():
+    """Return the number of NotebookWidget objects that are alive."""
+    from spyder_notebook.widgets.client import NotebookWidget
+
+    gc.collect()
+    return sum(1 for obj in gc.get_objects()
+               if isinstance(obj, NotebookWidget))
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+@pytest.fixture
+def notebook(qtbot):
+    """Set up the Notebook plugin without opening notebooks."""
+    notebook_plugin = NotebookPlugin(None, testing=True)
+    qtbot.addWidget(notebook_plugin)
+    return notebook_plugin
+
+
+@pytest.fixture
+def child_process():
+    """Start a Python process which sleeps, and kill it after the test."""
+    process = subprocess.Popen(
+        [sys.executable, '-c', 'import time; time.sleep(60)'])
+    yield process
+    process.kill()
+    process.wait()
+
+
+# =============================================================================
+# Tests
+# =============================================================================
+def test_memorysampler_sample(child_process):
+    """Test that samples count the children of the server as kernels, and
+    include the memory allocated by Python code and extra quantities."""
+    sampler = MemorySampler(server_pid=psutil.Process().pid)
+    sampler.start()
+    try:
+        data = [bytearray(MiB) for _x in range(5)]
+        sample = sampler.sample(widgets=3)
+    finally:
+        sampler.stop()
+
+    assert sample['python_heap'] >= 5 * MiB
+    # Both are the memory of this process, but measured at different times
+    assert sample['spyder_rss'] > 0 and sample['server_rss'] > 0
+    assert sample['kernel_count'] >= 1
+    assert sample['kernel_rss'] > 0
+    assert sample['renderer_count'] == 0
+    assert sample['widgets'] == 3
+    assert sampler.samples == [sample]
+    del data
+
+
+def test_memorysampler_check(tmpdir):
+    """Test that growth ignores warm-up samples and outliers, and that only
+    quantities growing more than allowed are reported."""
+    sampler = MemorySampler()
+    sampler.samples = [{'rss': rss, 'count': count}
+                       for rss, count in [(0, 9), (100, 2), (100, 2),
+                                          (999, 2), (120, 2), (180, 3),
+                                          (180, 3)]]
+
+    assert sampler.growth(skip=1, window=3) == {'rss': 80, 'count': 1}
+    assert sampler.check({'rss': 50, 'count': 1}, skip=1, window=3) == [
+        ('rss', 80, 50)]
+    assert sampler.check({'rss': 100}, skip=1, window=3) == []
+    assert sampler.growth(skip=10) == {}
+
+    filename = str(tmpdir.join('soak.json'))
+    sampler.save(filename)
+    assert osp.exists(filename)
+
+
+@soak
+def test_soak_open_and_close(notebook, qtbot):
+    """Open and close notebooks many times and check that memory of Spyder,
+    the server and its kernels does not keep growing."""
+    from spyder_notebook.utils.nbopen import nbopen
+    from spyder_notebook.widgets.notebooktabwidget import NOTEBOOK_TMPDIR
+
+    cycles = get_soak_cycles()
+    tabwidget = notebook.tabwidget
+    if not osp.isdir(NOTEBOOK_TMPDIR):
+        os.makedirs(NOTEBOOK_TMPDIR)
+    server_info = nbopen(osp.join(NOTEBOOK_TMPDIR, 'untitled0.ipynb'),
+                         tabwidget.server_options)
+    sampler = MemorySampler(server_pid=server_info['pid'])
+    sampler.start()
+    try:
+        for cycle in range(cycles):
+            tabwidget.create_new_client()
+            client = tabwidget.widget(tabwidget.count() - 1)
+            qtbot.waitUntil(lambda client=client: is_idle(client),
+                            timeout=NOTEBOOK_UP)
+            tabwidget.close_client(tabwidget.indexOf(client),
+                                   save_before_close=False)
+            del client
+            qtbot.wait(SETTLE_TIME)
+            if cycle % SAMPLE_EVERY == 0:
+                sampler.sample(notebook_widgets=count_notebook_widgets())
+    finally:
+        sampler.stop()
+
+    benchmark_dir = get_benchmark_dir()
+    if benchmark_dir is not None:
+        sampler.save(osp.join(benchmark_dir, SOAK_FILE))
+    leaks = sampler.check(dict(GROWTH_LIMITS, notebook_widgets=0),
+                          skip=WARMUP_SAMPLES)
+    if leaks:
+        pytest.fail('Growth over {} cycles:\n'.format(cycles) + '\n'.join(
+            '{}: {} (allowed {})'.format(*leak) for leak in leaks))
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Execute notebooks without displaying them."""
+
+# Standard library imports
+import os.path as osp
+
+
+# Tag of the cell with default parameters, as used by papermill
+PARAMETERS_TAG = 'parameters'
+
+# Tag of the cell with injected parameters
+INJECTED_TAG = 'injected-parameters'
+
+
+def inject_parameters(nb, parameters):
+    """
+    Add a cell setting the given parameters to a notebook.
+
+    The cell is inserted after the first cell tagged with `PARAMETERS_TAG`,
+    so that it overrides the defaults set there, or at the top of the
+    notebook if no cell has that tag. A cell with injected parameters
+    from an earlier run is replaced.
+
+    Parameters
+    ----------
+    nb : nbformat.NotebookNode
+        Notebook to be modified in place.
+    parameters : dict
+        Values of the parameters, by name. Values need to have a repr()
+        that evaluates to an equal value.
+    """
+    import nbformat
+
+    source = '\n'.join('{} = {!r}'.format(name, value)
+                       for name, value in sorted(parameters.items()))
+    new_cell = nbformat.v4.new_code_cell(
+        source, metadata={'tags': [INJECTED_TAG]})
+
+    cells = [cell for cell in nb.cells
+             if INJECTED_TAG not in cell.metadata.get('tags', [])]
+    index = 0
+    for position, cell in enumerate(cells):
+        if PARAMETERS_TAG in cell.metadata.get('tags', []):
+            index = position + 1
+            break
+    cells.insert(index, new_cell)
+    nb.cells = cells
+
+
+def get_sweep_path(filename, index):
+    """
+    Return file name for one run in a parameter sweep.
+
+    For instance, the third run of `report.ipynb` is written to
+    `report-2.ipynb`.
+    """
+    root, ext = osp.splitext(filename)
+    return '{}-{}{}'.format(root, index, ext)
+
+
+def get_kernel_manager_class(base):
+    """
+    Return kernel manager class which starts kernels with Spyder's kernel spec.
+
+    Kernel managers create their own kernel spec manager, which does not
+    see the configuration of the notebook client, so the kernel spec class
+    is set by overriding the default of that kernel spec manager.
+
+    Parameters
+    ----------
+    base : type
+        Kernel manager class to subclass.
+
+    Returns
+    -------
+    type
+        Subclass of `base`.
+    """
+    from jupyter_client.kernelspec import KernelSpecManager
+    from traitlets import default
+
+    from spyder_notebook.utils.nbopen import KERNELSPEC
+
+    class SpyderKernelManager(base):
+        @default('kernel_spec_manager')
+        def _kernel_spec_manager_default(self):
+            return KernelSpecManager(data_dir=self.data_dir,
+                                     kernel_spec_class=KERNELSPEC)
+
+    return SpyderKernelManager
+
+
+def execute_notebook(filename, output=None, parameters=None, timeout=None):
+    """
+    Execute a notebook with a Spyder kernel and save it with its outputs.
+
+    This runs in a worker process, so it only takes and returns picklable
+    values. If a cell raises an error, the notebook is still saved, with
+    outputs up to and including that cell, before the error is reraised.
+
+    Parameters
+    ----------
+    filename : str
+        File name of the notebook to execute.
+    output : str or None, optional
+        File name to write the executed notebook to. The default is None,
+        meaning that the notebook is written back to `filename`.
+    parameters : dict or None, optional
+        Parameters to inject with `inject_parameters()` before execution.
+        The default is None, meaning that no parameters are injected.
+    timeout : int or None, optional
+        Maximum time (in seconds) that a cell may run. The default is None,
+        meaning that there is no limit.
+
+    Returns
+    -------
+    str
+        File name the executed notebook was written to.
+    """
+    import nbformat
+    from nbconvert.preprocessors import ExecutePreprocessor
+
+    nb = nbformat.read(filename, as_version=4)
+    if parameters:
+        inject_parameters(nb, parameters)
+
+    preprocessor = ExecutePreprocessor(timeout=timeout or -1,
+                                       kernel_name='python3')
+    preprocessor.kernel_manager_class = get_kernel_manager_class(
+        preprocessor.kernel_manager_class)
+    resources = {'metadata': {'path': osp.dirname(osp.abspath(filename))}}
+
+    output = output or filename
+    try:
+        preprocessor.preprocess(nb, resources)
+    finally:
+        nbformat.write(nb, output)
+    return output
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Export notebooks to other formats without displaying them."""
+
+# Standard library imports
+import os.path as osp
+
+
+# Formats notebooks can be exported to, by name of the nbconvert exporter,
+# with their description and file extension
+EXPORT_FORMATS = {'html': ('HTML', '.html'),
+                  'python': ('Python', '.py'),
+                  'pdf': ('PDF', '.pdf')}
+
+
+def get_export_path(filename, exporter_name):
+    """
+    Return file name to export a notebook to.
+
+    For instance, `report.ipynb` is exported to HTML as `report.html`.
+    """
+    root, _ext = osp.splitext(filename)
+    return root + EXPORT_FORMATS[exporter_name][1]
+
+
+def export_notebook(filename, output, exporter_name, contents_url=None,
+                    timeout=None):
+    """
+    Convert a notebook with nbconvert and write the result to a file.
+
+    This runs in a worker process, so it only takes and returns picklable
+    values. The notebook is read and converted in the worker, so that the
+    GUI process does not need to parse it.
+
+    Parameters
+    ----------
+    filename : str
+        File name of the notebook to export.
+    output : str
+        File name to write the exported notebook to.
+    exporter_name : str
+        Name of the nbconvert exporter, which is a key of `EXPORT_FORMATS`.
+    contents_url : str or None, optional
+        Url of the notebook in the contents API of a notebook server,
+        including the token. If given, the notebook as saved by the server
+        is exported, which also works for notebooks that the server keeps
+        in memory. The default is None, meaning that `filename` is read.
+    timeout : float or None, optional
+        Time (in seconds) to wait for the notebook server to respond. The
+        default is None, meaning that there is no limit.
+
+    Returns
+    -------
+    str
+        File name the exported notebook was written to.
+    """
+    import nbformat
+    from nbconvert.exporters import get_exporter
+
+    if contents_url:
+        import requests
+
+        response = requests.get(contents_url, timeout=timeout)
+        response.raise_for_status()
+        nb = nbformat.from_dict(response.json()['content'])
+    else:
+        nb = nbformat.read(filename, as_version=4)
+
+    exporter = get_exporter(exporter_name)()
+    resources = {'metadata': {
+        'name': osp.splitext(osp.basename(filename))[0],
+        'path': osp.dirname(osp.abspath(filename))}}
+    body, _resources = exporter.from_notebook_node(nb, resources=resources)
+
+    if isinstance(body, bytes):
+        with open(output, 'wb') as f:
+            f.write(body)
+    else:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(body)
+    return output
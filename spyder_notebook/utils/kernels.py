@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Utilities for inspecting kernel processes of notebook servers."""
+
+# Third party imports
+import psutil
+
+
+def find_kernel_process(kernel_id):
+    """
+    Find the process running the kernel with the given id.
+
+    Kernels started by a notebook server are passed a connection file
+    named after their id on the command line, which is used to find them.
+
+    Parameters
+    ----------
+    kernel_id : str
+        Id of the kernel, as used by the notebook server.
+
+    Returns
+    -------
+    psutil.Process or None
+        The kernel process, or None if it is not running on this machine.
+    """
+    connection_file = 'kernel-{}.json'.format(kernel_id)
+    for process in psutil.process_iter():
+        try:
+            cmdline = process.cmdline()
+        except (psutil.Error, OSError):
+            continue
+        if any(arg.endswith(connection_file) for arg in cmdline):
+            return process
+    return None
+
+
+def get_process_memory(process):
+    """
+    Return resident memory of a process and its children, in bytes.
+
+    Processes that exit while being inspected are ignored.
+    """
+    total = 0
+    try:
+        processes = [process] + process.children(recursive=True)
+    except psutil.Error:
+        return total
+    for proc in processes:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def get_kernel_memory(kernel_id):
+    """
+    Return resident memory of the kernel with the given id, in bytes.
+
+    Returns
+    -------
+    int or None
+        Memory used by the kernel and its children, or None if the kernel
+        process could not be found.
+    """
+    process = find_kernel_process(kernel_id)
+    if process is None:
+        return None
+    return get_process_memory(process)
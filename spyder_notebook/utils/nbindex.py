@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Index of the definitions, headings and text of cells in notebooks."""
+
+# Standard library imports
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import json
+import os.path as osp
+import re
+
+# Qt imports
+from qtpy.QtCore import QObject, Signal
+
+
+IndexEntry = namedtuple('IndexEntry', ['kind', 'name', 'cell', 'line'])
+"""
+Something in a notebook that the user may want to jump to.
+
+`kind` is 'function', 'class', 'heading' or 'text', `name` is the name of
+the function or class, the text of the heading or the text of a line in
+the cell, `cell` is the index of the cell and `line` is the line number
+within the cell, both starting at 0.
+"""
+
+DEFINITION_REGEX = re.compile(r'^[ \t]*(?:async[ \t]+)?(def|class)[ \t]+(\w+)')
+HEADING_REGEX = re.compile(r'^ {0,3}(#{1,6})[ \t]+(.*?)[ \t#]*$')
+SETEXT_REGEX = re.compile(r'^ {0,3}(=+|-+)[ \t]*$')
+FENCE_REGEX = re.compile(r'^ {0,3}(```|~~~)')
+
+# Maximum length of the text of a line in an index entry
+MAX_TEXT_LENGTH = 200
+
+
+def get_source(cell):
+    """Return source of a cell in nbformat 4, which may be a list."""
+    source = cell.get('source', '')
+    if isinstance(source, list):
+        source = ''.join(source)
+    return source
+
+
+def index_notebook(notebook):
+    """
+    Find the functions, classes, headings and text in a notebook.
+
+    Definitions are found in code cells by their first line, so this also
+    works for cells with IPython syntax. Headings are the ATX (`# Title`)
+    and setext (`Title` underlined with `===`) headings of markdown cells,
+    outside fenced code blocks. Every other line of a code or markdown cell
+    which is not blank is a text entry, so that the contents of cells can
+    be searched as well.
+
+    Parameters
+    ----------
+    notebook : dict
+        Notebook in nbformat 4.
+
+    Returns
+    -------
+    list of IndexEntry
+        Entries in the order in which they appear in the notebook.
+    """
+    entries = []
+    for cell_index, cell in enumerate(notebook.get('cells', [])):
+        lines = get_source(cell).splitlines()
+        if cell.get('cell_type') == 'code':
+            for line_index, line in enumerate(lines):
+                match = DEFINITION_REGEX.match(line)
+                if match:
+                    kind = 'function' if match.group(1) == 'def' else 'class'
+                    entries.append(IndexEntry(kind, match.group(2),
+                                              cell_index, line_index))
+                elif line.strip():
+                    entries.append(IndexEntry(
+                        'text', line.strip()[:MAX_TEXT_LENGTH],
+                        cell_index, line_index))
+        elif cell.get('cell_type') == 'markdown':
+            in_fence = False
+            for line_index, line in enumerate(lines):
+                if FENCE_REGEX.match(line):
+                    in_fence = not in_fence
+                    continue
+                match = HEADING_REGEX.match(line)
+                if not in_fence and match and match.group(2):
+                    entries.append(IndexEntry('heading', match.group(2),
+                                              cell_index, line_index))
+                elif (not in_fence and SETEXT_REGEX.match(line)
+                        and entries and entries[-1].kind == 'text'
+                        and entries[-1].cell == cell_index
+                        and entries[-1].line == line_index - 1):
+                    # The line before is the heading, not a text entry
+                    entries[-1] = IndexEntry(
+                        'heading', lines[line_index - 1].strip(),
+                        cell_index, line_index - 1)
+                elif line.strip():
+                    entries.append(IndexEntry(
+                        'text', line.strip()[:MAX_TEXT_LENGTH],
+                        cell_index, line_index))
+    return entries
+
+
+def index_file(filename):
+    """Read a notebook file and return its index entries."""
+    with open(filename, encoding='utf-8') as f:
+        return index_notebook(json.load(f))
+
+
+class NotebookIndex(QObject):
+    """
+    Index of the definitions, headings and text in a set of notebook files.
+
+    Files are indexed on a background thread. A file is only indexed again
+    when its modification time changes, so updating the index is cheap
+    when few files changed. Unsaved changes are not indexed.
+    """
+
+    sig_updated = Signal()
+    """This signal is emitted when the entries of a file are updated."""
+
+    _sig_indexed = Signal(str, float, object)
+
+    def __init__(self, parent=None):
+        """Constructor."""
+        super().__init__(parent)
+        self._filenames = set()
+        self._indexed = {}
+        self._pending = set()
+        self._executor = None
+        self._sig_indexed.connect(self._on_indexed)
+
+    def update(self, filenames):
+        """
+        Update the index to consist of the given files.
+
+        Files which are new or changed since they were indexed are indexed
+        in the background, and files not given are removed from the index.
+
+        Parameters
+        ----------
+        filenames : list of str
+            File names of the notebooks to index.
+        """
+        self._filenames = set(filenames)
+        for filename in list(self._indexed):
+            if filename not in self._filenames:
+                del self._indexed[filename]
+
+        for filename in self._filenames:
+            try:
+                mtime = osp.getmtime(filename)
+            except OSError:
+                self._indexed.pop(filename, None)
+                continue
+            indexed = self._indexed.get(filename)
+            if ((indexed is not None and indexed[0] == mtime)
+                    or (filename, mtime) in self._pending):
+                continue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            self._pending.add((filename, mtime))
+            future = self._executor.submit(index_file, filename)
+            # The callback runs in the thread of the executor, so it only
+            # emits a signal which is delivered in the GUI thread
+            future.add_done_callback(
+                functools.partial(self._on_done, filename, mtime))
+
+    def entries(self):
+        """
+        Return all entries in the index.
+
+        Returns
+        -------
+        list of (str, IndexEntry)
+            File name and entry, sorted by file name.
+        """
+        return [(filename, entry)
+                for filename, (_mtime, entries) in sorted(
+                    self._indexed.items())
+                for entry in entries]
+
+    def is_busy(self):
+        """Return whether any file is being indexed."""
+        return bool(self._pending)
+
+    def shutdown(self):
+        """Stop indexing files."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _on_done(self, filename, mtime, future):
+        entries = None
+        if not future.cancelled() and future.exception() is None:
+            entries = future.result()
+        self._sig_indexed.emit(filename, mtime, entries)
+
+    def _on_indexed(self, filename, mtime, entries):
+        self._pending.discard((filename, mtime))
+        if entries is None or filename not in self._filenames:
+            return
+        indexed = self._indexed.get(filename)
+        if indexed is None or indexed[0] <= mtime:
+            self._indexed[filename] = (mtime, entries)
+            self.sig_updated.emit()
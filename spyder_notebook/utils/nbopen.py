@@ -41,11 +41,24 @@ def find_best_server(filename):
         return None
 
 
-def nbopen(filename):
+def nbopen(filename, server_options=None):
     """
     Open a notebook using the best available server.
 
-    Returns information about the selected server.
+    Parameters
+    ----------
+    filename : str
+        File name of the notebook to open.
+    server_options : dict or None, optional
+        Configuration options for the server, if a new server needs to be
+        started. Keys are option names such as
+        'SpyderKernelManager.kernel_pool_size'. The default is None,
+        meaning that the default options are used.
+
+    Returns
+    -------
+    dict
+        Information about the selected server.
     """
     filename = osp.abspath(filename)
     home_dir = get_home_dir()
@@ -68,6 +81,9 @@ def nbopen(filename):
                    '--NotebookApp.password=',
                    "--KernelSpecManager.kernel_spec_class='{}'".format(
                            KERNELSPEC)]
+        if server_options:
+            command += ['--{}={}'.format(name, value)
+                        for name, value in sorted(server_options.items())]
 
         if os.name == 'nt':
             creation_flag = 0x08000000  # CREATE_NO_WINDOW
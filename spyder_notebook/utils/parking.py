@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Keep kernels of closed notebooks alive so they can be reused."""
+
+# Standard library imports
+from collections import OrderedDict, namedtuple
+import logging
+import time
+
+# Local imports
+from spyder_notebook.utils.kernels import get_kernel_memory
+
+
+logger = logging.getLogger(__name__)
+
+ParkedKernel = namedtuple('ParkedKernel', ['kernel_id', 'shutdown', 'since'])
+
+
+class KernelParking:
+    """
+    Kernels of closed notebooks, kept alive for a while.
+
+    A kernel is parked under the file name of its notebook. If the notebook
+    is reopened before the kernel is evicted, the kernel is unparked and
+    reused. Kernels are evicted, which means that they are shut down, when
+    they have been parked for longer than the time to live or, oldest
+    first, when the parked kernels use more memory than the budget.
+    """
+
+    def __init__(self, ttl, memory_budget, get_memory=get_kernel_memory,
+                 clock=time.monotonic):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        ttl : float
+            Time (in seconds) that kernels are kept parked.
+        memory_budget : int
+            Maximum memory (in bytes) used by all parked kernels together,
+            or 0 for no limit.
+        get_memory : callable, optional
+            Function returning the memory used by the kernel with a given
+            id, or None if not known. The default uses `get_kernel_memory`.
+        clock : callable, optional
+            Function returning the current time in seconds. The default is
+            `time.monotonic`.
+        """
+        self.ttl = ttl
+        self.memory_budget = memory_budget
+        self.get_memory = get_memory
+        self.clock = clock
+        self._parked = OrderedDict()
+
+    def __contains__(self, filename):
+        """Return whether a kernel is parked for the given file name."""
+        return filename in self._parked
+
+    def __len__(self):
+        """Return the number of parked kernels."""
+        return len(self._parked)
+
+    def park(self, filename, kernel_id, shutdown):
+        """
+        Park a kernel.
+
+        Parameters
+        ----------
+        filename : str
+            File name of the notebook of the kernel.
+        kernel_id : str
+            Id of the kernel.
+        shutdown : callable
+            Function without arguments which shuts down the kernel.
+        """
+        if filename in self._parked:
+            self.evict(filename)
+        self._parked[filename] = ParkedKernel(kernel_id, shutdown,
+                                              self.clock())
+        self.enforce_limits()
+
+    def unpark(self, filename):
+        """
+        Unpark the kernel for the given file name, without shutting it down.
+
+        Returns
+        -------
+        str or None
+            Id of the kernel, or None if no kernel is parked for the file.
+        """
+        parked = self._parked.pop(filename, None)
+        if parked is None:
+            return None
+        return parked.kernel_id
+
+    def evict(self, filename):
+        """Shut down the kernel parked for the given file name."""
+        parked = self._parked.pop(filename)
+        logger.debug('Evicting kernel %s of %s', parked.kernel_id, filename)
+        try:
+            parked.shutdown()
+        except Exception:
+            logger.exception('Failed to shut down kernel %s',
+                             parked.kernel_id)
+
+    def enforce_limits(self):
+        """Evict kernels which exceed the time to live or memory budget."""
+        now = self.clock()
+        for filename, parked in list(self._parked.items()):
+            if now - parked.since > self.ttl:
+                self.evict(filename)
+
+        if not self.memory_budget:
+            return
+        usage = {}
+        for filename, parked in self._parked.items():
+            usage[filename] = self.get_memory(parked.kernel_id) or 0
+        total = sum(usage.values())
+        while total > self.memory_budget and self._parked:
+            oldest = next(iter(self._parked))
+            total -= usage[oldest]
+            self.evict(oldest)
+
+    def clear(self):
+        """Evict all parked kernels."""
+        for filename in list(self._parked):
+            self.evict(filename)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Entries of the notebook tabs in the switcher."""
+
+# Standard library imports
+import os.path as osp
+
+# Spyder imports
+from spyder.utils.switcher import shorten_paths
+
+# File names longer than this are shortened in the switcher
+MAX_PATH_LENGTH = 75
+
+
+class SwitcherEntries:
+    """
+    Titles and descriptions of the notebook tabs in the switcher.
+
+    The entry of a tab is computed when the tab is added. Shortened paths
+    depend on all file names, so they are only computed again when the
+    switcher is populated after tabs were added or removed, and only if
+    any file name is long.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._filenames = {}
+        self._descriptions = {}
+        self._long_paths = 0
+        self._shortened = True
+
+    def __len__(self):
+        """Return the number of entries."""
+        return len(self._filenames)
+
+    def add(self, client, filename):
+        """
+        Add the entry of a tab.
+
+        Parameters
+        ----------
+        client : object
+            Client displayed in the tab.
+        filename : str
+            File name of the notebook of the client.
+        """
+        self.remove(client)
+        self._filenames[client] = filename
+        self._descriptions[client] = osp.dirname(filename)
+        if len(filename) > MAX_PATH_LENGTH:
+            self._long_paths += 1
+        if self._long_paths:
+            self._shortened = False
+
+    def remove(self, client):
+        """Remove the entry of a tab, if there is one."""
+        filename = self._filenames.pop(client, None)
+        self._descriptions.pop(client, None)
+        if filename is None:
+            return
+        if len(filename) > MAX_PATH_LENGTH:
+            self._long_paths -= 1
+        if self._long_paths:
+            self._shortened = False
+
+    def get_entries(self, clients):
+        """
+        Return the entries of the given tabs.
+
+        Parameters
+        ----------
+        clients : list of object
+            Clients displayed in the tabs, in the order of the tabs. Clients
+            without an entry are skipped.
+
+        Returns
+        -------
+        list of (object, str, str)
+            Client, title and description of every entry.
+        """
+        if not self._shortened:
+            self._shorten()
+        return [(client, osp.basename(self._filenames[client]),
+                 self._descriptions[client])
+                for client in clients if client in self._filenames]
+
+    def _shorten(self):
+        """Compute the descriptions of the entries with long file names."""
+        clients = list(self._filenames)
+        paths = [self._filenames[client] for client in clients]
+        short_paths = shorten_paths(paths, [False] * len(paths))
+        for client, path, short_path in zip(clients, paths, short_paths):
+            if len(path) > MAX_PATH_LENGTH:
+                self._descriptions[client] = short_path
+            else:
+                self._descriptions[client] = osp.dirname(path)
+        self._shortened = True
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for execute.py"""
+
+# Third-party library imports
+import nbformat
+
+# Local imports
+from spyder_notebook.utils.execute import (
+    execute_notebook, get_sweep_path, inject_parameters, INJECTED_TAG,
+    PARAMETERS_TAG)
+
+
+def test_inject_parameters_after_parameters_cell():
+    """Test that parameters are injected after the tagged cell."""
+    nb = nbformat.v4.new_notebook()
+    nb.cells = [nbformat.v4.new_code_cell('import os'),
+                nbformat.v4.new_code_cell(
+                    'n = 1', metadata={'tags': [PARAMETERS_TAG]}),
+                nbformat.v4.new_code_cell('print(n)')]
+
+    inject_parameters(nb, {'n': 3, 'name': 'ham'})
+
+    assert len(nb.cells) == 4
+    assert nb.cells[2].source == "n = 3\nname = 'ham'"
+    assert nb.cells[2].metadata['tags'] == [INJECTED_TAG]
+
+
+def test_inject_parameters_replaces_earlier_injection():
+    """Test that injecting twice leaves only the last injected cell."""
+    nb = nbformat.v4.new_notebook()
+    nb.cells = [nbformat.v4.new_code_cell('print(n)')]
+
+    inject_parameters(nb, {'n': 1})
+    inject_parameters(nb, {'n': 2})
+
+    assert [cell.source for cell in nb.cells] == ['n = 2', 'print(n)']
+
+
+def test_get_sweep_path():
+    """Test file names of runs in a parameter sweep."""
+    assert get_sweep_path('/tmp/report.ipynb', 2) == '/tmp/report-2.ipynb'
+
+
+def test_execute_notebook_uses_spyder_kernelspec(mocker, tmpdir):
+    """Test that notebooks are executed with kernels started from Spyder's
+    kernel spec."""
+    mock_preprocess = mocker.patch(
+        'nbconvert.preprocessors.ExecutePreprocessor.preprocess',
+        autospec=True)
+    filename = str(tmpdir.join('ham.ipynb'))
+    nbformat.write(nbformat.v4.new_notebook(), filename)
+
+    execute_notebook(filename)
+
+    preprocessor = mock_preprocess.call_args[0][0]
+    km = preprocessor.kernel_manager_class(kernel_name='python3')
+    kernel_spec_class = km.kernel_spec_manager.kernel_spec_class
+    assert kernel_spec_class.__name__ == 'SpyderKernelSpec'
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for export.py"""
+
+# Third-party library imports
+import nbformat
+
+# Local imports
+from spyder_notebook.utils.export import export_notebook, get_export_path
+
+
+def make_notebook(source):
+    return nbformat.v4.new_notebook(
+        cells=[nbformat.v4.new_code_cell(source)])
+
+
+def test_get_export_path():
+    """Test file names of exported notebooks."""
+    assert get_export_path('/tmp/report.ipynb', 'html') == '/tmp/report.html'
+    assert get_export_path('/tmp/report.ipynb', 'python') == '/tmp/report.py'
+
+
+def test_export_notebook_from_file(tmpdir):
+    """Test that a notebook file is exported to a script."""
+    filename = str(tmpdir.join('spam.ipynb'))
+    nbformat.write(make_notebook('print(42)'), filename)
+    output = str(tmpdir.join('spam.py'))
+
+    assert export_notebook(filename, output, 'python') == output
+    assert 'print(42)' in tmpdir.join('spam.py').read()
+
+
+def test_export_notebook_from_server(tmpdir, mocker):
+    """Test that the notebook as saved by the server is exported."""
+    response = mocker.Mock()
+    response.json.return_value = {'content': make_notebook('print(42)')}
+    mock_get = mocker.patch('requests.get', return_value=response)
+    filename = str(tmpdir.join('untitled0.ipynb'))
+    output = str(tmpdir.join('untitled0.html'))
+
+    export_notebook(filename, output, 'html', contents_url='url?token=t',
+                    timeout=10)
+
+    mock_get.assert_called_once_with('url?token=t', timeout=10)
+    assert 'print' in tmpdir.join('untitled0.html').read()
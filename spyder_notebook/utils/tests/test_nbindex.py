@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for nbindex.py"""
+
+# Standard library imports
+import json
+import os
+
+# Local imports
+from spyder_notebook.utils.nbindex import (
+    index_notebook, IndexEntry, MAX_TEXT_LENGTH, NotebookIndex)
+
+
+def make_notebook(*cells):
+    return {'cells': [{'cell_type': cell_type, 'source': source}
+                      for cell_type, source in cells]}
+
+
+def test_index_notebook_definitions():
+    """Test that functions and classes in code cells are indexed, and the
+    other lines as text."""
+    notebook = make_notebook(
+        ('code', '%matplotlib inline\ndef spam(x):\n\n    pass'),
+        ('code', ['class Ham:\n', '    async def eggs(self):\n']))
+
+    assert index_notebook(notebook) == [
+        IndexEntry('text', '%matplotlib inline', 0, 0),
+        IndexEntry('function', 'spam', 0, 1),
+        IndexEntry('text', 'pass', 0, 3),
+        IndexEntry('class', 'Ham', 1, 0),
+        IndexEntry('function', 'eggs', 1, 1)]
+
+
+def test_index_notebook_headings():
+    """Test that markdown headings outside code blocks are indexed, and the
+    other lines as text."""
+    notebook = make_notebook(
+        ('markdown', '# Title #\ntext\n```\n# comment\n```\n## Section'),
+        ('markdown', 'Setext title\n============\n'),
+        ('raw', '# Not a heading'))
+
+    assert index_notebook(notebook) == [
+        IndexEntry('heading', 'Title', 0, 0),
+        IndexEntry('text', 'text', 0, 1),
+        IndexEntry('text', '# comment', 0, 3),
+        IndexEntry('heading', 'Section', 0, 5),
+        IndexEntry('heading', 'Setext title', 1, 0)]
+
+
+def test_index_notebook_long_lines():
+    """Test that the text of long lines is cut off."""
+    notebook = make_notebook(('markdown', 'x' * 1000))
+
+    assert index_notebook(notebook) == [
+        IndexEntry('text', 'x' * MAX_TEXT_LENGTH, 0, 0)]
+
+
+def test_notebookindex_update(qtbot, tmpdir):
+    """Test that files are indexed again only when they change."""
+    path = tmpdir.join('spam.ipynb')
+    path.write(json.dumps(make_notebook(('code', 'def f():\n    pass'))))
+    filename = str(path)
+    index = NotebookIndex()
+
+    with qtbot.waitSignal(index.sig_updated):
+        index.update([filename])
+    assert index.entries() == [
+        (filename, IndexEntry('function', 'f', 0, 0)),
+        (filename, IndexEntry('text', 'pass', 0, 1))]
+
+    index.update([filename])
+    assert not index.is_busy()
+
+    path.write(json.dumps(make_notebook(('code', 'class C:\n    pass'))))
+    mtime = os.path.getmtime(filename)
+    os.utime(filename, (mtime + 10, mtime + 10))
+    with qtbot.waitSignal(index.sig_updated):
+        index.update([filename])
+    assert index.entries() == [
+        (filename, IndexEntry('class', 'C', 0, 0)),
+        (filename, IndexEntry('text', 'pass', 0, 1))]
+
+    index.update([])
+    assert index.entries() == []
+    index.shutdown()
@@ -7,7 +7,8 @@
 """Tests for nbopen.py"""
 
 # Local imports
-from spyder_notebook.utils.nbopen import nbopen
+from spyder_notebook.tests.fakeserver import FakeNotebookServer
+from spyder_notebook.utils.nbopen import find_best_server, nbopen
 
 
 def test_nbopen_with_no_running_servers(mocker, tmpdir):
@@ -33,3 +34,45 @@ def test_nbopen_with_no_running_servers(mocker, tmpdir):
     mock_register.assert_called_once()
     args, kwargs = mock_register.call_args
     assert args == (mock_shutdown, serverinfo)
+
+
+def test_nbopen_passes_server_options(mocker, tmpdir):
+    """Test that server options given to nbopen are passed on the command
+    line of the server that it starts."""
+    filename = str(tmpdir + 'ham.ipynb')
+    serverinfo = {'notebook_dir': str(tmpdir)}
+    mock_lrs = mocker.Mock(side_effect=[[], [serverinfo]])
+    mocker.patch(
+        'spyder_notebook.utils.nbopen.notebookapp',
+        list_running_servers=mock_lrs)
+    mock_Popen = mocker.patch('spyder_notebook.utils.nbopen.subprocess.Popen')
+    mocker.patch('spyder_notebook.utils.nbopen.atexit.register')
+
+    nbopen(filename, {'SpyderKernelManager.kernel_pool_size': 2})
+
+    command = mock_Popen.call_args[0][0]
+    assert '--SpyderKernelManager.kernel_pool_size=2' in command
+
+
+def test_nbopen_uses_running_server(mocker, monkeypatch, tmpdir):
+    """Test that nbopen uses the running server with the most specific
+    directory containing the notebook, without starting a server."""
+    runtime_dir = tmpdir.mkdir('runtime')
+    monkeypatch.setenv('JUPYTER_RUNTIME_DIR', str(runtime_dir))
+    notebook_dir = tmpdir.mkdir('notebooks')
+    filename = str(notebook_dir.join('ham.ipynb'))
+    mock_Popen = mocker.patch('spyder_notebook.utils.nbopen.subprocess.Popen')
+
+    with FakeNotebookServer(str(tmpdir)) as outer, \
+            FakeNotebookServer(str(notebook_dir)) as inner, \
+            FakeNotebookServer(str(tmpdir.mkdir('other'))) as other:
+        for server in (outer, inner, other):
+            server.register(str(runtime_dir))
+
+        assert nbopen(filename)['url'] == inner.url
+        inner.unregister()
+        assert nbopen(filename)['url'] == outer.url
+
+    mock_Popen.assert_not_called()
+    assert find_best_server(filename) is None
+    assert runtime_dir.listdir() == []
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for parking.py"""
+
+# Local imports
+from spyder_notebook.utils.parking import KernelParking
+
+
+class FakeClock:
+    """Clock which only moves when told to."""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_kernelparking_unpark(mocker):
+    """Test that an unparked kernel is not shut down."""
+    shutdown = mocker.Mock()
+    parking = KernelParking(ttl=60, memory_budget=0)
+    parking.park('ham.ipynb', '42', shutdown)
+
+    assert parking.unpark('ham.ipynb') == '42'
+    assert parking.unpark('ham.ipynb') is None
+    assert 'ham.ipynb' not in parking
+    shutdown.assert_not_called()
+
+
+def test_kernelparking_evicts_after_ttl(mocker):
+    """Test that kernels are shut down when their time to live expires."""
+    clock = FakeClock()
+    shutdown_ham = mocker.Mock()
+    shutdown_spam = mocker.Mock()
+    parking = KernelParking(ttl=60, memory_budget=0, clock=clock)
+    parking.park('ham.ipynb', '1', shutdown_ham)
+    clock.now = 30
+    parking.park('spam.ipynb', '2', shutdown_spam)
+
+    clock.now = 70
+    parking.enforce_limits()
+
+    shutdown_ham.assert_called_once_with()
+    shutdown_spam.assert_not_called()
+    assert 'ham.ipynb' not in parking
+    assert 'spam.ipynb' in parking
+
+
+def test_kernelparking_evicts_oldest_over_budget(mocker):
+    """Test that the oldest kernels are shut down when over budget."""
+    memory = {'1': 600, '2': 300, '3': 300}
+    shutdowns = [mocker.Mock() for i in range(3)]
+    parking = KernelParking(ttl=60, memory_budget=1000,
+                            get_memory=memory.get)
+    parking.park('a.ipynb', '1', shutdowns[0])
+    parking.park('b.ipynb', '2', shutdowns[1])
+    shutdowns[0].assert_not_called()
+
+    parking.park('c.ipynb', '3', shutdowns[2])
+
+    shutdowns[0].assert_called_once_with()
+    shutdowns[1].assert_not_called()
+    shutdowns[2].assert_not_called()
+    assert len(parking) == 2
+
+
+def test_kernelparking_park_same_file_twice(mocker):
+    """Test that parking a second kernel for a file evicts the first."""
+    shutdown_old = mocker.Mock()
+    parking = KernelParking(ttl=60, memory_budget=0)
+    parking.park('ham.ipynb', '1', shutdown_old)
+
+    parking.park('ham.ipynb', '2', mocker.Mock())
+
+    shutdown_old.assert_called_once_with()
+    assert parking.unpark('ham.ipynb') == '2'
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for switcherentries.py"""
+
+# Standard library imports
+import os.path as osp
+
+# Local imports
+from spyder_notebook.utils.switcherentries import (
+    MAX_PATH_LENGTH, SwitcherEntries)
+
+
+def test_switcherentries_order_and_remove():
+    """Test that entries follow the order of the tabs and can be removed."""
+    entries = SwitcherEntries()
+    spam, ham = object(), object()
+    entries.add(spam, osp.join('a', 'spam.ipynb'))
+    entries.add(ham, osp.join('b', 'ham.ipynb'))
+
+    assert entries.get_entries([ham, spam]) == [
+        (ham, 'ham.ipynb', 'b'), (spam, 'spam.ipynb', 'a')]
+
+    entries.remove(ham)
+    assert len(entries) == 1
+    assert entries.get_entries([ham, spam]) == [(spam, 'spam.ipynb', 'a')]
+
+
+def test_switcherentries_shortens_long_paths():
+    """Test that long file names are shortened and short ones are not."""
+    entries = SwitcherEntries()
+    short, long = object(), object()
+    directory = osp.join(*(['directory'] * (MAX_PATH_LENGTH // 9)))
+    entries.add(short, osp.join('a', 'spam.ipynb'))
+    entries.add(long, osp.join(directory, 'ham.ipynb'))
+
+    result = dict((client, description) for client, _title, description
+                  in entries.get_entries([short, long]))
+    assert result[short] == 'a'
+    assert result[long] != directory
+
+    entries.remove(long)
+    assert entries.get_entries([short]) == [(short, 'spam.ipynb', 'a')]
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Bridge between Python and the notebook frontend."""
+
+# Standard library imports
+import json
+import logging
+
+# Qt imports
+from qtpy.QtCore import QEventLoop, QObject, QTimer, Signal, Slot
+
+
+# Default time (in ms) to wait for the result of a synchronous call
+CALL_TIMEOUT = 5000
+
+logger = logging.getLogger(__name__)
+
+
+class BridgeError(Exception):
+    """Exception for calls into the frontend that fail or time out."""
+
+
+class NotebookBridge(QObject):
+    """
+    Object for calling functions in the notebook frontend.
+
+    This object is shared with the notebook frontend, through QWebChannel
+    in QtWebEngine or as a window object in QtWebKit. Calls are queued
+    until the frontend connects by calling `connected()`. They are sent in
+    batches, at most one per iteration of the Qt event loop. The frontend
+    executes the calls in order and reports their results in one batch by
+    calling `reply()`.
+    """
+
+    sig_calls = Signal(str)
+    """
+    This signal is emitted to send a batch of calls to the frontend.
+
+    Parameters
+    ----------
+    calls : str
+        JSON encoded list of calls. Every call is a dict with keys `id`,
+        `method` and `args`.
+    """
+
+    def __init__(self, parent=None):
+        """Constructor."""
+        super().__init__(parent)
+        self.is_connected = False
+        self._queue = []
+        self._handlers = {}
+        self._next_id = 0
+        self._flush_scheduled = False
+
+    def call(self, method, *args, callback=None, errback=None):
+        """
+        Call a method in the frontend.
+
+        Parameters
+        ----------
+        method : str
+            Name of the method, as registered in the frontend.
+        *args
+            Arguments of the method; they need to be JSON serializable.
+        callback : callable or None, optional
+            Function called with the result of the method. The default is
+            None, meaning that the result is ignored.
+        errback : callable or None, optional
+            Function called with an error message if the call fails. The
+            default is None, meaning that the error is logged.
+
+        Returns
+        -------
+        int
+            Identifier of the call.
+        """
+        call_id = self._next_id
+        self._next_id += 1
+        self._queue.append(dict(id=call_id, method=method, args=list(args)))
+        self._handlers[call_id] = (callback, errback)
+        self._schedule_flush()
+        return call_id
+
+    def call_sync(self, method, *args, timeout=CALL_TIMEOUT):
+        """
+        Call a method in the frontend and wait for its result.
+
+        The Qt event loop keeps running while waiting.
+
+        Parameters
+        ----------
+        method : str
+            Name of the method, as registered in the frontend.
+        *args
+            Arguments of the method; they need to be JSON serializable.
+        timeout : int, optional
+            Maximum time to wait, in milliseconds.
+
+        Returns
+        -------
+        object
+            Result of the method.
+
+        Raises
+        ------
+        BridgeError
+            If the method fails or if the result does not arrive in time.
+            A result that arrives later is ignored.
+        """
+        outcome = {}
+        loop = QEventLoop()
+
+        def callback(result):
+            outcome['result'] = result
+            loop.quit()
+
+        def errback(error):
+            outcome['error'] = error
+            loop.quit()
+
+        call_id = self.call(method, *args, callback=callback,
+                            errback=errback)
+        QTimer.singleShot(timeout, loop.quit)
+        loop.exec_()
+
+        if 'error' in outcome:
+            raise BridgeError(outcome['error'])
+        if 'result' not in outcome:
+            # Ignore a reply that arrives late
+            self._handlers.pop(call_id, None)
+            self._queue = [call for call in self._queue
+                           if call['id'] != call_id]
+            raise BridgeError('Call to {} timed out'.format(method))
+        return outcome['result']
+
+    def reset(self):
+        """
+        Forget the frontend, for instance because the page is reloaded.
+
+        Calls that were sent but have not been answered fail. Calls that
+        have not been sent yet wait for the next frontend to connect.
+        """
+        self.is_connected = False
+        queued_ids = set(call['id'] for call in self._queue)
+        for call_id in list(self._handlers):
+            if call_id not in queued_ids:
+                self._fail(call_id, 'Notebook page was reloaded')
+
+    @Slot()
+    def connected(self):
+        """Called by the frontend when it is ready to receive calls."""
+        self.is_connected = True
+        self._schedule_flush()
+
+    @Slot(str)
+    def reply(self, replies):
+        """
+        Called by the frontend with the results of a batch of calls.
+
+        Parameters
+        ----------
+        replies : str
+            JSON encoded list of replies. Every reply is a dict with key
+            `id`, and either key `result` or key `error`.
+        """
+        for reply in json.loads(replies):
+            call_id = reply['id']
+            if 'error' in reply:
+                self._fail(call_id, reply['error'])
+                continue
+            callback, _errback = self._handlers.pop(call_id, (None, None))
+            if callback is not None:
+                callback(reply.get('result'))
+
+    def _fail(self, call_id, error):
+        """Report that the call with the given id failed."""
+        _callback, errback = self._handlers.pop(call_id, (None, None))
+        if errback is not None:
+            errback(error)
+        else:
+            logger.warning('Call to notebook frontend failed: %s', error)
+
+    def _schedule_flush(self):
+        """Send queued calls in the next iteration of the event loop."""
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(0, self._flush)
+
+    def _flush(self):
+        """Send queued calls if the frontend is connected."""
+        self._flush_scheduled = False
+        if not self.is_connected or not self._queue:
+            return
+        calls, self._queue = self._queue, []
+        self.sig_calls.emit(json.dumps(calls))
@@ -5,6 +5,8 @@
 
 """Qt widgets for the notebook."""
 
+import functools
+import logging
 import os
 import os.path as osp
 import json
@@ -12,26 +14,23 @@ from string import Template
 import sys
 
 # Qt imports
-from qtpy.QtCore import QUrl, Qt
+from qtpy.QtCore import QFile, QIODevice, QTimer, QUrl, Qt, Signal
 from qtpy.QtGui import QFontMetrics, QFont
 from qtpy.QtWebEngineWidgets import (QWebEnginePage, QWebEngineSettings,
                                      WEBENGINE)
 from qtpy.QtWidgets import QMenu, QVBoxLayout, QWidget, QMessageBox
 
-# Notebook imports
-from notebook.utils import url_path_join, url_escape
-
-# Third-party imports
-import requests
-
 # Spyder imports
 from spyder.config.base import _, get_image_path, get_module_source_path
 from spyder.utils.qthelpers import add_actions
 from spyder.utils import sourcecode
-from spyder.widgets.findreplace import FindReplace
 
 # Local imports
+from spyder_notebook.widgets.bridge import BridgeError, NotebookBridge
 from spyder_notebook.widgets.dom import DOMWidget
+from spyder_notebook.widgets.search import NotebookFindReplace
+
+logger = logging.getLogger(__name__)
 
 # -----------------------------------------------------------------------------
 # Templates
@@ -43,11 +42,341 @@ PLUGINS_PATH = get_module_source_path('spyder', 'plugins')
 CSS_PATH = osp.join(PLUGINS_PATH, 'help', 'utils', 'static', 'css')
 TEMPLATES_PATH = osp.join(
         PLUGINS_PATH, 'ipythonconsole', 'assets', 'templates')
-open(osp.join(TEMPLATES_PATH, 'blank.html'))
 
-BLANK = open(osp.join(TEMPLATES_PATH, 'blank.html')).read()
-LOADING = open(osp.join(TEMPLATES_PATH, 'loading.html')).read()
-KERNEL_ERROR = open(osp.join(TEMPLATES_PATH, 'kernel_error.html')).read()
+# Time (in ms) to wait for the notebook frontend to save a notebook
+SAVE_TIMEOUT = 10000
+
+# Time (in ms) to wait for the notebook frontend to search a notebook
+SEARCH_TIMEOUT = 2000
+
+# Time (in seconds) to wait for the notebook server to respond to a request
+REQUEST_TIMEOUT = 10
+
+
+@functools.lru_cache(maxsize=None)
+def get_template(name):
+    """
+    Return contents of template with given file name.
+
+    Templates are only read when they are first needed and then cached,
+    so that importing this module does not touch the file system.
+    """
+    with open(osp.join(TEMPLATES_PATH, name)) as template_file:
+        return template_file.read()
+
+
+def get_webchannel_script():
+    """
+    Return script which defines QWebChannel in the pages of a QWebEngineView.
+
+    The script is run before any other script in the page, so that the
+    notebook frontend can use QWebChannel to connect to Spyder.
+    """
+    from qtpy.QtWebEngineWidgets import QWebEngineScript
+
+    qfile = QFile(':/qtwebchannel/qwebchannel.js')
+    qfile.open(QIODevice.ReadOnly)
+    source = bytes(qfile.readAll()).decode('utf-8')
+    qfile.close()
+
+    script = QWebEngineScript()
+    script.setName('qwebchannel')
+    script.setSourceCode(source)
+    script.setInjectionPoint(QWebEngineScript.DocumentCreation)
+    script.setWorldId(QWebEngineScript.MainWorld)
+    script.setRunsOnSubFrames(False)
+    return script
+
+
+def get_prewarm_url(server_info):
+    """
+    Return url of a notebook page that does not open any notebook yet.
+
+    Pages loaded from this url download and set up the notebook frontend,
+    and wait for `NotebookWidget.open_notebook()` to tell them which
+    notebook to open.
+    """
+    from notebook.utils import url_path_join
+
+    url = url_path_join(server_info['url'], 'notebook/')
+    return url + '?token={}'.format(server_info['token'])
+
+
+# -----------------------------------------------------------------------------
+# Server requests
+# -----------------------------------------------------------------------------
+def delete_kernel(server_url, token, kernel_id):
+    """
+    Ask notebook server to shut down a kernel.
+
+    Parameters
+    ----------
+    server_url : str
+        Url of the notebook server.
+    token : str
+        Token for authenticating with the notebook server.
+    kernel_id : str
+        Id of the kernel to shut down.
+
+    Returns
+    -------
+    bool
+        Whether the kernel was shut down successfully.
+    """
+    from notebook.utils import url_path_join
+    import requests
+
+    delete_url = url_path_join(server_url, 'api/kernels/', kernel_id)
+    delete_url += '?token={}'.format(token)
+    try:
+        delete_req = requests.delete(delete_url, timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException:
+        return False
+    return delete_req.status_code == 204
+
+
+def get_sessions(server_url, token):
+    """
+    Ask notebook server for its sessions.
+
+    Parameters
+    ----------
+    server_url : str
+        Url of the notebook server.
+    token : str
+        Token for authenticating with the notebook server.
+
+    Returns
+    -------
+    list of dict or None
+        Session models, or None if they could not be retrieved.
+    """
+    from notebook.utils import url_path_join
+    import requests
+
+    sessions_url = url_path_join(server_url, 'api/sessions')
+    sessions_url += '?token={}'.format(token)
+    try:
+        response = requests.get(sessions_url, timeout=REQUEST_TIMEOUT)
+        sessions = response.json()
+    except (requests.exceptions.RequestException, ValueError):
+        return None
+    if response.status_code != 200 or not isinstance(sessions, list):
+        return None
+    return sessions
+
+
+def create_session(server_url, token, path, kernel_id):
+    """
+    Ask notebook server to create a session using an existing kernel.
+
+    When the notebook is opened afterwards, the frontend finds the session
+    for its path and connects to the kernel, instead of starting a new one.
+
+    Parameters
+    ----------
+    server_url : str
+        Url of the notebook server.
+    token : str
+        Token for authenticating with the notebook server.
+    path : str
+        Path of the notebook, relative to the server directory.
+    kernel_id : str
+        Id of the kernel to use.
+
+    Returns
+    -------
+    bool
+        Whether the session was created successfully.
+    """
+    from notebook.utils import url_path_join
+    import requests
+
+    sessions_url = url_path_join(server_url, 'api/sessions')
+    sessions_url += '?token={}'.format(token)
+    model = {'path': path, 'name': osp.basename(path), 'type': 'notebook',
+             'kernel': {'id': kernel_id}}
+    try:
+        response = requests.post(sessions_url, json=model,
+                                 timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException:
+        return False
+    return response.status_code == 201
+
+
+def get_journal(server_url, token, path):
+    """
+    Ask notebook server for the unsaved changes journaled for a notebook.
+
+    Parameters
+    ----------
+    server_url : str
+        Url of the notebook server.
+    token : str
+        Token for authenticating with the notebook server.
+    path : str
+        Path of the notebook, relative to the server directory.
+
+    Returns
+    -------
+    dict or None
+        Notebook with the journaled changes applied, or None if there are
+        no changes to recover.
+    """
+    from notebook.utils import url_escape, url_path_join
+    import requests
+
+    journal_url = url_path_join(server_url, 'spyder/journal',
+                                url_escape(path))
+    journal_url += '?token={}'.format(token)
+    try:
+        response = requests.get(journal_url, timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException:
+        return None
+    if response.status_code != requests.codes.ok:
+        return None
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+def delete_journal(server_url, token, path):
+    """
+    Ask notebook server to discard the journal of a notebook.
+
+    Parameters
+    ----------
+    server_url : str
+        Url of the notebook server.
+    token : str
+        Token for authenticating with the notebook server.
+    path : str
+        Path of the notebook, relative to the server directory.
+
+    Returns
+    -------
+    bool
+        Whether the journal was discarded successfully.
+    """
+    from notebook.utils import url_escape, url_path_join
+    import requests
+
+    journal_url = url_path_join(server_url, 'spyder/journal',
+                                url_escape(path))
+    journal_url += '?token={}'.format(token)
+    try:
+        response = requests.delete(journal_url, timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException:
+        return False
+    return response.status_code == 204
+
+
+def get_notebook(server_url, token, path):
+    """
+    Ask notebook server for the contents of a notebook.
+
+    This also works for notebooks which the server keeps in memory.
+
+    Parameters
+    ----------
+    server_url : str
+        Url of the notebook server.
+    token : str
+        Token for authenticating with the notebook server.
+    path : str
+        Path of the notebook, relative to the server directory.
+
+    Returns
+    -------
+    dict or None
+        Notebook in nbformat 4, or None if it could not be read.
+    """
+    from notebook.utils import url_escape, url_path_join
+    import requests
+
+    contents_url = url_path_join(server_url, 'api/contents',
+                                 url_escape(path))
+    contents_url += '?token={}&type=notebook'.format(token)
+    try:
+        response = requests.get(contents_url, timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException:
+        return None
+    if response.status_code != requests.codes.ok:
+        return None
+    try:
+        return response.json()['content']
+    except (ValueError, KeyError):
+        return None
+
+
+def put_notebook(server_url, token, path, notebook):
+    """
+    Ask notebook server to create or overwrite a notebook.
+
+    The server decides whether to write the notebook to disk or to keep it
+    in memory.
+
+    Parameters
+    ----------
+    server_url : str
+        Url of the notebook server.
+    token : str
+        Token for authenticating with the notebook server.
+    path : str
+        Path of the notebook, relative to the server directory.
+    notebook : dict
+        Notebook in nbformat 4.
+
+    Returns
+    -------
+    bool
+        Whether the notebook was saved successfully.
+    """
+    from notebook.utils import url_escape, url_path_join
+    import requests
+
+    contents_url = url_path_join(server_url, 'api/contents',
+                                 url_escape(path))
+    contents_url += '?token={}'.format(token)
+    model = {'type': 'notebook', 'format': 'json', 'content': notebook}
+    try:
+        response = requests.put(contents_url, json=model,
+                                timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException:
+        return False
+    return response.status_code in (200, 201)
+
+
+def delete_notebook(server_url, token, path):
+    """
+    Ask notebook server to delete a notebook.
+
+    Parameters
+    ----------
+    server_url : str
+        Url of the notebook server.
+    token : str
+        Token for authenticating with the notebook server.
+    path : str
+        Path of the notebook, relative to the server directory.
+
+    Returns
+    -------
+    bool
+        Whether the notebook was deleted successfully.
+    """
+    from notebook.utils import url_escape, url_path_join
+    import requests
+
+    contents_url = url_path_join(server_url, 'api/contents',
+                                 url_escape(path))
+    contents_url += '?token={}'.format(token)
+    try:
+        response = requests.delete(contents_url, timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException:
+        return False
+    return response.status_code == 204
 
 
 # -----------------------------------------------------------------------------
@@ -56,6 +385,17 @@ KERNEL_ERROR = open(osp.join(TEMPLATES_PATH, 'kernel_error.html')).read()
 class NotebookWidget(DOMWidget):
     """WebView widget for notebooks."""
 
+    sig_search_finished = Signal(object)
+    """
+    This signal is emitted when the notebook frontend finished a search.
+
+    Parameters
+    ----------
+    result : dict
+        Number of matches in `count` and number of the current match in
+        `index`.
+    """
+
     def __init__(self, parent, actions=None):
         """
         Constructor.
@@ -71,6 +411,31 @@ class NotebookWidget(DOMWidget):
         """
         super().__init__(parent)
         self.actions = actions
+        self.prewarm_server_url = None
+        self.prewarm_ready = False
+        self._search_result = None
+        self._search_pending = None
+        self._search_number = 0
+        self._search_in_flight = False
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_TIMEOUT)
+        self._search_timer.timeout.connect(
+            lambda: self._on_search_failed(self._search_number, 'timeout'))
+
+        # Share bridge with the notebook frontend
+        self.bridge = NotebookBridge(self)
+        if WEBENGINE:
+            from qtpy.QtWebChannel import QWebChannel
+            self.channel = QWebChannel(self.page())
+            self.channel.registerObject('spyder', self.bridge)
+            self.page().setWebChannel(self.channel)
+            self.page().scripts().insert(get_webchannel_script())
+        else:
+            self.dom.javaScriptWindowObjectCleared.connect(
+                lambda: self.dom.addToJavaScriptWindowObject(
+                    'spyder', self.bridge))
+        self.loadStarted.connect(self.bridge.reset)
 
     def contextMenuEvent(self, event):
         """
@@ -110,7 +475,7 @@ class NotebookWidget(DOMWidget):
 
     def show_blank(self):
         """Show a blank page."""
-        self.setHtml(BLANK)
+        self.setHtml(get_template('blank.html'))
 
     def show_kernel_error(self, error):
         """Show kernel initialization errors."""
@@ -123,7 +488,8 @@ class NotebookWidget(DOMWidget):
         error = error.replace('-', '&#8209')
 
         message = _("An error occurred while starting the kernel")
-        kernel_error_template = Template(KERNEL_ERROR)
+        kernel_error_template = Template(
+            get_template('kernel_error.html'))
         page = kernel_error_template.substitute(css_path=CSS_PATH,
                                                 message=message,
                                                 error=error)
@@ -131,7 +497,7 @@ class NotebookWidget(DOMWidget):
 
     def show_loading_page(self):
         """Show a loading animation while the kernel is starting."""
-        loading_template = Template(LOADING)
+        loading_template = Template(get_template('loading.html'))
         loading_img = get_image_path('loading_sprites.png')
         if os.name == 'nt':
             loading_img = loading_img.replace('\\', '/')
@@ -145,6 +511,169 @@ class NotebookWidget(DOMWidget):
         """Show a message page with the given .html file."""
         self.setHtml(page)
 
+    def prewarm(self, server_info):
+        """
+        Load the notebook frontend without opening a notebook.
+
+        The attribute `prewarm_ready` is set to True when the page has
+        finished loading, after which `open_notebook()` can be called.
+
+        Parameters
+        ----------
+        server_info : dict
+            Information about the notebook server to load the page from.
+        """
+        self.prewarm_server_url = server_info['url']
+        self.prewarm_ready = False
+        self.loadFinished.connect(self._on_prewarm_finished)
+        self.load(QUrl(get_prewarm_url(server_info)))
+
+    def _on_prewarm_finished(self, ok):
+        """Record that a page loaded by `prewarm()` is ready for use."""
+        self.loadFinished.disconnect(self._on_prewarm_finished)
+        self.prewarm_ready = ok
+
+    def open_notebook(self, path):
+        """
+        Open notebook in a page loaded by `prewarm()`.
+
+        Parameters
+        ----------
+        path : str
+            Path of the notebook, relative to the server directory.
+        """
+        self.prewarm_ready = False
+        self.bridge.call('open', path)
+
+    def find_text(self, text, changed=True, forward=True, case=False,
+                  word=False, regexp=False):
+        """
+        Find text in the cells of the notebook and go to the match.
+
+        This overrides WebView.find_text() so that the notebook frontend
+        searches the sources and outputs of all cells, including cells
+        that are not rendered, instead of the text shown in the page.
+
+        The search runs asynchronously and `sig_search_finished` is emitted
+        with its result. While a search is running, only the last search
+        requested meanwhile is kept and run after it, so that typing in
+        the find widget does not pile up searches.
+
+        Returns
+        -------
+        bool or None
+            Whether the text was found, or None if the frontend searches
+            and the result is not known yet.
+        """
+        skipped, self._search_pending = self._search_pending, None
+        if not self.bridge.is_connected or not text:
+            self._cancel_search()
+            if not text:
+                return False
+            return super().find_text(text, changed, forward, case=case,
+                                     word=word, regexp=regexp)
+        options = {'caseSensitive': case, 'wholeWord': word,
+                   'regexp': regexp}
+        if skipped is not None:
+            # The frontend has to start over if the skipped search did
+            changed = changed or skipped[3]
+        self._search_pending = (text, options, forward, changed)
+        if not self._search_in_flight:
+            self._send_search()
+        return None
+
+    def searches_asynchronously(self):
+        """Return whether the notebook frontend searches for text."""
+        return self.bridge.is_connected
+
+    def _send_search(self):
+        text, options, forward, changed = self._search_pending
+        self._search_pending = None
+        self._search_number += 1
+        self._search_in_flight = True
+        self._search_timer.start()
+        self.bridge.call(
+            'find', text, options, forward, changed,
+            callback=functools.partial(self._on_search_finished,
+                                       self._search_number),
+            errback=functools.partial(self._on_search_failed,
+                                      self._search_number))
+
+    def _cancel_search(self):
+        # The reply to a running search is ignored once it arrives
+        self._search_number += 1
+        self._search_in_flight = False
+        self._search_timer.stop()
+        self._search_result = None
+
+    def _on_search_finished(self, number, result):
+        # Replies to searches which were cancelled or timed out are ignored
+        if number != self._search_number or not self._search_in_flight:
+            return
+        self._search_timer.stop()
+        self._search_in_flight = False
+        self._search_result = result
+        if self._search_pending is not None:
+            self._send_search()
+        else:
+            self.sig_search_finished.emit(result)
+
+    def _on_search_failed(self, number, error):
+        if number == self._search_number and self._search_in_flight:
+            logger.debug('Cannot search notebook: %s', error)
+            self._on_search_finished(number, {'count': 0, 'index': 0})
+
+    def get_number_matches(self, pattern, source_text='', case=False,
+                           regexp=False, word=False):
+        """Return the number of matches found by the last search."""
+        if self._search_result is None:
+            return super().get_number_matches(
+                pattern, source_text=source_text, case=case, regexp=regexp,
+                word=word)
+        return self._search_result['count']
+
+    def get_match_number(self, pattern, case=False, regexp=False,
+                         word=False):
+        """Return the number of the match found by the last search."""
+        if self._search_result is None:
+            return 0
+        return self._search_result['index']
+
+    def replace_text(self, text, replacement, case=False, word=False,
+                     regexp=False, replace_all=False):
+        """
+        Replace text in the sources of the cells of the notebook.
+
+        Parameters
+        ----------
+        text : str
+            Text to search for.
+        replacement : str
+            Replacement, in the syntax of JavaScript's `String.replace()`.
+        case, word, regexp : bool, optional
+            Whether to match case, match whole words only and search for
+            a regular expression. The default is False.
+        replace_all : bool, optional
+            Whether to replace all matches instead of the current one and
+            go to the next. The default is False.
+
+        Returns
+        -------
+        dict or None
+            Number of matches left in `count` and number of the current
+            match in `index`, or None if the frontend could not replace.
+        """
+        options = {'caseSensitive': case, 'wholeWord': word,
+                   'regexp': regexp}
+        try:
+            self._search_result = self.bridge.call_sync(
+                'replace', text, replacement, options, replace_all,
+                timeout=SEARCH_TIMEOUT)
+        except BridgeError as error:
+            logger.debug('Cannot replace in notebook: %s', error)
+            return None
+        return self._search_result
+
 
 class NotebookClient(QWidget):
     """
@@ -154,7 +683,8 @@ class NotebookClient(QWidget):
     render notebooks.
     """
 
-    def __init__(self, parent, filename, actions=None, ini_message=None):
+    def __init__(self, parent, filename, actions=None, ini_message=None,
+                 notebookwidget=None):
         """
         Constructor.
 
@@ -171,6 +701,10 @@ class NotebookClient(QWidget):
         ini_message : str or None, optional
             HTML to be initially displayed in the widget. The default is
             None, meaning that an empty page is displayed initially.
+        notebookwidget : NotebookWidget or None, optional
+            Widget loaded with `NotebookWidget.prewarm()` to be used for
+            displaying the notebook. The default is None, meaning that a
+            new widget is created.
         """
         super().__init__(parent)
 
@@ -182,13 +716,19 @@ class NotebookClient(QWidget):
         self.server_url = None
         self.path = None
 
-        self.notebookwidget = NotebookWidget(self, actions)
-        if ini_message:
-            self.notebookwidget.show_message(ini_message)
+        if notebookwidget is None:
+            self.notebookwidget = NotebookWidget(self, actions)
+            if ini_message:
+                self.notebookwidget.show_message(ini_message)
+            else:
+                self.notebookwidget.show_blank()
         else:
-            self.notebookwidget.show_blank()
+            notebookwidget.setParent(self)
+            notebookwidget.actions = actions
+            notebookwidget.show()
+            self.notebookwidget = notebookwidget
 
-        self.find_widget = FindReplace(self)
+        self.find_widget = NotebookFindReplace(self)
         self.find_widget.set_editor(self.notebookwidget)
         self.find_widget.hide()
 
@@ -205,6 +745,8 @@ class NotebookClient(QWidget):
 
     def register(self, server_info):
         """Register attributes that can be computed with the server info."""
+        from notebook.utils import url_path_join, url_escape
+
         # Path relative to the server directory
         self.path = os.path.relpath(self.filename,
                                     start=server_info['notebook_dir'])
@@ -234,8 +776,16 @@ class NotebookClient(QWidget):
         self.notebookwidget.load(url)
 
     def load_notebook(self):
-        """Load the associated notebook."""
-        self.go_to(self.file_url)
+        """
+        Load the associated notebook.
+
+        If the notebook widget has been prewarmed, then only tell it which
+        notebook to open, instead of loading the page from scratch.
+        """
+        if self.notebookwidget.prewarm_ready:
+            self.notebookwidget.open_notebook(self.path)
+        else:
+            self.go_to(self.file_url)
 
     def get_filename(self):
         """Get notebook's filename."""
@@ -249,23 +799,91 @@ class NotebookClient(QWidget):
             sname = fm.elidedText(sname, Qt.ElideRight, 110)
         return sname
 
-    def save(self):
+    def save(self, wait=False):
         """
         Save current notebook.
 
-        This function saves the current notebook by simulating a click on the
-        Save button in the notebook. The Save button is found by selecting the
-        first element of class `jp-ToolbarButtonComponent` whose `title`
-        attribute begins with the string "Save".
+        This function asks the notebook frontend to save the notebook. If
+        the frontend is not connected, for instance because the page failed
+        to load or is still loading, it clicks the Save button instead of
+        waiting for the frontend.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            Whether to wait until the notebook is saved. The default is
+            False, meaning that the function returns immediately.
+
+        Returns
+        -------
+        bool
+            If `wait` is True, whether the notebook was saved successfully.
+            Otherwise, always True.
+        """
+        if not wait:
+            self.notebookwidget.bridge.call('save')
+            return True
+        if not self.notebookwidget.bridge.is_connected:
+            self.notebookwidget.mousedown(
+                '.jp-ToolbarButtonComponent[title^="Save"]')
+            return False
+        try:
+            self.notebookwidget.bridge.call_sync(
+                'save', timeout=SAVE_TIMEOUT)
+        except BridgeError as error:
+            logger.warning('Could not save %s: %s', self.filename, error)
+            return False
+        return True
+
+    def get_state(self):
+        """
+        Get the state of the notebook from the notebook frontend.
+
+        Returns
+        -------
+        dict or None
+            Dict with keys `path`, `ready`, `dirty`, `cellCount`,
+            `activeCellIndex`, `kernelId` and `kernelStatus`, or None if
+            the frontend did not respond.
+        """
+        try:
+            return self.notebookwidget.bridge.call_sync('getState')
+        except BridgeError:
+            return None
+
+    def get_cell_profiles(self):
+        """
+        Get the measurements of the profiled cells from the frontend.
+
+        Returns
+        -------
+        list of dict or None
+            For every cell with a profile, a dict with keys `index`,
+            `source` (the first line of the cell), `wall`, `cpu` and
+            `memory`, or None if the frontend did not respond.
+        """
+        try:
+            return self.notebookwidget.bridge.call_sync('getCellProfiles')
+        except BridgeError:
+            return None
 
-        NB: I am not sure whether the save is performed before the function
-        returns.
+    def go_to_cell(self, index, line=None):
         """
-        self.notebookwidget.mousedown(
-            '.jp-ToolbarButtonComponent[title^="Save"]')
+        Make a cell the active cell and scroll to it.
+
+        Parameters
+        ----------
+        index : int
+            Index of the cell, starting at 0.
+        line : int or None, optional
+            Line in the cell to put the cursor on, starting at 0. The
+            default is None, meaning that the cursor is not moved.
+        """
+        self.notebookwidget.bridge.call('goToCell', index, line)
 
     def get_session_url(self):
         """Get the kernel sessions url of the client."""
+        from notebook.utils import url_path_join
         return self.add_token(url_path_join(self.server_url, 'api/sessions'))
 
     def get_kernel_id(self):
@@ -275,9 +893,12 @@ class NotebookClient(QWidget):
         Return a str with the kernel id or None. On error, display a dialog
         box and return None.
         """
+        import requests
+
         sessions_url = self.get_session_url()
         try:
-            sessions_response = requests.get(sessions_url)
+            sessions_response = requests.get(sessions_url,
+                                             timeout=REQUEST_TIMEOUT)
         except requests.exceptions.RequestException as exception:
             msg = _('Spyder could not get a list of sessions '
                     'from the Jupyter Notebook server. '
@@ -285,11 +906,17 @@ class NotebookClient(QWidget):
             QMessageBox.warning(self, _('Server error'), msg)
             return None
 
-        sessions = json.loads(sessions_response.content.decode())
-        if sessions_response.status_code != requests.codes.ok:
+        try:
+            sessions = json.loads(sessions_response.content.decode())
+        except ValueError:
+            sessions = None
+        if (sessions_response.status_code != requests.codes.ok
+                or not isinstance(sessions, list)):
+            message = (sessions.get('message')
+                       if isinstance(sessions, dict) else None)
             msg = _('Spyder could not get a list of sessions '
                     'from the Jupyter Notebook server. '
-                    'Message: {}').format(sessions.get('message'))
+                    'Message: {}').format(message)
             QMessageBox.warning(self, _('Server error'), msg)
             return None
 
@@ -309,11 +936,7 @@ class NotebookClient(QWidget):
         kernel_id = self.get_kernel_id()
 
         if kernel_id:
-            delete_url = self.add_token(url_path_join(self.server_url,
-                                                      'api/kernels/',
-                                                      kernel_id))
-            delete_req = requests.delete(delete_url)
-            if delete_req.status_code != 204:
+            if not delete_kernel(self.server_url, self.token, kernel_id):
                 QMessageBox.warning(
                     self,
                     _("Server error"),
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Dialog ranking the cells of notebooks by the time they took to run."""
+
+# Standard library imports
+import os.path as osp
+
+# Qt imports
+from qtpy.QtCore import Qt
+from qtpy.QtWidgets import (QDialog, QDialogButtonBox, QHeaderView, QLabel,
+                            QTableWidget, QTableWidgetItem, QVBoxLayout)
+
+# Spyder imports
+from spyder.config.base import _
+
+
+COLUMNS = [_('Notebook'), _('Cell'), _('Source'), _('Wall time'),
+           _('CPU time'), _('Memory')]
+
+
+def rank_cells(profiles):
+    """
+    Rank profiled cells by wall time, slowest first.
+
+    Parameters
+    ----------
+    profiles : dict of (str, list of dict)
+        Profiles of the cells in every notebook, by file name of the
+        notebook, as returned by `NotebookClient.get_cell_profiles()`.
+
+    Returns
+    -------
+    list of (str, dict)
+        File name of the notebook and profile of every cell, slowest first.
+    """
+    cells = [(name, profile) for name, notebook in profiles.items()
+             for profile in notebook]
+    return sorted(cells, key=lambda cell: cell[1]['wall'], reverse=True)
+
+
+def format_seconds(seconds):
+    """Format a duration for display, or the empty string if unknown."""
+    if seconds is None:
+        return ''
+    if seconds < 1:
+        return '{:.0f} ms'.format(seconds * 1000)
+    return '{:.2f} s'.format(seconds)
+
+
+def format_bytes(size):
+    """Format an increase in memory for display, or the empty string."""
+    if size is None:
+        return ''
+    return '{:+.1f} MiB'.format(size / 1024 ** 2)
+
+
+class HotCellsDialog(QDialog):
+    """Dialog showing the cells that took longest to run."""
+
+    def __init__(self, parent, profiles):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        parent : QWidget
+            Parent of the dialog.
+        profiles : dict of (str, list of dict)
+            Profiles of the cells in every notebook, by file name of the
+            notebook.
+        """
+        super().__init__(parent)
+        self.setWindowTitle(_('Hot cells'))
+        self.cells = rank_cells(profiles)
+
+        self.table = QTableWidget(len(self.cells), len(COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.verticalHeader().hide()
+        for row, (name, profile) in enumerate(self.cells):
+            values = [osp.basename(name), str(profile['index'] + 1),
+                      profile['source'],
+                      format_seconds(profile['wall']),
+                      format_seconds(profile['cpu']),
+                      format_bytes(profile['memory'])]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column in (1, 3, 4, 5):
+                    item.setTextAlignment(
+                        int(Qt.AlignRight | Qt.AlignVCenter))
+                self.table.setItem(row, column, item)
+        self.table.horizontalHeader().setSectionResizeMode(
+            2, QHeaderView.Stretch)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close, parent=self)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        if not self.cells:
+            layout.addWidget(QLabel(_('No cells have been profiled yet.')))
+        layout.addWidget(self.table)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+        self.resize(700, 400)
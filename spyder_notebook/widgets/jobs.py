@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Run jobs on a pool of worker processes."""
+
+# Standard library imports
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import functools
+import multiprocessing
+import os
+import threading
+
+# Qt imports
+from qtpy.QtCore import QObject, Signal
+
+
+class SpawnPoolExecutor:
+    """
+    Executor running jobs on a pool of spawned worker processes.
+
+    This is only used on Python < 3.7, where ProcessPoolExecutor always
+    forks its workers. Jobs are handed to the pool only when a worker is
+    free, so that jobs which are cancelled while waiting never run.
+    """
+
+    def __init__(self, max_workers, context):
+        """Constructor."""
+        self.max_workers = max_workers
+        self._pool = context.Pool(max_workers)
+        self._pending = deque()
+        self._running = 0
+        self._lock = threading.Lock()
+
+    def submit(self, function, *args, **kwargs):
+        """Schedule a function to run and return a future for its result."""
+        future = Future()
+        with self._lock:
+            self._pending.append((future, function, args, kwargs))
+            self._start_jobs()
+        return future
+
+    def shutdown(self, wait=True):
+        """Stop the workers once the jobs that were started finished."""
+        with self._lock:
+            self._pending.clear()
+        self._pool.close()
+        if wait:
+            self._pool.join()
+
+    def _start_jobs(self):
+        """Hand waiting jobs to the pool while there are free workers."""
+        while self._pending and self._running < self.max_workers:
+            future, function, args, kwargs = self._pending.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            self._running += 1
+            self._pool.apply_async(
+                function, args, kwargs,
+                callback=functools.partial(self._finish, future, 'result'),
+                error_callback=functools.partial(
+                    self._finish, future, 'exception'))
+
+    def _finish(self, future, outcome, value):
+        """Resolve the future of a finished job and start the next ones."""
+        # This runs in a thread of the pool
+        with self._lock:
+            self._running -= 1
+            self._start_jobs()
+        if outcome == 'result':
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+
+
+class BackgroundJobs(QObject):
+    """
+    Pool of worker processes running jobs in the background.
+
+    Jobs are functions that are run in a worker process. The pool is
+    created when the first job is submitted, with one worker per core by
+    default. Signals report the progress of the jobs in the GUI thread.
+
+    Several kinds of jobs can share one pool, so that they do not use more
+    workers together than one of them may: every kind has its own
+    `BackgroundJobs`, which reports on its jobs only, and all but the first
+    are created with `share_with` set to the first one.
+    """
+
+    sig_job_finished = Signal(str, object, str)
+    """
+    This signal is emitted when a job finishes.
+
+    Parameters
+    ----------
+    name : str
+        Name of the job, as given to `submit()`.
+    result : object
+        Return value of the job, or None if the job failed.
+    error : str
+        Error message if the job failed, or the empty string if the job
+        succeeded.
+    """
+
+    sig_progress = Signal(int, int)
+    """
+    This signal is emitted when a job is submitted or finishes.
+
+    Parameters
+    ----------
+    done : int
+        Number of jobs that finished since the pool was last idle.
+    total : int
+        Number of jobs submitted since the pool was last idle.
+    """
+
+    sig_all_finished = Signal(dict)
+    """
+    This signal is emitted when all submitted jobs have finished.
+
+    Parameters
+    ----------
+    errors : dict of (str, str)
+        Error messages of the jobs that failed, by name of the job.
+    """
+
+    _sig_done = Signal(str, object)
+
+    def __init__(self, parent=None, max_workers=None, share_with=None):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        parent : QObject or None, optional
+            Parent of the object under construction.
+        max_workers : int or None, optional
+            Number of worker processes. The default is None, meaning that
+            there is one worker per core. This is ignored if `share_with` is
+            given.
+        share_with : BackgroundJobs or None, optional
+            Jobs whose worker processes are used to run the jobs submitted
+            to this object. The default is None, meaning that this object
+            has its own pool.
+        """
+        super().__init__(parent)
+        self.share_with = share_with
+        if share_with is not None:
+            max_workers = share_with.max_workers
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.done = 0
+        self.total = 0
+        self.errors = {}
+        self._executor = None
+        self._futures = set()
+        self._sig_done.connect(self._on_done)
+
+    def submit(self, name, function, *args, **kwargs):
+        """
+        Run a job in a worker process.
+
+        Parameters
+        ----------
+        name : str
+            Name of the job, used when reporting on it.
+        function : callable
+            Function to run. It and its arguments need to be picklable.
+        *args, **kwargs
+            Arguments to pass to the function.
+        """
+        future = self._get_executor().submit(function, *args, **kwargs)
+        self._futures.add(future)
+        self.total += 1
+        self.sig_progress.emit(self.done, self.total)
+        # The callback runs in a thread of the executor, so it only emits
+        # a signal which is delivered in the GUI thread
+        future.add_done_callback(functools.partial(self._sig_done.emit, name))
+
+    def is_busy(self):
+        """Return whether any submitted job has not finished yet."""
+        return self.done < self.total
+
+    def shutdown(self):
+        """
+        Cancel jobs that did not start yet and stop the worker processes.
+
+        Jobs that are running are not interrupted, but the workers exit
+        when they finish. If the workers are shared with other jobs, only
+        the jobs submitted to this object are cancelled.
+        """
+        for future in list(self._futures):
+            future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _get_executor(self):
+        """Return pool of worker processes, creating it if necessary."""
+        if self.share_with is not None:
+            return self.share_with._get_executor()
+        if self._executor is None:
+            self._executor = self._create_executor()
+        return self._executor
+
+    def _create_executor(self):
+        """Create pool of worker processes."""
+        # Forking a process running Qt is not safe, so spawn workers
+        context = multiprocessing.get_context('spawn')
+        try:
+            return ProcessPoolExecutor(max_workers=self.max_workers,
+                                       mp_context=context)
+        except TypeError:  # Python < 3.7 does not support mp_context
+            return SpawnPoolExecutor(self.max_workers, context)
+
+    def _on_done(self, name, future):
+        """Report on a job that finished."""
+        self._futures.discard(future)
+        self.done += 1
+        if future.cancelled():
+            result, error = None, 'Cancelled'
+        elif future.exception() is not None:
+            result, error = None, str(future.exception()) or repr(
+                future.exception())
+            self.errors[name] = error
+        else:
+            result, error = future.result(), ''
+        self.sig_job_finished.emit(name, result, error)
+        self.sig_progress.emit(self.done, self.total)
+
+        if not self.is_busy():
+            errors = self.errors
+            self.done = self.total = 0
+            self.errors = {}
+            self.sig_all_finished.emit(errors)
@@ -6,6 +6,8 @@
 """File implementing NotebookTabWidget."""
 
 # Standard library imports
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import os
 import os.path as osp
 import subprocess
@@ -13,20 +15,19 @@ import sys
 
 # Qt imports
 from qtpy.compat import getopenfilenames, getsavefilename
-from qtpy.QtCore import QEventLoop, QTimer
+from qtpy.QtCore import QTimer, Signal
 from qtpy.QtWidgets import QMessageBox
 
-# Third-party imports
-import nbformat
-
 # Spyder imports
 from spyder.config.base import _
 from spyder.utils.programs import get_temp_dir
 from spyder.widgets.tabs import Tabs
 
 # Local imports
-from spyder_notebook.utils.nbopen import nbopen, NBServerError
-from spyder_notebook.widgets.client import NotebookClient
+from spyder_notebook.widgets.client import (
+    create_session, delete_journal, delete_kernel, delete_notebook,
+    get_journal, get_notebook, get_sessions, NotebookClient, NotebookWidget,
+    put_notebook)
 
 
 # Directory in which new notebooks are created
@@ -39,6 +40,49 @@ WELCOME = osp.join(PACKAGE_PATH, 'utils', 'templates', 'welcome.html')
 # Filter to use in file dialogs
 FILES_FILTER = '{} (*.ipynb)'.format(_('Jupyter notebooks'))
 
+# Delay (in ms) before loading prewarmed pages after opening a notebook, so
+# that they do not compete with the notebook being opened
+PREWARM_DELAY = 2000
+
+# Interval (in ms) between checks whether parked kernels should be evicted
+PARKING_CHECK_INTERVAL = 60000
+
+# Interval (in ms) between loading the placeholders of a restored session in
+# the background
+RESTORE_INTERVAL = 3000
+
+
+def open_placeholder(filename, server_options):
+    """
+    Find a server for a notebook and fetch its journal of unsaved changes.
+
+    This blocks until the server is up, so it is run in a thread when
+    placeholders are loaded in the background.
+
+    Parameters
+    ----------
+    filename : str
+        File name of the notebook.
+    server_options : dict
+        Configuration options for the server, as passed to `nbopen()`.
+
+    Returns
+    -------
+    server_info : dict
+        Information about the server, as returned by `nbopen()`.
+    journal : dict or None
+        Notebook with the journaled changes applied, or None if there are
+        no changes to recover.
+    """
+    from spyder_notebook.utils.nbopen import nbopen
+
+    server_info = nbopen(filename, server_options)
+    path = os.path.relpath(filename, start=server_info['notebook_dir'])
+    if os.name == 'nt':
+        path = path.replace('\\', '/')
+    journal = get_journal(server_info['url'], server_info['token'], path)
+    return server_info, journal
+
 
 class NotebookTabWidget(Tabs):
     """
@@ -50,10 +94,51 @@ class NotebookTabWidget(Tabs):
     ----------
     actions : list of (QAction or QMenu or None) or None
         Items to be added to the context menu.
+    parking : KernelParking or None
+        Where kernels of closed notebooks are parked, so that they can be
+        reused when the notebook is reopened. If None, kernels of closed
+        notebooks are shut down.
+    placeholders : set of NotebookClient
+        Clients in tabs restored by `restore_session()` whose notebook is
+        not loaded yet.
+    prewarm_count : int
+        Number of hidden notebook pages to keep loaded, so that new tabs can
+        be displayed without waiting for the notebook frontend to load.
+    prewarmed_widgets : list of NotebookWidget
+        Hidden notebook pages which are loaded but do not display a notebook.
+    restore_in_background : bool
+        Whether placeholders are loaded one by one in the background, with
+        the server started and the journal fetched in a thread. If False, a
+        placeholder is only loaded when its tab is selected.
+    server_options : dict
+        Configuration options for notebook servers started by this widget,
+        as passed to `nbopen()`.
     untitled_num : int
         Number used in file name of newly created notebooks.
     """
 
+    sig_client_added = Signal(object)
+    """
+    This signal is emitted when a tab is added.
+
+    Parameters
+    ----------
+    client : NotebookClient
+        Client displayed in the new tab.
+    """
+
+    sig_client_removed = Signal(object)
+    """
+    This signal is emitted when a tab is closed.
+
+    Parameters
+    ----------
+    client : NotebookClient
+        Client that was displayed in the tab.
+    """
+
+    _sig_placeholder_opened = Signal(object, object)
+
     def __init__(self, parent, actions, menu, corner_widgets):
         """
         Constructor.
@@ -74,6 +159,16 @@ class NotebookTabWidget(Tabs):
         super().__init__(parent, actions, menu, corner_widgets)
 
         self.actions = actions
+        self.parking = None
+        self.placeholders = set()
+        self.placeholder_executor = None
+        self._closing = set()
+        self.opening_placeholder = None
+        self.prewarm_count = 1
+        self.prewarm_server_info = None
+        self.prewarmed_widgets = []
+        self.restore_in_background = False
+        self.server_options = {}
         self.untitled_num = 0
 
         if not sys.platform == 'darwin':
@@ -84,6 +179,24 @@ class NotebookTabWidget(Tabs):
 
         self.set_close_function(self.close_client)
 
+        self.parking_timer = QTimer(self)
+        self.parking_timer.setInterval(PARKING_CHECK_INTERVAL)
+        self.parking_timer.timeout.connect(self.enforce_parking_limits)
+        self.parking_timer.start()
+
+        self.prewarm_timer = QTimer(self)
+        self.prewarm_timer.setSingleShot(True)
+        self.prewarm_timer.setInterval(PREWARM_DELAY)
+        self.prewarm_timer.timeout.connect(
+            lambda: self.prewarm_widgets(self.prewarm_server_info))
+
+        self.restore_timer = QTimer(self)
+        self.restore_timer.setInterval(RESTORE_INTERVAL)
+        self.restore_timer.timeout.connect(self.load_next_placeholder)
+        self._sig_placeholder_opened.connect(self._on_placeholder_opened)
+
+        self.currentChanged.connect(self._on_current_changed)
+
     def open_notebook(self, filenames=None):
         """
         Open a notebook from file.
@@ -101,10 +214,12 @@ class NotebookTabWidget(Tabs):
             for filename in filenames:
                 self.create_new_client(filename=filename)
 
-    def create_new_client(self, filename=None):
+    def create_new_client(self, filename=None, kernel_client=None):
         """
         Create a new notebook or load a pre-existing one.
 
+        A new notebook is created in `NOTEBOOK_TMPDIR` by the notebook
+        server, which may keep it in memory instead of writing it to disk.
         This function also creates and selects a welcome tab, if no tabs are
         present.
 
@@ -113,14 +228,21 @@ class NotebookTabWidget(Tabs):
         filename : str, optional
             File name of the notebook to load in the new client. The default
             is None, meaning that a new notebook should be created.
+        kernel_client : NotebookClient or None, optional
+            Client whose kernel the notebook should share. The default is
+            None, meaning that the notebook gets its own kernel.
 
         Returns
         -------
         filename : str or None
             File name of notebook that is opened, or None if unsuccessful.
         """
+        import nbformat
+        from spyder_notebook.utils.nbopen import nbopen, NBServerError
+
         # Generate the notebook name (in case of a new one)
-        if not filename:
+        is_new = not filename
+        if is_new:
             if not osp.isdir(NOTEBOOK_TMPDIR):
                 os.makedirs(NOTEBOOK_TMPDIR)
             nb_name = 'untitled' + str(self.untitled_num) + '.ipynb'
@@ -129,35 +251,355 @@ class NotebookTabWidget(Tabs):
                               name='python3')
             metadata = dict(kernelspec=kernelspec)
             nb_contents = nbformat.v4.new_notebook(metadata=metadata)
-            nbformat.write(nb_contents, filename)
             self.untitled_num += 1
 
         # Open the notebook with nbopen and get the url we need to render
         try:
-            server_info = nbopen(filename)
+            server_info = nbopen(filename, self.server_options)
         except (subprocess.CalledProcessError, NBServerError):
-            QMessageBox.critical(
-                self,
-                _("Server error"),
-                _("The Jupyter Notebook server failed to start or it is "
-                  "taking too much time to do it. Please start it in a "
-                  "system terminal with the command 'jupyter notebook' to "
-                  "check for errors."))
+            self.show_server_error()
             # Create a welcome widget
             # See issue 93
             self.untitled_num -= 1
             self.maybe_create_welcome_client()
             return
 
+        # The frontend reconnects to the kernel of a parked notebook
+        if self.parking is not None:
+            self.parking.unpark(filename)
+
         welcome_client = self.maybe_create_welcome_client()
-        client = NotebookClient(self, filename, self.actions)
+        notebookwidget = self.take_prewarmed_widget(server_info)
+        client = NotebookClient(self, filename, self.actions,
+                                notebookwidget=notebookwidget)
         self.add_tab(client)
         client.register(server_info)
+        if is_new:
+            if not put_notebook(client.server_url, client.token, client.path,
+                                nb_contents):
+                nbformat.write(nb_contents, filename)
+        else:
+            self.offer_recovery(client)
+        if kernel_client is not None:
+            self.share_kernel(kernel_client, client)
         client.load_notebook()
         if welcome_client:
             self.setCurrentIndex(0)
+        self.prewarm_server_info = server_info
+        self.prewarm_timer.start()
         return filename
 
+    def show_server_error(self):
+        """Tell the user that the notebook server could not be started."""
+        QMessageBox.critical(
+            self,
+            _("Server error"),
+            _("The Jupyter Notebook server failed to start or it is "
+              "taking too much time to do it. Please start it in a "
+              "system terminal with the command 'jupyter notebook' to "
+              "check for errors."))
+
+    def restore_session(self, filenames, current=0):
+        """
+        Open tabs for notebooks without loading them yet.
+
+        A placeholder tab is created for every notebook file that exists.
+        Only the notebook in the selected tab is loaded; the others are
+        loaded when their tab is selected or, if `restore_in_background` is
+        True, one by one in the background.
+
+        Parameters
+        ----------
+        filenames : list of str
+            File names of the notebooks to open.
+        current : int, optional
+            Index in `filenames` of the tab to select. The default is 0.
+
+        Returns
+        -------
+        int
+            Number of tabs that were opened.
+        """
+        clients = []
+        current_client = None
+        for number, filename in enumerate(filenames):
+            if not osp.isfile(filename):
+                continue
+            # Tabs become placeholders after they are added, so that adding
+            # them does not load them
+            client = NotebookClient(self, filename, self.actions)
+            self.addTab(client, client.get_short_name())
+            self.setTabToolTip(self.indexOf(client), filename)
+            self.sig_client_added.emit(client)
+            clients.append(client)
+            if number <= current or current_client is None:
+                current_client = client
+        if not clients:
+            return 0
+
+        self.placeholders.update(clients)
+        self.setCurrentWidget(current_client)
+        self.load_placeholder(current_client)
+        if self.restore_in_background:
+            self.restore_timer.start()
+        return len(clients)
+
+    def is_placeholder(self, client):
+        """Return whether the notebook of a client is not loaded yet."""
+        return client in self.placeholders
+
+    def load_placeholder(self, client):
+        """
+        Load the notebook of a placeholder tab.
+
+        Nothing is done if the client is not a placeholder. If the server
+        fails to start, the tab stays a placeholder, so that loading it is
+        tried again when the tab is selected.
+
+        Parameters
+        ----------
+        client : NotebookClient
+            Client whose notebook is to be loaded.
+        """
+        from spyder_notebook.utils.nbopen import nbopen, NBServerError
+
+        if not self.is_placeholder(client):
+            return
+        try:
+            server_info = nbopen(client.get_filename(), self.server_options)
+        except (subprocess.CalledProcessError, NBServerError):
+            self.restore_timer.stop()
+            self.show_server_error()
+            return
+        self.placeholders.discard(client)
+        if self.parking is not None:
+            self.parking.unpark(client.get_filename())
+        client.register(server_info)
+        self.offer_recovery(client)
+        client.load_notebook()
+
+    def load_next_placeholder(self):
+        """
+        Start loading the first placeholder in the background, if any.
+
+        The server is found or started and the journal is fetched in a
+        thread, so that the user can keep working in the meantime. Nothing
+        is done while the previous placeholder is still being opened.
+        """
+        if self.opening_placeholder is not None:
+            return
+        client = next((self.widget(index) for index in range(self.count())
+                       if self.is_placeholder(self.widget(index))), None)
+        if client is None:
+            self.restore_timer.stop()
+            return
+        if self.placeholder_executor is None:
+            self.placeholder_executor = ThreadPoolExecutor(max_workers=1)
+        self.opening_placeholder = client
+        future = self.placeholder_executor.submit(
+            open_placeholder, client.get_filename(), self.server_options)
+        # The callback runs in the thread of the executor, so it only emits
+        # a signal which is delivered in the GUI thread
+        future.add_done_callback(
+            lambda future: self._sig_placeholder_opened.emit(client, future))
+
+    def _on_placeholder_opened(self, client, future):
+        from spyder_notebook.utils.nbopen import NBServerError
+
+        self.opening_placeholder = None
+        # The tab may have been selected, and so loaded, or closed meanwhile
+        if future.cancelled() or not self.is_placeholder(client):
+            return
+        try:
+            server_info, journal = future.result()
+        except (subprocess.CalledProcessError, NBServerError):
+            self.restore_timer.stop()
+            self.show_server_error()
+            return
+        self.placeholders.discard(client)
+        if self.parking is not None:
+            self.parking.unpark(client.get_filename())
+        client.register(server_info)
+        if journal is not None:
+            self.recover_journal(client, journal)
+        client.load_notebook()
+
+    def shutdown(self):
+        """Stop loading placeholders in the background."""
+        self.restore_timer.stop()
+        if self.placeholder_executor is not None:
+            self.placeholder_executor.shutdown(wait=False)
+            self.placeholder_executor = None
+        self._closing = set()
+
+    def _on_current_changed(self, index):
+        """Load the notebook in the selected tab if it is a placeholder."""
+        client = self.widget(index)
+        if client is not None:
+            self.load_placeholder(client)
+
+    def offer_recovery(self, client):
+        """
+        Offer to recover unsaved changes to the notebook of a client.
+
+        If the notebook server has a journal of changes which were not
+        saved, ask the user whether to recover them. If so, the notebook
+        file is overwritten with the recovered notebook. The journal is
+        discarded in both cases. This needs to be called before the
+        notebook is loaded.
+
+        Parameters
+        ----------
+        client : NotebookClient
+            Client of the notebook.
+        """
+        notebook = get_journal(client.server_url, client.token, client.path)
+        if notebook is not None:
+            self.recover_journal(client, notebook)
+
+    def recover_journal(self, client, notebook):
+        """
+        Ask the user whether to recover the journaled changes to a notebook.
+
+        Parameters
+        ----------
+        client : NotebookClient
+            Client of the notebook.
+        notebook : dict
+            Notebook with the journaled changes applied.
+        """
+        import nbformat
+
+        answer = QMessageBox.question(
+            self, _('Recover notebook'),
+            _('<b>{}</b> has changes which were not saved. Do you want to '
+              'recover them?').format(client.get_short_name()),
+            QMessageBox.Yes | QMessageBox.No)
+        if answer == QMessageBox.Yes:
+            try:
+                nbformat.write(nbformat.from_dict(notebook),
+                               client.get_filename())
+            except (EnvironmentError, ValueError) as error:
+                QMessageBox.critical(
+                    self, _('Recover notebook'),
+                    _('The changes could not be recovered: {}')
+                    .format(error))
+                return
+        delete_journal(client.server_url, client.token, client.path)
+
+    def share_kernel(self, kernel_client, client):
+        """
+        Make a client use the kernel of another client.
+
+        This creates a session for the notebook of `client` on the server,
+        using the kernel of `kernel_client`, so it needs to be called before
+        the notebook is loaded. If this is not possible, the user is told
+        and the notebook will get its own kernel.
+
+        Parameters
+        ----------
+        kernel_client : NotebookClient
+            Client whose kernel is to be shared.
+        client : NotebookClient
+            Client which is to use the kernel.
+        """
+        if kernel_client.server_url != client.server_url:
+            QMessageBox.warning(
+                self, _('Kernel not shared'),
+                _('The notebook is served by a different server than '
+                  '<b>{}</b>, so it cannot use the same kernel.')
+                .format(kernel_client.get_short_name()))
+            return
+        kernel_id = kernel_client.get_kernel_id()
+        if not kernel_id or not create_session(
+                client.server_url, client.token, client.path, kernel_id):
+            QMessageBox.warning(
+                self, _('Kernel not shared'),
+                _('The kernel of <b>{}</b> could not be shared.')
+                .format(kernel_client.get_short_name()))
+
+    def is_kernel_shared(self, client):
+        """
+        Return whether another client uses the kernel of the given client.
+
+        The sessions of the server are retrieved once, and only sessions of
+        notebooks in other tabs count, since the sessions of notebooks that
+        were closed while sharing a kernel stay on the server. If the
+        sessions cannot be retrieved, the kernel is assumed to be shared,
+        so that it is not shut down under another notebook.
+
+        Parameters
+        ----------
+        client : NotebookClient
+            Client whose kernel is checked.
+        """
+        sessions = get_sessions(client.server_url, client.token)
+        if sessions is None:
+            return True
+        paths = {}
+        for index in range(self.count()):
+            other = self.widget(index)
+            if (other.get_filename() != WELCOME
+                    and not self.is_placeholder(other)
+                    and other.server_url == client.server_url):
+                paths[other.path.replace('\\', '/')] = other
+        kernel_ids = {}
+        for session in sessions:
+            path = session.get('notebook', {}).get('path')
+            kernel_id = session.get('kernel', {}).get('id')
+            if path in paths and kernel_id:
+                kernel_ids.setdefault(kernel_id, []).append(paths[path])
+        for users in kernel_ids.values():
+            if client in users:
+                return len(users) > 1
+        return False
+
+    def take_prewarmed_widget(self, server_info):
+        """
+        Take a prewarmed notebook page from the pool, if one is available.
+
+        Parameters
+        ----------
+        server_info : dict
+            Information about the server which is to serve the notebook.
+
+        Returns
+        -------
+        widget : NotebookWidget or None
+            A page that finished loading from the given server, or None if
+            there is no such page.
+        """
+        for widget in self.prewarmed_widgets:
+            if (widget.prewarm_ready
+                    and widget.prewarm_server_url == server_info['url']):
+                self.prewarmed_widgets.remove(widget)
+                return widget
+        return None
+
+    def prewarm_widgets(self, server_info):
+        """
+        Fill the pool of prewarmed notebook pages.
+
+        Pages loaded from other servers are discarded, and new hidden pages
+        are loaded from the given server until there are `prewarm_count`
+        of them.
+
+        Parameters
+        ----------
+        server_info : dict
+            Information about the server to load the pages from.
+        """
+        for widget in self.prewarmed_widgets[:]:
+            if widget.prewarm_server_url != server_info['url']:
+                self.prewarmed_widgets.remove(widget)
+                widget.deleteLater()
+
+        while len(self.prewarmed_widgets) < self.prewarm_count:
+            widget = NotebookWidget(self, self.actions)
+            widget.hide()
+            widget.prewarm(server_info)
+            self.prewarmed_widgets.append(widget)
+
     def maybe_create_welcome_client(self):
         """
         Create a welcome tab if there are no tabs.
@@ -178,10 +620,14 @@ class NotebookTabWidget(Tabs):
         """
         Close client tab with given index (or close current tab).
 
-        First save the notebook (unless this is the welcome client or
-        `save_before_close` is False). Then delete the notebook if it is in
-        `get_temp_dir()`. Then shutdown the kernel of the notebook and close
-        the tab. Finally, create a welcome tab if there are no tabs.
+        A placeholder tab is simply closed. Otherwise, first save the
+        notebook (unless this is the welcome client or `save_before_close`
+        is False), and discard the journal of unsaved changes to it. Then
+        delete the notebook if it is in `get_temp_dir()`. Then shutdown the
+        kernel of the notebook, or park it if kernel parking is enabled and
+        the notebook is not temporary, unless another notebook shares the
+        kernel, and close the tab. Finally, create a welcome tab if there
+        are no tabs.
 
         Parameters
         ----------
@@ -198,25 +644,76 @@ class NotebookTabWidget(Tabs):
             index = self.currentIndex()
         client = self.widget(index)
 
+        # Saving waits for the frontend, during which the user may try to
+        # close the tab again
+        if client in self._closing:
+            return
+        self._closing.add(client)
+        try:
+            self._close_client(client, save_before_close)
+        finally:
+            self._closing.discard(client)
+
+    def _close_client(self, client, save_before_close):
+        # The notebook of a placeholder is neither loaded nor running
+        if self.is_placeholder(client):
+            self.placeholders.discard(client)
+            client.close()
+            self.removeTab(self.indexOf(client))
+            self.sig_client_removed.emit(client)
+            self.maybe_create_welcome_client()
+            return
+
         is_welcome = client.get_filename() == WELCOME
         if save_before_close and not is_welcome:
             self.save_notebook(client)
-        if not is_welcome:
-            client.shutdown_kernel()
-        client.close()
-
-        # Delete notebook file if it is in temporary directory
         filename = client.get_filename()
-        if filename.startswith(get_temp_dir()):
-            try:
-                os.remove(filename)
-            except EnvironmentError:
-                pass
+        is_temporary = filename.startswith(get_temp_dir())
+        if not is_welcome and not self.is_kernel_shared(client):
+            if self.parking is not None and not is_temporary:
+                self.park_kernel(client)
+            else:
+                client.shutdown_kernel()
+        client.close()
+        if not is_welcome:
+            delete_journal(client.server_url, client.token, client.path)
+
+        # Delete notebook file if it is in temporary directory, or the
+        # notebook kept in memory by the server if there is no file
+        if is_temporary:
+            if osp.exists(filename):
+                try:
+                    os.remove(filename)
+                except EnvironmentError:
+                    pass
+            else:
+                delete_notebook(client.server_url, client.token, client.path)
 
         # Note: notebook index may have changed after closing related widgets
         self.removeTab(self.indexOf(client))
+        self.sig_client_removed.emit(client)
         self.maybe_create_welcome_client()
 
+    def park_kernel(self, client):
+        """
+        Park the kernel of the given client instead of shutting it down.
+
+        Parameters
+        ----------
+        client : NotebookClient
+            Client whose kernel is to be parked.
+        """
+        kernel_id = client.get_kernel_id()
+        if kernel_id:
+            shutdown = functools.partial(
+                delete_kernel, client.server_url, client.token, kernel_id)
+            self.parking.park(client.get_filename(), kernel_id, shutdown)
+
+    def enforce_parking_limits(self):
+        """Evict parked kernels that exceed their time or memory budget."""
+        if self.parking is not None:
+            self.parking.enforce_limits()
+
     def save_notebook(self, client):
         """
         Save notebook corresponding to given client.
@@ -229,7 +726,7 @@ class NotebookTabWidget(Tabs):
         client : NotebookClient
             Client of notebook to be saved.
         """
-        client.save()
+        client.save(wait=True)
 
         # Check filename to find out whether notebook is newly created
         path = client.get_filename()
@@ -237,12 +734,10 @@ class NotebookTabWidget(Tabs):
         if dirname != NOTEBOOK_TMPDIR or not basename.startswith('untitled'):
             return
 
-        # Read file to see whether notebook is empty
-        wait_save = QEventLoop()
-        QTimer.singleShot(1000, wait_save.quit)
-        wait_save.exec_()
-        nb_contents = nbformat.read(path, as_version=4)
-        if (len(nb_contents['cells']) == 0
+        # Ask server whether notebook is empty, because it may not be on disk
+        nb_contents = get_notebook(client.server_url, client.token,
+                                   client.path)
+        if (nb_contents is None or len(nb_contents['cells']) == 0
                 or len(nb_contents['cells'][0]['source']) == 0):
             return
 
@@ -261,10 +756,11 @@ class NotebookTabWidget(Tabs):
 
         First, save the notebook under the original file name. Then ask user
         for a new file name (if `name` is not set), and return if no new name
-        is given. Then, read the contents of the notebook that was just saved
-        and write them under the new file name. If `reopen_after_save` is
-        True, then close the original tab and open a new tab with the
-        notebook loaded from the new file name.
+        is given. Then, get the contents of the notebook that was just saved
+        from the server, since new notebooks may only be kept in memory
+        there, and write them under the new file name. If
+        `reopen_after_save` is True, then close the original tab and open a
+        new tab with the notebook loaded from the new file name.
 
         Parameters
         ----------
@@ -275,8 +771,10 @@ class NotebookTabWidget(Tabs):
             Whether to close the original tab and re-open it under the new
             file name after saving the notebook. The default is True.
         """
+        import nbformat
+
         current_client = self.currentWidget()
-        current_client.save()
+        current_client.save(wait=True)
         original_path = current_client.get_filename()
         if not name:
             original_name = osp.basename(original_path)
@@ -285,15 +783,15 @@ class NotebookTabWidget(Tabs):
         filename, _selfilter = getsavefilename(self, _("Save notebook"),
                                                original_name, FILES_FILTER)
         if filename:
-            try:
-                nb_contents = nbformat.read(original_path, as_version=4)
-            except EnvironmentError as error:
-                txt = (_("Error while reading {}<p>{}")
-                       .format(original_path, str(error)))
+            nb_contents = get_notebook(current_client.server_url,
+                                       current_client.token,
+                                       current_client.path)
+            if nb_contents is None:
+                txt = _("Error while reading {}").format(original_path)
                 QMessageBox.critical(self, _("File Error"), txt)
                 return
             try:
-                nbformat.write(nb_contents, filename)
+                nbformat.write(nbformat.from_dict(nb_contents), filename)
             except EnvironmentError as error:
                 txt = (_("Error while writing {}<p>{}")
                        .format(filename, str(error)))
@@ -315,3 +813,4 @@ class NotebookTabWidget(Tabs):
         index = self.addTab(widget, widget.get_short_name())
         self.setCurrentIndex(index)
         self.setTabToolTip(index, widget.get_filename())
+        self.sig_client_added.emit(widget)
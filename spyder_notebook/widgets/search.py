@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Find and replace widget for notebooks."""
+
+# Standard library imports
+import re
+
+# Qt imports
+from qtpy.QtCore import Slot
+
+# Spyder imports
+from spyder.utils.misc import regexp_error_msg
+from spyder.widgets.findreplace import FindReplace
+
+
+# Backreferences in Python replacement strings: \1 or \g<1> or \g<name>
+PYTHON_GROUP = re.compile(r'\\(?:(\d+)|g<(\w+)>)')
+
+
+def to_js_replacement(replacement, regexp):
+    """
+    Convert a replacement string from Python to JavaScript syntax.
+
+    The notebook frontend replaces with `String.replace()`, in which `$`
+    is special. Backreferences in regular expression replacements are
+    converted, so that they can be written as in the editor.
+
+    Parameters
+    ----------
+    replacement : str
+        Replacement string as entered in the find widget.
+    regexp : bool
+        Whether the search text is a regular expression.
+
+    Returns
+    -------
+    str
+        Replacement string for `String.replace()`.
+    """
+    replacement = replacement.replace('$', '$$')
+    if not regexp:
+        return replacement
+
+    def convert(match):
+        number, name = match.groups()
+        if number is None and not name.isdigit():
+            return '$<{}>'.format(name)
+        return '${}'.format(number or name)
+
+    return PYTHON_GROUP.sub(convert, replacement)
+
+
+class NotebookFindReplace(FindReplace):
+    """
+    Find and replace widget for notebooks.
+
+    Searching and replacing is done by the notebook frontend in the cells
+    of the notebook (see `NotebookWidget.find_text()`), so the options for
+    whole words and regular expressions, which are not supported in web
+    pages, can be used. The frontend searches asynchronously, so the
+    number of matches is shown when it reports the result of a search.
+    Replacing in the selection is not supported.
+    """
+
+    def __init__(self, parent):
+        """Constructor."""
+        super().__init__(parent, enable_replace=True)
+        self.replace_widgets.remove(self.replace_sel_button)
+        self.replace_sel_button.hide()
+
+    def set_editor(self, editor, refresh=True):
+        """Set the notebook widget to search in."""
+        if self.editor is not None:
+            self.editor.sig_search_finished.disconnect(
+                self.show_search_result)
+        super().set_editor(editor, refresh=refresh)
+        self.words_button.setVisible(True)
+        self.re_button.setVisible(True)
+        editor.sig_search_finished.connect(self.show_search_result)
+
+    def find(self, changed=True, forward=True, rehighlight=True,
+             start_highlight_timer=False, multiline_replace_check=True):
+        """
+        Find the text in the notebook.
+
+        When the notebook frontend searches, the search box and the number
+        of matches are left as they are until `show_search_result()` is
+        called with the result, so that they do not show the result of the
+        previous search meanwhile.
+        """
+        text = self.search_text.currentText()
+        if not text or not self.editor.searches_asynchronously():
+            return super().find(
+                changed, forward, rehighlight=rehighlight,
+                start_highlight_timer=start_highlight_timer,
+                multiline_replace_check=multiline_replace_check)
+        self.editor.find_text(text, changed, forward,
+                              case=self.case_button.isChecked(),
+                              word=self.words_button.isChecked(),
+                              regexp=self.re_button.isChecked())
+        return None
+
+    def show_search_result(self, result):
+        """
+        Show whether a search found the text and the number of matches.
+
+        Parameters
+        ----------
+        result : dict
+            Number of matches in `count` and number of the current match
+            in `index`, as reported by the notebook frontend.
+        """
+        text = self.search_text.currentText()
+        if not text:
+            return
+        found = result['count'] > 0
+        stylesheet = self.STYLE[found]
+        tooltip = self.TOOLTIP[found]
+        if not found and self.re_button.isChecked():
+            error_msg = regexp_error_msg(text)
+            if error_msg:
+                stylesheet = self.STYLE['regexp_error']
+                tooltip = self.TOOLTIP['regexp_error'] + ': ' + error_msg
+        self.search_text.lineEdit().setStyleSheet(stylesheet)
+        self.search_text.setToolTip(tooltip)
+        self.change_number_matches(current_match=result['index'],
+                                   total_matches=result['count'])
+
+    @Slot()
+    def replace_find(self, focus_replace_text=False, replace_all=False):
+        """Replace the current match, or all matches, and find the next."""
+        if self.editor is None:
+            return
+        search_text = self.search_text.currentText()
+        if not search_text:
+            return
+        replace_text = self.replace_text.currentText()
+        case = self.case_button.isChecked()
+        word = self.words_button.isChecked()
+        regexp = self.re_button.isChecked()
+
+        result = self.editor.replace_text(
+            search_text, to_js_replacement(replace_text, regexp), case=case,
+            word=word, regexp=regexp, replace_all=replace_all)
+        if result is not None:
+            self.change_number_matches(current_match=result['index'],
+                                       total_matches=result['count'])
+
+        if focus_replace_text:
+            self.replace_text.setFocus()
+        else:
+            self.editor.setFocus()
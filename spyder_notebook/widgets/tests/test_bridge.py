@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Tests for bridge.py covering NotebookBridge."""
+
+# Standard library imports
+import json
+
+# Third-party imports
+import pytest
+
+# Local imports
+from spyder_notebook.widgets.bridge import BridgeError, NotebookBridge
+
+
+@pytest.fixture
+def bridge(qtbot):
+    """Construct bridge which records the batches of calls it sends."""
+    bridge = NotebookBridge()
+    bridge.batches = []
+    bridge.sig_calls.connect(
+        lambda calls: bridge.batches.append(json.loads(calls)))
+    return bridge
+
+
+def test_bridge_queues_calls_until_connected(bridge, qtbot):
+    """Test that calls are sent in one batch once the frontend connects."""
+    bridge.call('save')
+    bridge.call('open', 'ham.ipynb')
+    qtbot.wait(10)
+    assert bridge.batches == []
+
+    with qtbot.waitSignal(bridge.sig_calls):
+        bridge.connected()
+
+    assert bridge.batches == [[
+        {'id': 0, 'method': 'save', 'args': []},
+        {'id': 1, 'method': 'open', 'args': ['ham.ipynb']}]]
+
+
+def test_bridge_reply_calls_callback_and_errback(bridge, mocker):
+    """Test that replies are dispatched to the right handlers."""
+    callback = mocker.Mock()
+    errback = mocker.Mock()
+    bridge.call('getState', callback=callback)
+    bridge.call('save', errback=errback)
+
+    bridge.reply('[{"id": 0, "result": {"dirty": false}},'
+                 ' {"id": 1, "error": "kaboom"}]')
+
+    callback.assert_called_once_with({'dirty': False})
+    errback.assert_called_once_with('kaboom')
+
+
+def test_bridge_reset_fails_sent_calls(bridge, qtbot, mocker):
+    """Test that calls which were sent fail when the page is reloaded."""
+    bridge.connected()
+    errback_sent = mocker.Mock()
+    with qtbot.waitSignal(bridge.sig_calls):
+        bridge.call('save', errback=errback_sent)
+    errback_queued = mocker.Mock()
+    bridge.is_connected = False
+    bridge.call('save', errback=errback_queued)
+
+    bridge.reset()
+
+    errback_sent.assert_called_once()
+    errback_queued.assert_not_called()
+
+
+def test_bridge_call_sync_with_error(bridge, qtbot):
+    """Test that call_sync() raises an exception if the call fails."""
+    bridge.connected()
+    bridge.sig_calls.connect(
+        lambda calls: bridge.reply(json.dumps(
+            [{'id': call['id'], 'error': 'kaboom'}
+             for call in json.loads(calls)])))
+
+    with pytest.raises(BridgeError):
+        bridge.call_sync('save')
+
+
+def test_bridge_call_sync_with_timeout(bridge, qtbot):
+    """Test that call_sync() raises an exception if no reply arrives, and
+    that a late reply is ignored."""
+    bridge.connected()
+
+    with pytest.raises(BridgeError):
+        bridge.call_sync('save', timeout=50)
+
+    assert bridge._handlers == {}
+    call_id = bridge.batches[0][0]['id']
+    bridge.reply(json.dumps([{'id': call_id, 'result': True}]))
+
+
+def test_bridge_call_sync_with_timeout_before_connected(bridge, qtbot):
+    """Test that a call which timed out before the frontend connected is
+    not sent later."""
+    with pytest.raises(BridgeError):
+        bridge.call_sync('save', timeout=50)
+
+    bridge.connected()
+    qtbot.wait(50)
+    assert bridge.batches == []
@@ -5,13 +5,20 @@
 
 """Tests for client.py covering NotebookClient."""
 
+# Standard library imports
+import time
+
 # Third-party imports
 import pytest
 from qtpy.QtWidgets import QWidget
 import requests
 
 # Local imports
-from spyder_notebook.widgets.client import NotebookClient
+from spyder_notebook.tests.fakeserver import FakeNotebookServer
+from spyder_notebook.widgets.client import (
+    create_session, delete_kernel, delete_notebook, get_notebook,
+    get_sessions, NotebookClient, put_notebook)
+from spyder_notebook.widgets.search import NotebookFindReplace
 
 
 class MockPlugin(QWidget):
@@ -36,6 +43,29 @@ def plugin(qtbot):
     return plugin
 
 
+@pytest.fixture
+def server(tmpdir):
+    """Start a stand-in notebook server and stop it after the test."""
+    with FakeNotebookServer(str(tmpdir)) as fake_server:
+        yield fake_server
+
+
+@pytest.fixture
+def served_plugin(qtbot, server):
+    """
+    Construct mock plugin with NotebookClient registered with a stand-in
+    notebook server.
+
+    Use `plugin.client` to access the client.
+    """
+    plugin = MockPlugin()
+    qtbot.addWidget(plugin)
+    client = NotebookClient(plugin, server.notebook_dir + '/ham.ipynb')
+    plugin.client = client
+    client.register(server.server_info())
+    return plugin
+
+
 def test_notebookclient_get_kernel_id(plugin, mocker):
     """Basic unit test for NotebookClient.get_kernel_id()."""
     response = mocker.Mock()
@@ -85,3 +115,197 @@ def test_notebookclient_get_kernel_id_with_exception(plugin, mocker):
     plugin.client.get_kernel_id()
 
     MockMessageBox.warning.assert_called()
+
+
+def test_notebookclient_save_when_not_connected(plugin, mocker):
+    """Test that saving does not wait for a frontend which is not connected,
+    but clicks the Save button instead."""
+    client = plugin.client
+    client.notebookwidget.bridge.is_connected = False
+    mock_call_sync = mocker.patch.object(client.notebookwidget.bridge,
+                                         'call_sync')
+    mock_mousedown = mocker.patch.object(client.notebookwidget, 'mousedown')
+
+    assert client.save(wait=True) is False
+    mock_call_sync.assert_not_called()
+    mock_mousedown.assert_called_once_with(
+        '.jp-ToolbarButtonComponent[title^="Save"]')
+
+
+def test_notebookwidget_find_text_skips_searches_while_busy(plugin, qtbot,
+                                                            mocker):
+    """Test that searches requested while the frontend is searching are
+    skipped, except the last one, and that results are reported."""
+    nbwidget = plugin.client.notebookwidget
+    nbwidget.bridge.is_connected = True
+    mock_call = mocker.patch.object(nbwidget.bridge, 'call')
+
+    nbwidget.find_text('s')
+    nbwidget.find_text('sp', changed=True)
+    nbwidget.find_text('spa', changed=False)
+    assert mock_call.call_count == 1
+    assert mock_call.call_args[0][:2] == ('find', 's')
+
+    with qtbot.assertNotEmitted(nbwidget.sig_search_finished):
+        mock_call.call_args[1]['callback']({'count': 5, 'index': 1})
+    assert mock_call.call_count == 2
+    assert mock_call.call_args[0] == (
+        'find', 'spa', {'caseSensitive': False, 'wholeWord': False,
+                        'regexp': False}, True, True)
+
+    with qtbot.waitSignal(nbwidget.sig_search_finished) as blocker:
+        mock_call.call_args[1]['callback']({'count': 2, 'index': 1})
+    assert blocker.args == [{'count': 2, 'index': 1}]
+    assert nbwidget.get_number_matches('spa') == 2
+
+    # The reply to a search which is cancelled is ignored
+    nbwidget.find_text('spam')
+    nbwidget.find_text('')
+    with qtbot.assertNotEmitted(nbwidget.sig_search_finished):
+        mock_call.call_args[1]['callback']({'count': 1, 'index': 1})
+    nbwidget.find_text('eggs')
+    assert mock_call.call_args[0][1] == 'eggs'
+
+
+def test_notebookfindreplace_waits_for_search_result(plugin, qtbot, mocker):
+    """Test that the find widget does not show the result of the previous
+    search while the frontend searches, but the result of the search when
+    it finishes."""
+    nbwidget = plugin.client.notebookwidget
+    nbwidget.bridge.is_connected = True
+    mock_call = mocker.patch.object(nbwidget.bridge, 'call')
+    find_widget = NotebookFindReplace(plugin)
+    qtbot.addWidget(find_widget)
+    find_widget.set_editor(nbwidget)
+    mock_change = mocker.patch.object(find_widget, 'change_number_matches')
+
+    find_widget.search_text.setEditText('spam')
+    find_widget.find()
+    mock_call.call_args[1]['callback']({'count': 3, 'index': 2})
+    mock_change.assert_called_once_with(current_match=2, total_matches=3)
+    stylesheet = find_widget.search_text.lineEdit().styleSheet()
+    assert stylesheet == find_widget.STYLE[True]
+
+    mock_change.reset_mock()
+    find_widget.search_text.setEditText('eggs')
+    find_widget.find()
+    mock_change.assert_not_called()
+    stylesheet = find_widget.search_text.lineEdit().styleSheet()
+    assert stylesheet == find_widget.STYLE[True]
+
+    mock_call.call_args[1]['callback']({'count': 0, 'index': 0})
+    mock_change.assert_called_once_with(current_match=0, total_matches=0)
+    stylesheet = find_widget.search_text.lineEdit().styleSheet()
+    assert stylesheet == find_widget.STYLE[False]
+
+
+def test_create_session(mocker):
+    """Test that create_session() asks the server for a session with the
+    given kernel."""
+    response = mocker.Mock()
+    response.status_code = requests.codes.created
+    mock_post = mocker.patch('requests.post', return_value=response)
+
+    result = create_session('http://server', 'fake_token', 'sub/ham.ipynb',
+                            '42')
+
+    assert result
+    url = mock_post.call_args[0][0]
+    model = mock_post.call_args[1]['json']
+    assert url == 'http://server/api/sessions?token=fake_token'
+    assert model['path'] == 'sub/ham.ipynb'
+    assert model['kernel'] == {'id': '42'}
+
+
+def test_create_session_with_exception(mocker):
+    """Test create_session() when request raises an exception."""
+    exception = requests.exceptions.ProxyError('kaboom')
+    mocker.patch('requests.post', side_effect=exception)
+
+    assert not create_session('http://server', 'fake_token', 'ham.ipynb',
+                              '42')
+
+
+def test_notebookclient_get_kernel_id_with_many_sessions(served_plugin,
+                                                         server):
+    """Test NotebookClient.get_kernel_id() with a server that has many
+    sessions."""
+    for index in range(1000):
+        server.add_session('spam{}.ipynb'.format(index))
+    kernel_id = server.add_kernel()
+    server.add_session('ham.ipynb', kernel_id)
+
+    assert served_plugin.client.get_kernel_id() == kernel_id
+
+
+def test_notebookclient_get_kernel_id_with_invalid_response(served_plugin,
+                                                            server, mocker):
+    """Test NotebookClient.get_kernel_id() when the server does not respond
+    with JSON."""
+    server.fail('^/api/sessions', status=200, body='<html></html>')
+    MockMessageBox = mocker.patch('spyder_notebook.widgets.client.QMessageBox')
+
+    assert served_plugin.client.get_kernel_id() is None
+    MockMessageBox.warning.assert_called()
+
+
+def test_notebookclient_get_kernel_id_with_hung_server(served_plugin,
+                                                       server, mocker):
+    """Test that NotebookClient.get_kernel_id() gives up on a server that
+    does not respond."""
+    mocker.patch('spyder_notebook.widgets.client.REQUEST_TIMEOUT', 0.2)
+    MockMessageBox = mocker.patch('spyder_notebook.widgets.client.QMessageBox')
+    server.hang()
+
+    start = time.perf_counter()
+    assert served_plugin.client.get_kernel_id() is None
+    assert time.perf_counter() - start < 5
+    MockMessageBox.warning.assert_called()
+
+
+def test_notebookclient_shutdown_kernel(served_plugin, server, mocker):
+    """Test that NotebookClient.shutdown_kernel() shuts down the kernel of
+    the notebook and reports failures."""
+    kernel_id = server.add_kernel()
+    server.add_session('ham.ipynb', kernel_id)
+    other_id = server.add_kernel()
+    MockMessageBox = mocker.patch('spyder_notebook.widgets.client.QMessageBox')
+
+    served_plugin.client.shutdown_kernel()
+
+    assert list(server.kernels) == [other_id]
+    MockMessageBox.warning.assert_not_called()
+
+    server.add_session('ham.ipynb', other_id)
+    server.fail('^/api/kernels/', method='DELETE')
+    served_plugin.client.shutdown_kernel()
+
+    assert list(server.kernels) == [other_id]
+    MockMessageBox.warning.assert_called()
+
+
+def test_server_requests_with_stand_in_server(server):
+    """Test the functions sending requests to the server."""
+    url, token = server.url, server.token
+    notebook = {'cells': [], 'metadata': {}, 'nbformat': 4,
+                'nbformat_minor': 4}
+    kernel_id = server.add_kernel()
+
+    assert create_session(url, token, 'ham.ipynb', kernel_id)
+    assert not create_session(url, token, 'ham.ipynb', 'no-such-kernel')
+    assert [(session['notebook']['path'], session['kernel']['id'])
+            for session in get_sessions(url, token)] == [
+                ('ham.ipynb', kernel_id)]
+    assert get_sessions(url, 'wrong-token') is None
+    assert put_notebook(url, token, 'sub/ham.ipynb', notebook)
+    assert get_notebook(url, token, 'sub/ham.ipynb') == notebook
+    assert delete_notebook(url, token, 'sub/ham.ipynb')
+    assert get_notebook(url, token, 'sub/ham.ipynb') is None
+    assert delete_kernel(url, token, kernel_id)
+    assert server.sessions == {}
+    assert not delete_kernel(url, 'wrong-token', kernel_id)
+
+    server.fail('', status=None)
+    assert not delete_kernel(url, token, kernel_id)
+    assert get_sessions(url, token) is None
+    assert get_notebook(url, token, 'sub/ham.ipynb') is None
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Tests for hotcells.py"""
+
+# Local imports
+from spyder_notebook.widgets.hotcells import HotCellsDialog, rank_cells
+
+
+PROFILES = {
+    'ham.ipynb': [
+        {'index': 0, 'source': 'import os', 'wall': 0.1, 'cpu': 0.1,
+         'memory': 0},
+        {'index': 3, 'source': 'fit()', 'wall': 12.5, 'cpu': 40.2,
+         'memory': 3 * 1024 ** 2}],
+    'spam.ipynb': [
+        {'index': 1, 'source': 'load()', 'wall': 2.0, 'cpu': None,
+         'memory': None}]}
+
+
+def test_rank_cells():
+    """Test that cells of all notebooks are ranked by wall time."""
+    ranked = rank_cells(PROFILES)
+
+    assert [(name, profile['index']) for name, profile in ranked] == [
+        ('ham.ipynb', 3), ('spam.ipynb', 1), ('ham.ipynb', 0)]
+
+
+def test_hotcellsdialog(qtbot):
+    """Test that the dialog shows the slowest cell first."""
+    dialog = HotCellsDialog(None, PROFILES)
+    qtbot.addWidget(dialog)
+
+    assert dialog.table.rowCount() == 3
+    assert dialog.table.item(0, 2).text() == 'fit()'
+    assert dialog.table.item(0, 3).text() == '12.50 s'
+    assert dialog.table.item(0, 5).text() == '+3.0 MiB'
+    assert dialog.table.item(1, 4).text() == ''
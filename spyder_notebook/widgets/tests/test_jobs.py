@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Tests for jobs.py covering BackgroundJobs and SpawnPoolExecutor."""
+
+# Standard library imports
+import math
+import multiprocessing
+import time
+
+# Third-party imports
+import pytest
+
+# Local imports
+from spyder_notebook.widgets.jobs import BackgroundJobs, SpawnPoolExecutor
+
+
+@pytest.fixture
+def executor():
+    """Construct executor with one spawned worker."""
+    executor = SpawnPoolExecutor(1, multiprocessing.get_context('spawn'))
+    yield executor
+    executor.shutdown()
+
+
+def test_spawnpoolexecutor_runs_jobs(executor):
+    """Test that results and exceptions of jobs end up in their futures."""
+    future = executor.submit(math.sqrt, 16)
+    failing = executor.submit(math.sqrt, -1)
+
+    assert future.result(timeout=60) == 4
+    with pytest.raises(ValueError):
+        failing.result(timeout=60)
+
+
+def test_spawnpoolexecutor_cancel_waiting_job(executor):
+    """Test that a job which is cancelled while waiting never runs."""
+    running = executor.submit(time.sleep, 0.5)
+    waiting = executor.submit(math.sqrt, 16)
+
+    assert waiting.cancel()
+    running.result(timeout=60)
+    assert executor.submit(math.sqrt, 9).result(timeout=60) == 3
+    assert waiting.cancelled()
+
+
+def test_backgroundjobs_shutdown_cancels_waiting_jobs(qtbot):
+    """Test that shutting down cancels the jobs that did not start."""
+    jobs = BackgroundJobs(max_workers=1)
+    finished = []
+    jobs.sig_job_finished.connect(
+        lambda name, result, error: finished.append((name, error)))
+    for index in range(4):
+        jobs.submit(str(index), time.sleep, 0.5)
+
+    jobs.shutdown()
+
+    qtbot.waitUntil(lambda: len(finished) == 4, timeout=60000)
+    assert ('3', 'Cancelled') in finished
+    assert finished[-1][1] == ''
+
+
+def test_backgroundjobs_share_workers(qtbot):
+    """Test that jobs sharing the workers of other jobs use the same pool,
+    but report on their own jobs only."""
+    jobs = BackgroundJobs(max_workers=1)
+    shared = BackgroundJobs(max_workers=4, share_with=jobs)
+    assert shared.max_workers == 1
+
+    errors, shared_errors = [], []
+    jobs.sig_all_finished.connect(errors.append)
+    shared.sig_all_finished.connect(shared_errors.append)
+    jobs.submit('sqrt', math.sqrt, 4)
+    shared.submit('fail', math.sqrt, -1)
+
+    qtbot.waitUntil(lambda: bool(errors and shared_errors), timeout=60000)
+    assert shared._executor is None
+    assert errors == [{}]
+    assert list(shared_errors[0]) == ['fail']
+
+    shared.shutdown()
+    with qtbot.waitSignal(jobs.sig_job_finished, timeout=60000) as blocker:
+        jobs.submit('sqrt', math.sqrt, 9)
+    assert blocker.args == ['sqrt', 3, '']
+    jobs.shutdown()
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for search.py"""
+
+# Third-party imports
+import pytest
+
+# Local imports
+from spyder_notebook.widgets.search import to_js_replacement
+
+
+@pytest.mark.parametrize('replacement, regexp, expected', [
+    ('spam', False, 'spam'),
+    ('$1 \\1', False, '$$1 \\1'),
+    ('\\1-\\g<2>', True, '$1-$2'),
+    ('\\g<name> $', True, '$<name> $$')])
+def test_to_js_replacement(replacement, regexp, expected):
+    """Test that replacement strings are converted to JavaScript syntax."""
+    assert to_js_replacement(replacement, regexp) == expected